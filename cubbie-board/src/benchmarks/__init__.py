@@ -0,0 +1,7 @@
+"""
+Performance benchmarks.
+
+Notes:
+    Run from the src directory, e.g. ``python -m benchmarks.bench_spi_chunks``.
+
+"""
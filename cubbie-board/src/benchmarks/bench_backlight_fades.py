@@ -0,0 +1,46 @@
+"""
+Benchmark backlight fades: PWM writes and duration per transition, and how queued targets are handled.
+
+"""
+
+import time
+
+from benchmarks.common import print_table
+from lcd_display import backlight_scheduler
+from lcd_display.backlight_scheduler import BacklightScheduler
+from lcd_display.virtual_backend import VirtualGpio
+
+
+def run_targets(targets, settle):
+    """
+    Enqueue targets back to back on a fresh scheduler and wait for it to settle.
+
+    """
+    gpio = VirtualGpio()
+    scheduler = BacklightScheduler(gpio)
+    controller = scheduler.channel(12)
+    scheduler.start()
+    start = time.time()
+    for target in targets:
+        controller._set_duty_cycle(target)
+    time.sleep(settle)
+    scheduler.stop()
+    writes = gpio.get_duty_cycles(12)[1:]
+    return scheduler, len(writes), (writes[-1][0] - start) * 1e3 if writes else 0.0
+
+
+def main():
+    settle = backlight_scheduler.FADE_DURATION + 0.3
+    rows = [('legacy 0 -> 100', 1, 100, '')]
+    scheduler, writes, duration = run_targets([100], settle)
+    rows.append(('0 -> 100', scheduler.transitions, writes, '{:.0f}'.format(duration)))
+    scheduler, writes, duration = run_targets([100, 0, 100, 50], settle)
+    rows.append(('queued 100, 0, 100, 50', scheduler.transitions, writes, '{:.0f}'.format(duration)))
+    print('Fade: {} s, {} writes/s max, {}'.format(
+        backlight_scheduler.FADE_DURATION, backlight_scheduler.FADE_RATE, backlight_scheduler.FADE_EASING
+    ))
+    print_table(('targets', 'transitions', 'pwm_writes', 'duration_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the shared backlight scheduler as the number of panels grows: threads, GPIO connections and fade skew.
+
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.common import print_table
+from lcd_display import backlight_scheduler
+from lcd_display.backlight_scheduler import BacklightScheduler
+from lcd_display.virtual_backend import VirtualGpio
+
+# First PWM pin of the simulated panels.
+FIRST_PIN = 12
+
+
+def measure(panel_count):
+    """
+    Fade every panel on together and measure the threads used and the skew between panels.
+
+    """
+    gpio = VirtualGpio()
+    threads_before = threading.active_count()
+    scheduler = BacklightScheduler(gpio)
+    pins = [FIRST_PIN + i for i in range(panel_count)]
+    for pin in pins:
+        scheduler.channel(pin)
+    scheduler.start()
+    threads = threading.active_count() - threads_before
+    scheduler.set_duty_cycles({pin: 100 for pin in pins})
+    time.sleep(backlight_scheduler.FADE_DURATION + 0.3)
+    scheduler.stop()
+    # Skew between the panels' writes at each step of the fade.
+    fades = [gpio.get_duty_cycles(pin)[1:] for pin in pins]
+    skews = [max(step) - min(step) for step in zip(*[[t for t, _ in fade] for fade in fades])]
+    # Beyond two panels some pins use DMA PWM, whose duty cycles are coarser than hardware PWM's.
+    resolution = 1e6 / backlight_scheduler.PWM_RANGE
+    in_lockstep = all(
+        max(step) - min(step) <= resolution for step in zip(*[[duty for _, duty in fade] for fade in fades])
+    )
+    return (
+        panel_count,
+        threads,
+        1,
+        scheduler.wakeups,
+        sum(len(fade) for fade in fades),
+        '{:.3f}'.format(max(skews) * 1e3),
+        in_lockstep
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--panels', type=int, nargs='+', default=[1, 2, 4, 8], help='Panel counts to measure')
+    args = parser.parse_args()
+    print('Per-panel controllers would use one thread and one pigpio connection per panel.')
+    print_table(
+        ('panels', 'threads', 'gpio_connections', 'wakeups', 'pwm_writes', 'max_skew_ms', 'lockstep'),
+        [measure(panel_count) for panel_count in args.panels]
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark idle wake-ups and update latency of the backlight scheduler against the old 100 ms polling loop.
+
+"""
+
+import argparse
+import threading
+import time
+from Queue import Queue
+
+from benchmarks.common import print_table
+from lcd_display.backlight_scheduler import BacklightScheduler
+from lcd_display.virtual_backend import VirtualGpio
+
+# Poll interval of the old controller (seconds).
+LEGACY_UPDATE_DELAY = 0.1
+
+
+class LegacyBacklightController(threading.Thread):
+    """
+    The old controller loop, which polled its queue every 100 ms.
+
+    """
+
+    def __init__(self, pin, gpio):
+        threading.Thread.__init__(self)
+        self._pin = pin
+        self._gpio = gpio
+        self._update_queue = Queue()
+        self._stop_handle = threading.Event()
+        self.wakeups = 0
+
+    def turn_on(self):
+        self._update_queue.put(100)
+
+    def stop(self):
+        self._stop_handle.set()
+        self.join()
+
+    def run(self):
+        while not self._stop_handle.is_set() or not self._update_queue.empty():
+            self.wakeups += 1
+            if not self._update_queue.empty():
+                self._gpio.hardware_PWM(self._pin, 500, 1e4 * self._update_queue.get())
+            time.sleep(LEGACY_UPDATE_DELAY)
+
+
+def create_legacy(gpio):
+    """
+    Create an old polling controller, which is its own thread.
+
+    """
+    controller = LegacyBacklightController(12, gpio)
+    return controller, controller
+
+
+def create_scheduler(gpio):
+    """
+    Create a backlight scheduler and a controller for one pin.
+
+    """
+    scheduler = BacklightScheduler(gpio)
+    return scheduler, scheduler.channel(12)
+
+
+def measure(create, idle_time):
+    """
+    Measure idle wake-ups per hour and the latency from an update to its first PWM write.
+
+    """
+    gpio = VirtualGpio()
+    thread, controller = create(gpio)
+    thread.start()
+    time.sleep(idle_time)
+    wakeups = thread.wakeups
+    # Update latency, from enqueueing to the first PWM write.
+    latencies = []
+    for _ in range(5):
+        # Land at a random point in the legacy poll cycle.
+        time.sleep(LEGACY_UPDATE_DELAY * 0.37)
+        writes_before = len(gpio.pwm_writes)
+        start = time.time()
+        controller.turn_on()
+        while len(gpio.pwm_writes) == writes_before:
+            time.sleep(0.0005)
+        latencies.append(gpio.pwm_writes[writes_before].time - start)
+        if thread is not controller:
+            controller.turn_off()
+            time.sleep(0.05)
+    thread.stop()
+    return wakeups * 3600.0 / idle_time, sum(latencies) / len(latencies) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--idle', type=float, default=3.0, help='Idle time to measure (seconds)')
+    args = parser.parse_args()
+    rows = []
+    for name, create in (('polling', create_legacy), ('blocking', create_scheduler)):
+        rows.append((name, ) + measure(create, args.idle))
+    print_table(('controller', 'idle_wakeups_per_hour', 'update_latency_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
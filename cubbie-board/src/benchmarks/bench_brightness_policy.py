@@ -0,0 +1,56 @@
+"""
+Estimate a day's backlight duty cycle and energy under the brightness policy against always-on backlights.
+
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.common import print_table
+from games.game_overview import GameOverview
+from lcd_display import brightness_policy
+from lcd_display.brightness_policy import EnergyMeter, create_brightness_policy
+
+# Displays driven.
+PANEL_COUNT = 2
+# (hour the game is shown from, overview), through a day with a night game.
+DAY = [
+    (0, GameOverview('g1', GameOverview.FINAL_STATUS, 9, 'Top', 3, 2, 'Cubs', 'Cardinals', '2019/05/24 7:05', 'PM')),
+    (12, GameOverview('g2', GameOverview.WARM_UP_STATUS, 0, '', 0, 0, 'Cubs', 'Brewers', '2019/05/25 7:05', 'PM')),
+    (19, GameOverview('g2', GameOverview.IN_PROGRESS_STATUS, 5, 'Top', 2, 3, 'Cubs', 'Brewers',
+                      '2019/05/25 7:05', 'PM')),
+    (22, GameOverview('g2', GameOverview.FINAL_STATUS, 9, 'Top', 4, 3, 'Cubs', 'Brewers', '2019/05/25 7:05', 'PM'))
+]
+
+
+def simulate(get_duty_cycle, step):
+    """
+    Step through the day, returning the meter's average duty cycle and energy.
+
+    """
+    meter = EnergyMeter(brightness_policy.MAX_POWER * PANEL_COUNT)
+    start = datetime(2019, 5, 25)
+    for i in range(int(24 * 3600 / step)):
+        now = start + timedelta(seconds=i * step)
+        overview = [overview for hour, overview in DAY if hour <= now.hour][-1]
+        meter.update(get_duty_cycle(now, overview), i * step)
+    return meter.get_average_duty_cycle(24 * 3600), meter.get_energy(24 * 3600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--step', type=float, default=60, help='Time between display updates (seconds)')
+    args = parser.parse_args()
+    policy = create_brightness_policy()
+    rows = []
+    for name, get_duty_cycle in (('always_on', lambda now, overview: 100), ('policy', policy.get_duty_cycle)):
+        average, energy = simulate(get_duty_cycle, args.step)
+        rows.append((name, '{:.1f}'.format(average), '{:.2f}'.format(energy)))
+    print('Schedule: {}, {} W per backlight, {} backlights'.format(
+        brightness_policy.SCHEDULE, brightness_policy.MAX_POWER, PANEL_COUNT
+    ))
+    print_table(('backlights', 'average_duty_pct', 'energy_wh_per_day'), rows)
+
+
+if __name__ == '__main__':
+    main()
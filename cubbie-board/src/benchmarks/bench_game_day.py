@@ -0,0 +1,302 @@
+"""
+Benchmark the whole board replaying a full game day, on simulated hardware, against a recorded or synthetic day.
+
+Notes:
+    Runs the main loop as CubbieBoard.run does, on a virtual clock: each game shown advances it 10 s, and each time
+    there is nothing to show, 300 s. The APIs answer from the day as of the virtual time, so a whole day replays in
+    seconds, through GameManager, LcdController and SegmentController. A short real pause after each game lets the
+    segment controller show each state, as it would 10 s apart; throughput leaves the pauses out.
+
+    Reports latency and CPU time of each component, throughput and memory. Save results with --json, and compare
+    them with those of another commit with --baseline; both runs must replay the same day.
+
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import threading
+import time
+from timeit import default_timer
+
+from benchmarks.common import configure_headless, print_table, summarize
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+for _key, _value in (('DAY_GAME_INFO_API_URL', 'http://replay/day-game-info'),
+                     ('GAME_OVERVIEW_API_URL', 'http://replay/game-overview'), ('API_KEY', 'replay')):
+    os.environ.setdefault(_key, _value)
+
+from benchmarks.game_day import ReplayServer, load_day, synthesize_day  # noqa: E402
+from games import game_manager  # noqa: E402
+from games.game_manager import GameManager  # noqa: E402
+from lcd_display.lcd_controller import LcdController  # noqa: E402
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+
+# Virtual time between games shown, and waited when there is nothing to show (seconds), as in CubbieBoard.
+DISPLAY_TIME = 10
+SCAN_TIMEOUT = 300
+# Real pause after each game shown (seconds).
+PAUSE = 0.002
+# clock_gettime clock ID of the calling thread's CPU time on Linux.
+CLOCK_THREAD_CPUTIME_ID = 3
+
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+
+def _get_thread_cpu_clock():
+    """
+    Get a clock of the calling thread's CPU time (seconds).
+
+    Notes:
+        Not getrusage(RUSAGE_THREAD), which is only brought up to date at scheduler ticks and context switches, so
+        charges calls for time spent before them.
+
+    """
+    if hasattr(time, 'thread_time'):
+        return time.thread_time
+    clock_gettime = ctypes.CDLL(ctypes.util.find_library('rt') or 'libc.so.6').clock_gettime
+    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(Timespec)]
+
+    def thread_time():
+        timespec = Timespec()
+        clock_gettime(CLOCK_THREAD_CPUTIME_ID, ctypes.byref(timespec))
+        return timespec.tv_sec + timespec.tv_nsec * 1e-9
+
+    return thread_time
+
+
+thread_cpu_time = _get_thread_cpu_clock()
+
+
+def process_cpu_time():
+    """
+    Get the CPU time of every thread (seconds).
+
+    """
+    times = os.times()
+    return times[0] + times[1]
+
+
+def get_rss():
+    """
+    Get the resident set size (KiB).
+
+    """
+    with open('/proc/self/statm') as statm_file:
+        return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+class Component(object):
+    """
+    Latency and CPU time of one component's calls from the main loop.
+
+    """
+
+    def __init__(self):
+        self.durations = []
+        self.cpu_time = 0.0
+
+    def call(self, func, *args):
+        cpu_start = thread_cpu_time()
+        start = default_timer()
+        result = func(*args)
+        self.durations.append(default_timer() - start)
+        self.cpu_time += thread_cpu_time() - cpu_start
+        return result
+
+
+class MeasuredSegmentController(SegmentController):
+    """
+    Segment controller which times each state from being applied to being shown, and its thread's CPU time.
+
+    Notes:
+        States applied faster than the thread wakes are coalesced, and shown as only the latest.
+
+    """
+
+    def __init__(self):
+        SegmentController.__init__(self)
+        self.latencies = []
+        self.coalesced = 0
+        self.cpu_time = 0.0
+        self._apply_times = {}
+        self._apply_lock = threading.Lock()
+
+    def apply_state(self, state):
+        start = default_timer()
+        with self._apply_lock:
+            SegmentController.apply_state(self, state)
+            self._apply_times[self._shared_state.sequence] = start
+
+    def process_updates(self):
+        SegmentController.process_updates(self)
+        shown = default_timer()
+        with self._apply_lock:
+            start = self._apply_times.pop(self._sequence, None)
+            self.coalesced += len(self._apply_times)
+            self._apply_times.clear()
+        if start is not None:
+            self.latencies.append(shown - start)
+
+    def run(self):
+        try:
+            SegmentController.run(self)
+        finally:
+            self.cpu_time = thread_cpu_time()
+
+
+def replay(day, team, pause=PAUSE):
+    """
+    Replay a day through the board, returning the results.
+
+    """
+    server = ReplayServer(day, game_manager.DAY_GAME_INFO_API_URL, game_manager.GAME_OVERVIEW_API_URL)
+    server.install()
+    rss_start = get_rss()
+    segment_controller = MeasuredSegmentController()
+    segment_controller.start()
+    lcd_controller = LcdController()
+    components = {name: Component() for name in ('games', 'lcd', 'segment_apply', 'turn_off')}
+    displays = 0
+    virtual_start = server.now
+    cpu_start = process_cpu_time()
+    wall_start = default_timer()
+    try:
+        manager = components['games'].call(GameManager, day.date, team)
+        while not server.is_over:
+            next_game = components['games'].call(manager.get_next_game)
+            if next_game is None:
+                components['turn_off'].call(lcd_controller.turn_off_displays)
+                components['turn_off'].call(segment_controller.turn_off_displays)
+                server.now += SCAN_TIMEOUT
+                continue
+            components['lcd'].call(lcd_controller.display_team_logos, next_game)
+            components['segment_apply'].call(segment_controller.apply_state, SegmentState.from_overview(next_game))
+            displays += 1
+            server.now += DISPLAY_TIME
+            time.sleep(pause)
+        wall_time = default_timer() - wall_start
+        busy_time = wall_time - displays * pause
+    finally:
+        lcd_controller.exit()
+        segment_controller.exit()
+        server.uninstall()
+    cpu_time = process_cpu_time() - cpu_start
+    lcd_display = lcd_controller.home_display
+    results = {
+        'wall_s': wall_time,
+        'virtual_h': (server.now - virtual_start) / 3600.0,
+        'displays': displays,
+        'displays_per_s': displays / busy_time,
+        'requests': server.request_count,
+        'requests_per_s': server.request_count / busy_time,
+        'cpu_s': cpu_time,
+        'cpu_pct': cpu_time / wall_time * 100,
+        'lcd_frames_pushed': lcd_display.frames_pushed,
+        'lcd_frames_skipped': lcd_display.frames_skipped,
+        'segment_coalesced': segment_controller.coalesced,
+        'multiplex_cycles': segment_controller.multiplex_cycles,
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'rss_growth_kib': get_rss() - rss_start,
+        'components': {}
+    }
+    measured = [(name, component.durations, component.cpu_time) for name, component in sorted(components.items())]
+    measured.append(('segment_show', segment_controller.latencies, segment_controller.cpu_time))
+    for name, durations, component_cpu_time in measured:
+        p50, p95, max_ms = summarize(durations or [0.0])
+        results['components'][name] = {
+            'calls': len(durations), 'p50_ms': p50, 'p95_ms': p95, 'max_ms': max_ms, 'cpu_s': component_cpu_time
+        }
+    # The backlight scheduler, and anything else not measured.
+    results['components']['other'] = {
+        'cpu_s': cpu_time - sum(component['cpu_s'] for component in results['components'].values())
+    }
+    return results
+
+
+def get_commit():
+    """
+    Get the commit benchmarked, if in a git repository.
+
+    """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).strip().decode()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results):
+    """
+    Get every number in the results, by dotted name.
+
+    """
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(('{}.{}'.format(key, name), number) for name, number in flatten(value).items())
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[key] = value
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--day', help='Recorded day to replay, the synthetic day if not given')
+    parser.add_argument('--team', default='Cubs', help='Preferred team')
+    parser.add_argument('--pause', type=float, default=PAUSE, help='Real pause after each game shown (seconds)')
+    parser.add_argument('--json', help='Path to save the results to')
+    parser.add_argument('--baseline', help='Saved results to compare with')
+    args = parser.parse_args()
+    if args.day:
+        with open(args.day, 'rb') as day_file:
+            digest = hashlib.sha1(day_file.read()).hexdigest()
+        day = load_day(args.day)
+    else:
+        day = synthesize_day()
+        digest = hashlib.sha1(json.dumps(day, sort_keys=True, default=str).encode()).hexdigest()
+    results = replay(day, args.team, args.pause)
+    results.update(commit=get_commit(), day=digest, team=args.team, pause=args.pause)
+    print('Replayed {:.1f} h of {} ({} games, {} polls) in {:.2f} s'.format(
+        results['virtual_h'], day.date, len(day.games), len(day.polls), results['wall_s']))
+    print_table(
+        ('component', 'calls', 'p50_ms', 'p95_ms', 'max_ms', 'cpu_s'),
+        [(name, component['calls'], component['p50_ms'], component['p95_ms'], component['max_ms'], component['cpu_s'])
+         for name, component in sorted(results['components'].items()) if name != 'other'] +
+        [('other', '', '', '', '', results['components']['other']['cpu_s'])]
+    )
+    print_table(
+        ('displays_per_s', 'requests_per_s', 'cpu_pct', 'pushed', 'skipped', 'coalesced', 'peak_rss_kib',
+         'rss_growth_kib'),
+        [(results['displays_per_s'], results['requests_per_s'], results['cpu_pct'], results['lcd_frames_pushed'],
+          results['lcd_frames_skipped'], results['segment_coalesced'], results['peak_rss_kib'],
+          results['rss_growth_kib'])]
+    )
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump(results, results_file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if any(baseline.get(key) != results[key] for key in ('day', 'team', 'pause')):
+            print('Baseline replayed a different day, team or pause, not comparable')
+            return
+        print('Against {}:'.format(baseline.get('commit')))
+        old, new = flatten(baseline), flatten(results)
+        print_table(
+            ('metric', 'baseline', 'current', 'change_pct'),
+            [(name, float(old[name]), float(new[name]),
+              (new[name] - old[name]) * 100.0 / old[name] if old[name] else '') for name in sorted(set(old) & set(new))]
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the cost of instrumentation on the hot paths: a span and a counter, off and on, and a dump.
+
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from timeit import default_timer
+
+from benchmarks.common import print_table
+from utils import instrumentation
+
+
+def time_batch(func, repeat):
+    """
+    Get the mean duration of repeated calls, timed as one batch.
+
+    """
+    start = default_timer()
+    for _ in range(repeat):
+        func()
+    return (default_timer() - start) / repeat
+
+
+def empty_span():
+    with instrumentation.span('i2c.write'):
+        pass
+
+
+def count():
+    instrumentation.count('segment.multiplex_cycles')
+
+
+def measure(state, repeat):
+    """
+    Time a span and a counter in the current state, against the bare loop.
+
+    """
+    baseline = time_batch(lambda: None, repeat)
+    return (
+        state,
+        (time_batch(empty_span, repeat) - baseline) * 1e6,
+        (time_batch(count, repeat) - baseline) * 1e6
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200000, help='Calls timed in each state')
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    try:
+        rows = [measure('off', args.repeat)]
+        instrumentation.start('bench', os.path.join(directory, 'dump.jsonl'), 3600)
+        rows.append(measure('on', args.repeat))
+        dump_time = time_batch(instrumentation._dumper.dump, 100)
+        instrumentation.stop()
+    finally:
+        shutil.rmtree(directory)
+    print_table(('instrumentation', 'span_us', 'count_us'), rows)
+    print('dump of a full window: {:.3f} ms'.format(dump_time * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark the full LcdController.display_team_logos pipeline on headless virtual displays.
+
+"""
+
+import argparse
+
+from benchmarks.common import configure_headless, time_calls, summarize, print_table
+
+configure_headless()
+
+from games.game_overview import GameOverview
+from lcd_display.lcd_controller import LcdController
+
+# (label, overview) for each kind of frame shown.
+OVERVIEWS = [
+    ('in_progress', GameOverview('g1', GameOverview.IN_PROGRESS_STATUS, 5, 'Top', 2, 3, 'Cubs', 'Cardinals',
+                                 '2019/05/25 1:20', 'PM')),
+    ('warm_up', GameOverview('g2', GameOverview.WARM_UP_STATUS, 0, '', 0, 0, 'Mets', 'Braves',
+                             '2019/05/25 7:10', 'PM')),
+    ('final', GameOverview('g3', GameOverview.FINAL_STATUS, 9, 'Bottom', 4, 1, 'Yankees', 'Red Sox',
+                           '2019/05/25 1:05', 'PM')),
+    ('final_cubs_win', GameOverview('g4', GameOverview.FINAL_STATUS, 9, 'Top', 7, 6, 'Cubs', 'Brewers',
+                                    '2019/05/25 2:20', 'PM'))
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+    controller = LcdController()
+    try:
+        rows = []
+        for label, overview in OVERVIEWS:
+            writes_before = len(controller.home_display._backend.writes)
+            durations = time_calls(lambda: controller.display_team_logos(overview), args.frames)
+            writes = controller.home_display._backend.writes[writes_before:]
+            push_ms = sum(write.duration for write in writes) / len(writes) * 1e3
+            # Repeats of a frame are skipped, so only the first is pushed.
+            rows.append((label, ) + summarize(durations) + (push_ms, len(writes), writes[-1].byte_count,
+                                                            writes[-1].transfer_count))
+        print('Text warm-up: {:.2f} ms'.format(controller.text_warm_up_time * 1e3))
+        print_table(('frame', 'p50_ms', 'p95_ms', 'max_ms', 'push_ms', 'pushed', 'bytes', 'xfers'), rows)
+    finally:
+        controller.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark startup and first-frame time of the logo atlas against decoding the jpg logos.
+
+"""
+
+import argparse
+import os
+import os.path
+import shutil
+import tempfile
+
+from PIL import Image
+
+from benchmarks.common import time_calls, summarize, print_table
+from lcd_display.frame_buffer import FrameBuffer
+from lcd_display.logo_atlas import LogoAtlas, build_atlas_from_dir
+
+LOGO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'img', 'logos')
+
+
+def load_jpegs():
+    """
+    Load the logos the way the controller does without an atlas.
+
+    """
+    return {
+        item.split('.jpg')[0]: Image.open(os.path.join(LOGO_DIR, item))
+        for item in os.listdir(LOGO_DIR) if item.endswith('.jpg')
+    }
+
+
+def first_frames(logos, frame_buffer):
+    """
+    Encode a frame of every logo, as the first display of each team does.
+
+    """
+    for name in logos if isinstance(logos, dict) else logos.names:
+        frame_buffer.encode(logos[name].copy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=128)
+    parser.add_argument('--height', type=int, default=128)
+    args = parser.parse_args()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        atlas_path = os.path.join(temp_dir, 'logos.atlas')
+        build_time = summarize(time_calls(
+            lambda: build_atlas_from_dir(LOGO_DIR, atlas_path, args.width, args.height), 1
+        ))[0]
+        frame_buffer = FrameBuffer(args.width, args.height, 4096)
+        rows = []
+        for name, load in (('jpeg', load_jpegs), ('atlas', lambda: LogoAtlas(atlas_path))):
+            startup = []
+            first_frame = []
+            for _ in range(args.repeat):
+                holder = []
+                startup.extend(time_calls(lambda: holder.append(load()), 1))
+                first_frame.extend(time_calls(lambda: first_frames(holder[0], frame_buffer), 1))
+                if not isinstance(holder[0], dict):
+                    holder[0].close()
+            rows.append((name, summarize(startup)[0], summarize(first_frame)[0]))
+        print('Atlas build: {:.1f} ms'.format(build_time))
+        print_table(('source', 'startup_ms', 'all_first_frames_ms'), rows)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
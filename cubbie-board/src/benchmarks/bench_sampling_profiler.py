@@ -0,0 +1,48 @@
+"""
+Benchmark the sampling profiler: cost of each sample with the segment controller multiplexing, and the share of a
+core it takes at the default interval.
+
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from benchmarks.common import configure_headless, print_table, summarize, time_calls
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+from utils import sampling_profiler  # noqa: E402
+from utils.sampling_profiler import SamplingProfiler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=2000, help='Samples to time')
+    args = parser.parse_args()
+    controller = SegmentController()
+    controller.apply_state(SegmentState(12, 'Top', 10, 13))
+    controller.start()
+    directory = tempfile.mkdtemp()
+    try:
+        profiler = SamplingProfiler(os.path.join(directory, 'profile.collapsed'))
+        durations = time_calls(profiler.sample, args.samples)
+        profiler.write()
+        with open(profiler.path) as profile_file:
+            stack_count = len(profile_file.readlines())
+    finally:
+        controller.exit()
+        shutil.rmtree(directory)
+    p50, p95, max_ms = summarize(durations)
+    print_table(
+        ('p50_ms', 'p95_ms', 'max_ms', 'core_pct', 'stacks'),
+        [(p50, p95, max_ms, p50 / 1e3 / sampling_profiler.INTERVAL * 100, stack_count)]
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark booting the segment displays: time to the first segment output, bus traffic, and whether stale segments
+light up during setup, on the MCP23008 register model.
+
+"""
+
+import argparse
+from timeit import default_timer
+
+from benchmarks.common import percentile, print_table
+from segment_display import sim_bus
+from segment_display.i2c_bus import I2CBus
+from segment_display.segment_display import SegmentDisplay
+from segment_display.sim_bus import MCP23008, SimBus
+
+ADDRESSES = (0x20, 0x21, 0x22)
+# I2C clock (Hz), and bits on the wire per byte (8 data, 1 ack).
+BUS_SPEED = 100e3
+BITS_PER_BYTE = 9
+# Latch value left over from a previous run (an "8"), for a warm restart.
+STALE_LATCH = 0x7F
+
+
+def legacy_boot(bus):
+    """
+    The old setup: all pins to inputs, pull-ups off, then a read-modify-write of IODIR per pin, before the first
+    digit write to GPIO.
+
+    """
+    for address in ADDRESSES:
+        bus.write_byte_data(address, sim_bus.IODIR, 0xFF)
+        bus.read_byte_data(address, sim_bus.IODIR)
+        bus.write_byte_data(address, sim_bus.GPPU, 0x00)
+        for pin in range(8):
+            direction = bus.read_byte_data(address, sim_bus.IODIR)
+            bus.write_byte_data(address, sim_bus.IODIR, direction & ~(1 << pin))
+    bus.write_byte_data(ADDRESSES[0], sim_bus.GPIO, SegmentDisplay.DIGIT_CODES[1])
+
+
+def direct_boot(bus):
+    """
+    The current setup: the latch blanked, then all configuration registers in one block write, per chip.
+
+    """
+    i2c_bus = I2CBus(bus)
+    displays = [SegmentDisplay(i2c_bus, address) for address in ADDRESSES]
+    displays[0].display_digit(1)
+
+
+def lights_stale_segments(writes):
+    """
+    Check whether replaying a chip's writes over a stale latch lights any segment before the first digit.
+
+    """
+    chip = MCP23008()
+    chip.registers[sim_bus.OLAT] = STALE_LATCH
+    # Leave out the first digit write.
+    for register, value in writes[:-1] if writes[-1][0] in (sim_bus.GPIO, sim_bus.OLAT) else writes:
+        chip.write(register, [value])
+        if chip.outputs:
+            return True
+    return False
+
+
+def measure(boot, repeat):
+    """
+    Boot the displays repeatedly, returning the boot time and bus traffic.
+
+    """
+    durations = []
+    for _ in range(repeat):
+        bus = SimBus(list(ADDRESSES))
+        start = default_timer()
+        boot(bus)
+        durations.append(default_timer() - start)
+    return (
+        percentile(durations, 50) * 1e3,
+        bus.bytes_transferred * BITS_PER_BYTE / BUS_SPEED * 1e3,
+        bus.transactions,
+        bus.bytes_transferred,
+        lights_stale_segments(bus.chips[ADDRESSES[0]].writes)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args()
+    print_table(
+        ('setup', 'cpu_ms', 'bus_ms_100khz', 'transactions', 'bytes', 'stale_segments'),
+        [(name, ) + measure(boot, args.repeat) for name, boot in (('per_pin', legacy_boot), ('direct', direct_boot))]
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Compare each digit's on-time between single and double digit values, with a fully lit lone digit against on-time
+balanced across modes: on-time, relative LED current, bus writes and wake-ups.
+
+"""
+
+import argparse
+import os
+import time
+from timeit import default_timer
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+
+STATES = (
+    ('single_digits', SegmentState(7, 'Bottom', 3, 5)),
+    ('double_digits', SegmentState(12, 'Top', 10, 13)),
+)
+
+
+class FullOnController(SegmentController):
+    """
+    Controller as before on-time balancing, lighting a lone rightmost digit all the time.
+
+    """
+
+    def _get_lone_duty_cycle(self):
+        return 100.0
+
+
+def measure(controller_class, state, duration):
+    """
+    Show a state for a while and measure the digits' on-time and the work done.
+
+    """
+    controller = controller_class()
+    controller.apply_state(state)
+    controller.start()
+    # Let the update through before measuring.
+    time.sleep(0.1)
+    gpio = controller._gpio
+    bus = controller.i2c_bus._bus
+    transactions = bus.transactions
+    wakeups = controller.wakeups
+    start = default_timer()
+    time.sleep(duration)
+    end = default_timer()
+    transactions = bus.transactions - transactions
+    wakeups = controller.wakeups - wakeups
+    on_fractions = [gpio.get_on_fraction(pin, start, end) for pin in controller._digit_pins]
+    # Lit segments times on-time, summed over every digit of every display.
+    current = sum(
+        bin(display.codes[position]).count('1') * on_fraction
+        for display in controller._displays
+        for position, on_fraction in enumerate(on_fractions)
+    )
+    controller.exit()
+    lit_fractions = [on_fraction for on_fraction in on_fractions if on_fraction > 0]
+    return (
+        min(lit_fractions) * 100,
+        max(lit_fractions) * 100,
+        current,
+        transactions / (end - start),
+        wakeups / (end - start)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=2.0, help='Time to show each state (seconds)')
+    args = parser.parse_args()
+    rows = []
+    for name, state in STATES:
+        for mode, controller_class in (('full_on', FullOnController), ('balanced', SegmentController)):
+            rows.append((name, mode) + measure(controller_class, state, args.duration))
+    print_table(
+        ('state', 'lone_digit', 'min_on_pct', 'max_on_pct', 'rel_current', 'bus_writes_per_s', 'wakeups_per_s'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark I2C traffic of segment multiplexing, sequencing the digit-enable lines against blanking, on the simulated
+bus.
+
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+# Count transactions without waiting for them.
+os.environ.setdefault('I2C_SPEED', '0')
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+
+
+class BlankingSegmentController(SegmentController):
+    """
+    The old multiplex cycle, which blanked the displays before each digit to avoid ghosting.
+
+    """
+
+    def _clear(self):
+        for display in (self.home_display, self.away_display, self.inning_display):
+            display.display_digit(-1)
+
+    def _blink_digits(self):
+        left_pin, right_pin = self._digit_pins
+        on_time = 1.0 / (SegmentController.REFRESH_RATE * 2)
+        self._clear()
+        self._gpio.output(right_pin, self._gpio.LOW)
+        self._gpio.output(left_pin, self._gpio.HIGH)
+        self._write_frame(0)
+        time.sleep(on_time)
+        self._clear()
+        self._gpio.output(left_pin, self._gpio.LOW)
+        self._gpio.output(right_pin, self._gpio.HIGH)
+        self._write_frame(1)
+        time.sleep(on_time)
+
+
+def measure(controller_class, duration):
+    """
+    Multiplex double digits for a while, returning I2C writes per second and per cycle, and GPIO toggles per cycle.
+
+    """
+    controller = controller_class()
+    for key, value in (('inning', 12), ('inning_state', 'Top'), ('home_team_runs', 10), ('away_team_runs', 3)):
+        controller.write_update(key, value)
+    controller.process_updates()
+    bus = controller.i2c_bus._bus
+    gpio = controller._gpio
+    del bus.log[:]
+    del gpio.outputs[:]
+    controller.start()
+    time.sleep(duration)
+    controller._stop_handle.set()
+    controller.join()
+    bus_writes = sum(1 for transaction in bus.log if not transaction.is_read)
+    # Each cycle lights the left digit once.
+    cycles = sum(1 for _, level in gpio.get_edges(controller._digit_pins[0]) if level == gpio.HIGH)
+    return bus_writes / duration, bus_writes / float(cycles), len(gpio.outputs) / float(cycles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0, help='Time to multiplex each way (seconds)')
+    args = parser.parse_args()
+    rows = [
+        (name, ) + measure(controller_class, args.duration)
+        for name, controller_class in (('blanking', BlankingSegmentController), ('sequenced', SegmentController))
+    ]
+    print_table(('multiplex', 'i2c_writes_per_s', 'i2c_writes_per_cycle', 'gpio_toggles_per_cycle'), rows)
+
+
+if __name__ == '__main__':
+    main()
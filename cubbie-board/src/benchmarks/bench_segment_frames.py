@@ -0,0 +1,75 @@
+"""
+Benchmark segment multiplex cycles per second, replaying the frame table against encoding every write, on the simulated
+bus.
+
+"""
+
+import argparse
+import os
+from timeit import default_timer
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+# Count transactions without waiting for them.
+os.environ.setdefault('I2C_SPEED', '0')
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+
+
+def legacy_blink_digits(controller):
+    """
+    The old multiplex cycle, encoding each digit as it is written.
+
+    """
+    displays = (controller.home_display, controller.away_display, controller.inning_display)
+    gpio = controller._gpio
+    for display in displays:
+        display.display_digit(-1)
+    left_pin, right_pin = controller._digit_pins
+    gpio.output(right_pin, gpio.LOW)
+    gpio.output(left_pin, gpio.HIGH)
+    for display in displays:
+        display.display_digit(display.digits[0])
+    for display in displays:
+        display.display_digit(-1)
+    gpio.output(left_pin, gpio.LOW)
+    gpio.output(right_pin, gpio.HIGH)
+    for display in displays:
+        display.display_digit(display.digits[1])
+
+
+def measure(controller, blink, cycles):
+    """
+    Run multiplex cycles, returning cycles per second, microseconds per cycle and bus writes per cycle.
+
+    """
+    bus = controller.i2c_bus._bus
+    transactions = bus.transactions
+    start = default_timer()
+    for _ in range(cycles):
+        blink()
+    duration = default_timer() - start
+    return cycles / duration, duration / cycles * 1e6, (bus.transactions - transactions) / float(cycles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=20000, help='Multiplex cycles to run')
+    args = parser.parse_args()
+    # Measure Python work only, not the time each digit is lit.
+    SegmentController.REFRESH_RATE = float('inf')
+    controller = SegmentController()
+    for key, value in (('inning', 12), ('inning_state', 'Top'), ('home_team_runs', 10), ('away_team_runs', 3)):
+        controller.write_update(key, value)
+    controller.process_updates()
+    rows = [
+        ('encode_per_write', ) + measure(controller, lambda: legacy_blink_digits(controller), args.cycles),
+        ('frame_table', ) + measure(controller, controller._blink_digits, args.cycles)
+    ]
+    print_table(('multiplex', 'cycles_per_s', 'us_per_cycle', 'bus_writes_per_cycle'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark I2C transactions of the shared segment bus, for chip setup and multiplexing, on the simulated bus.
+
+"""
+
+import os
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+# Count transactions without waiting for them.
+os.environ.setdefault('I2C_SPEED', '0')
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+from segment_display.sim_bus import SimBus  # noqa: E402
+
+# Registers used by the old setup.
+IODIR = 0x00
+GPPU = 0x06
+
+
+def legacy_setup(address):
+    """
+    The old setup: a bus per display, then another through the Adafruit helper and a read-modify-write per pin.
+
+    Returns the buses opened.
+
+    """
+    buses = [SimBus([address]), SimBus([address])]
+    bus = buses[-1]
+    bus.write_byte_data(address, IODIR, 0xFF)
+    bus.read_byte_data(address, IODIR)
+    bus.write_byte_data(address, GPPU, 0x00)
+    for pin in range(8):
+        direction = bus.read_byte_data(address, IODIR)
+        bus.write_byte_data(address, IODIR, direction & ~(1 << pin))
+    return buses
+
+
+def count_transactions(buses):
+    """
+    Get the buses opened and the writes and reads made on them.
+
+    """
+    log = [transaction for bus in buses for transaction in bus.log]
+    return (
+        len(buses),
+        sum(1 for transaction in log if not transaction.is_read),
+        sum(1 for transaction in log if transaction.is_read)
+    )
+
+
+def measure_setup():
+    """
+    Count the buses opened and transactions made setting up three chips, the old way and through the shared bus.
+
+    """
+    legacy_buses = [bus for address in (0x20, 0x21, 0x22) for bus in legacy_setup(address)]
+    return [
+        ('per_pin', ) + count_transactions(legacy_buses),
+        ('shared_bus', ) + count_transactions([SegmentController().i2c_bus._bus])
+    ]
+
+
+def measure_multiplex(state, cycles):
+    """
+    Multiplex a state, returning the I2C writes made and skipped per cycle.
+
+    """
+    SegmentController.REFRESH_RATE = float('inf')
+    controller = SegmentController()
+    controller.apply_state(state)
+    controller.process_updates()
+    writes = controller.i2c_bus.writes
+    skipped = controller.i2c_bus.skipped_writes
+    for _ in range(cycles):
+        controller._blink_digits()
+    return (
+        (controller.i2c_bus.writes - writes) / float(cycles),
+        (controller.i2c_bus.skipped_writes - skipped) / float(cycles)
+    )
+
+
+def main():
+    print_table(('setup', 'buses_opened', 'writes', 'reads'), measure_setup())
+    print('')
+    rows = [
+        ('{}/{}/{}'.format(state.inning, state.home_team_runs, state.away_team_runs), ) + measure_multiplex(state, 1000)
+        for state in (
+            SegmentState(12, 'Top', 10, 13),
+            SegmentState(11, 'Top', 22, 3),
+            SegmentState(11, 'Top', 11, 11)
+        )
+    ]
+    print_table(('inning/home/away', 'writes_per_cycle', 'skipped_per_cycle'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark segment multiplex jitter (error in how long each digit is lit), idle and under CPU load.
+
+Runs the thread-based loop on simulated hardware by default. With --pigpio, runs on the board against the real displays
+and measures the digit-enable edges through pigpio, for either multiplexer.
+
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+from PIL import Image
+
+from benchmarks.common import configure_headless, percentile, print_table
+
+# Payload parsed by the load threads, roughly a day's schedule response.
+LOAD_PAYLOAD = json.dumps({
+    'games': [{'id': i, 'teams': ['Cubs', 'Cardinals'], 'runs': [i, i + 1]} for i in range(500)]
+})
+
+
+def load(stop):
+    """
+    Keep the CPU busy with the work the board does between updates: JSON parsing and image resizing.
+
+    """
+    image = Image.new('RGB', (400, 400), (255, 0, 0))
+    while not stop.is_set():
+        json.loads(LOAD_PAYLOAD)
+        image.resize((128, 128), Image.LANCZOS)
+
+
+def on_times_from_edges(edges):
+    """
+    Get how long the digit was lit each time, from (time, level) edges of its enable pin.
+
+    """
+    on_times = []
+    rise = None
+    for edge_time, level in edges:
+        if level:
+            rise = edge_time
+        elif rise is not None:
+            on_times.append(edge_time - rise)
+    return on_times
+
+
+def record_sim(controller_class, duration):
+    """
+    Multiplex on simulated hardware, returning the left digit's enable edges.
+
+    """
+    controller = controller_class()
+    run(controller, duration)
+    return controller._gpio.get_edges(controller._digit_pins[0])
+
+
+def record_pigpio(controller_class, duration):
+    """
+    Multiplex on the board, returning the left digit's enable edges as seen by pigpio.
+
+    """
+    import pigpio
+    controller = controller_class()
+    edges = []
+    pi = pigpio.pi()
+    callback = pi.callback(
+        controller._digit_pins[0], pigpio.EITHER_EDGE, lambda pin, level, tick: edges.append((tick / 1e6, level))
+    )
+    run(controller, duration)
+    callback.cancel()
+    pi.stop()
+    return edges
+
+
+def run(controller, duration):
+    """
+    Multiplex double digits for a while, then stop.
+
+    """
+    for key, value in (('inning', 12), ('inning_state', 'Top'), ('home_team_runs', 10), ('away_team_runs', 3)):
+        controller.write_update(key, value)
+    controller.start()
+    time.sleep(duration)
+    controller.exit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0, help='Time to multiplex each way (seconds)')
+    parser.add_argument('--load-threads', type=int, default=2, help='Threads generating CPU load')
+    parser.add_argument('--pigpio', action='store_true', help='Measure on the board through pigpio')
+    args = parser.parse_args()
+    configure_headless()
+    if not args.pigpio:
+        os.environ['I2C_BACKEND'] = 'sim'
+        os.environ.setdefault('I2C_SPEED', '0')
+    from segment_display.segment_controller import SegmentController
+    # Each of the two digits is lit for half of every refresh.
+    target = 1.0 / (SegmentController.REFRESH_RATE * 2)
+    rows = []
+    multiplexers = ('thread', 'pigpio') if args.pigpio else ('thread', )
+    for multiplexer in multiplexers:
+        os.environ['SEGMENT_MULTIPLEXER'] = multiplexer
+        for load_threads in (0, args.load_threads):
+            stop = threading.Event()
+            loaders = [threading.Thread(target=load, args=(stop, )) for _ in range(load_threads)]
+            for loader in loaders:
+                loader.start()
+            if args.pigpio:
+                edges = record_pigpio(SegmentController, args.duration)
+            else:
+                edges = record_sim(SegmentController, args.duration)
+            stop.set()
+            for loader in loaders:
+                loader.join()
+            errors = [abs(on_time - target) * 1e3 for on_time in on_times_from_edges(edges)]
+            rows.append((
+                multiplexer, load_threads, len(errors),
+                percentile(errors, 50), percentile(errors, 95), max(errors)
+            ))
+    print('Target on-time per digit: {:.1f} ms'.format(target * 1e3))
+    print_table(('multiplexer', 'load_threads', 'phases', 'p50_err_ms', 'p95_err_ms', 'max_err_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
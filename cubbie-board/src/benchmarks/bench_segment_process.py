@@ -0,0 +1,101 @@
+"""
+Benchmark segment multiplex jitter under CPU load in the main process, multiplexing in a thread and in a dedicated
+process, on the simulated bus.
+
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_segment_jitter import load, on_times_from_edges
+from benchmarks.common import configure_headless, percentile, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_process import SegmentProcess  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+
+STATE = SegmentState(12, 'Top', 10, 3)
+
+
+class RecordingSegmentProcess(SegmentProcess):
+    """
+    Segment process which saves the left digit's enable edges to a file when stopped.
+
+    """
+
+    def __init__(self, path):
+        SegmentProcess.__init__(self)
+        self.path = path
+
+    def run(self):
+        controller = self._serve()
+        with open(self.path, 'w') as edges_file:
+            json.dump(controller._gpio.get_edges(controller._digit_pins[0]), edges_file)
+
+
+def record_thread(duration):
+    """
+    Multiplex in a thread, returning the left digit's enable edges.
+
+    """
+    controller = SegmentController()
+    controller.apply_state(STATE)
+    controller.start()
+    time.sleep(duration)
+    controller.exit()
+    return controller._gpio.get_edges(controller._digit_pins[0])
+
+
+def record_process(duration):
+    """
+    Multiplex in a dedicated process, returning the left digit's enable edges.
+
+    """
+    edges_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    edges_file.close()
+    process = RecordingSegmentProcess(edges_file.name)
+    process.start()
+    process.apply_state(STATE)
+    time.sleep(duration)
+    process.exit()
+    with open(edges_file.name) as edges_file:
+        edges = json.load(edges_file)
+    os.remove(edges_file.name)
+    return edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=3.0, help='Time to multiplex each way (seconds)')
+    parser.add_argument('--load-threads', type=int, default=2, help='Threads generating CPU load')
+    args = parser.parse_args()
+    # Each of the two digits is lit for half of every refresh.
+    target = 1.0 / (SegmentController.REFRESH_RATE * 2)
+    rows = []
+    for name, record in (('thread', record_thread), ('process', record_process)):
+        for load_threads in (0, args.load_threads):
+            stop = threading.Event()
+            loaders = [threading.Thread(target=load, args=(stop, )) for _ in range(load_threads)]
+            for loader in loaders:
+                loader.start()
+            edges = record(args.duration)
+            stop.set()
+            for loader in loaders:
+                loader.join()
+            errors = [abs(on_time - target) * 1e3 for on_time in on_times_from_edges(edges)]
+            rows.append((
+                name, load_threads, len(errors), percentile(errors, 50), percentile(errors, 95), max(errors)
+            ))
+    print('Target on-time per digit: {:.1f} ms'.format(target * 1e3))
+    print_table(('multiplexer', 'load_threads', 'phases', 'p50_err_ms', 'p95_err_ms', 'max_err_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
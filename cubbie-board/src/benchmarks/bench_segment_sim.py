@@ -0,0 +1,99 @@
+"""
+Benchmark the segment controller on the simulated I2C bus: achievable multiplex rate, bus utilization and the timing
+that decides flicker, at each bus speed.
+
+"""
+
+import argparse
+import os
+import time
+from timeit import default_timer
+
+from benchmarks.common import configure_headless, percentile, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+
+# Standard and fast mode.
+SPEEDS = (100000, 400000)
+
+
+def get_periods(edges, level):
+    """
+    Get the time from each edge to a given level until the next edge of the pin.
+
+    """
+    return [end[0] - start[0] for start, end in zip(edges, edges[1:]) if start[1] == level]
+
+
+def get_gaps(falls, rises):
+    """
+    Get the time from each falling edge of one pin to the next rising edge of another, when neither digit is lit.
+
+    """
+    gaps = []
+    rise_times = iter(sorted(rises))
+    rise = next(rise_times, None)
+    for fall in sorted(falls):
+        while rise is not None and rise < fall:
+            rise = next(rise_times, None)
+        if rise is None:
+            break
+        gaps.append(rise - fall)
+    return gaps
+
+
+def measure(speed, duration):
+    """
+    Multiplex double digits on a bus of the given speed for a while.
+
+    """
+    os.environ['I2C_SPEED'] = str(speed)
+    controller = SegmentController()
+    controller.apply_state(SegmentState(12, 'Top', 10, 13))
+    controller.start()
+    # Let the first update through before measuring.
+    time.sleep(0.1)
+    gpio = controller._gpio
+    bus = controller.i2c_bus._bus
+    start = default_timer()
+    time.sleep(duration)
+    end = default_timer()
+    controller.exit()
+    left = [edge for edge in gpio.get_edges(controller._digit_pins[0]) if start <= edge[0] < end]
+    right = [edge for edge in gpio.get_edges(controller._digit_pins[-1]) if start <= edge[0] < end]
+    left_on_times = get_periods(left, 1)
+    right_on_times = get_periods(right, 1)
+    gaps = get_gaps(
+        [edge[0] for edge in left + right if not edge[1]], [edge[0] for edge in left + right if edge[1]]
+    )
+    return (
+        speed // 1000,
+        len([edge for edge in left if edge[1]]) / (end - start),
+        bus.get_busy_time(start, end) / (end - start) * 100,
+        sum(left_on_times + right_on_times) / (end - start) * 100,
+        percentile(left_on_times, 50) * 1e3,
+        percentile(right_on_times, 50) * 1e3,
+        percentile(gaps, 50) * 1e3,
+        percentile(gaps, 95) * 1e3
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=2.0, help='Time to multiplex at each speed (seconds)')
+    args = parser.parse_args()
+    print_table(
+        (
+            'bus_khz', 'multiplex_hz', 'bus_util_pct', 'lit_pct', 'p50_left_on_ms', 'p50_right_on_ms', 'p50_dark_ms',
+            'p95_dark_ms'
+        ),
+        [measure(speed, args.duration) for speed in SPEEDS]
+    )
+
+
+if __name__ == '__main__':
+    main()
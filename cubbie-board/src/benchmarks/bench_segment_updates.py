@@ -0,0 +1,103 @@
+"""
+Benchmark I2C writes per game update, applying the state at once against four field updates, on simulated hardware.
+
+"""
+
+import os
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+# Count transactions without waiting for them.
+os.environ.setdefault('I2C_SPEED', '0')
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+from segment_display.segment_state import SegmentState  # noqa: E402
+
+# Successive states of a game, as polled: mostly unchanged, sometimes one field.
+GAME = [
+    SegmentState(1, 'Top', 0, 0),
+    SegmentState(1, 'Top', 0, 0),
+    SegmentState(1, 'Top', 0, 1),
+    SegmentState(1, 'Bottom', 0, 1),
+    SegmentState(1, 'Bottom', 0, 1),
+    SegmentState(2, 'Top', 0, 1),
+    SegmentState(2, 'Top', 2, 1),
+    SegmentState(3, 'Bottom', 2, 1),
+    SegmentState(3, 'Bottom', 2, 1),
+    SegmentState(4, 'Top', 3, 1)
+]
+
+
+class RewritingSegmentController(SegmentController):
+    """
+    The old controller, which rewrote every display after each update.
+
+    """
+
+    def _write_frame_changes(self, phase, old_frame_table):
+        self._write_frame(phase)
+
+
+def get_shown(controller):
+    """
+    Get the codes the displays show.
+
+    """
+    return tuple(display.codes for display in (
+        controller.home_display, controller.away_display, controller.inning_display
+    ))
+
+
+def apply_fields(controller, state):
+    """
+    The old update, one queued update per field, returning the codes shown in between.
+
+    """
+    shown = []
+    for field, value in zip(state._fields, state):
+        controller.write_update(field, value)
+        # The thread may wake between any two fields.
+        controller.process_updates()
+        shown.append(get_shown(controller))
+    return shown
+
+
+def apply_state(controller, state):
+    """
+    Apply the state at once, returning the codes shown.
+
+    """
+    controller.apply_state(state)
+    controller.process_updates()
+    return [get_shown(controller)]
+
+
+def measure(controller_class, apply):
+    """
+    Run through the game, returning I2C writes per update and how many half-applied states were shown.
+
+    """
+    controller = controller_class()
+    bus = controller.i2c_bus._bus
+    transactions = bus.transactions
+    partial_states = 0
+    for state in GAME:
+        before = get_shown(controller)
+        shown = apply(controller, state)
+        partial_states += sum(1 for codes in shown if codes not in (before, shown[-1]))
+    return (bus.transactions - transactions) / float(len(GAME)), partial_states
+
+
+def main():
+    rows = [
+        ('per_field_rewrite', ) + measure(RewritingSegmentController, apply_fields),
+        ('whole_state_diffed', ) + measure(SegmentController, apply_state)
+    ]
+    print('{} single digit game updates'.format(len(GAME)))
+    print_table(('update', 'i2c_writes_per_update', 'partial_states_shown'), rows)
+
+
+if __name__ == '__main__':
+    main()
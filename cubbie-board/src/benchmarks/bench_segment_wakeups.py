@@ -0,0 +1,83 @@
+"""
+Benchmark segment controller thread wake-ups per second against the old 10 ms loop, on simulated hardware.
+
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.common import configure_headless, print_table
+
+configure_headless()
+os.environ['I2C_BACKEND'] = 'sim'
+# Count transactions without waiting for them.
+os.environ.setdefault('I2C_SPEED', '0')
+
+from segment_display.segment_controller import SegmentController  # noqa: E402
+
+
+class PollingSegmentController(SegmentController):
+    """
+    The old loop, which woke up every 10 ms whether or not there was anything to multiplex.
+
+    """
+
+    def run(self):
+        while not self._stop_handle.is_set():
+            self.wakeups += 1
+            if self._shared_state.sequence != self._sequence:
+                self.process_updates()
+            if self._phase_count > 1:
+                self._blink_digits()
+            time.sleep(0.01)
+
+
+# (label, updates) for each state the board idles in.
+STATES = [
+    ('single_digits', (('inning', 3), ('inning_state', 'Top'), ('home_team_runs', 2), ('away_team_runs', 5))),
+    ('double_digits', (('inning', 12), ('inning_state', 'Top'), ('home_team_runs', 10), ('away_team_runs', 3))),
+    ('off', ())
+]
+
+
+def measure(controller_class, updates, turn_off, duration):
+    """
+    Let the controller settle into a state, returning its wake-ups per second there and its update latency.
+
+    """
+    controller = controller_class()
+    controller.start()
+    for key, value in updates:
+        controller.write_update(key, value)
+    time.sleep(0.1)
+    if turn_off:
+        controller.turn_off_displays()
+    wakeups = controller.wakeups
+    time.sleep(duration)
+    wakeups_per_s = (controller.wakeups - wakeups) / duration
+    # Latency from an update to its digit being written.
+    bus = controller.i2c_bus._bus
+    transactions = bus.transactions
+    start = time.time()
+    controller.write_update('away_team_runs', 7)
+    while bus.transactions == transactions:
+        time.sleep(0.0002)
+    latency = (time.time() - start) * 1e3
+    controller.exit()
+    return wakeups_per_s, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=2.0, help='Time to measure each state (seconds)')
+    args = parser.parse_args()
+    rows = []
+    for name, updates in STATES:
+        for loop, controller_class in (('polling', PollingSegmentController), ('blocking', SegmentController)):
+            rows.append((name, loop) + measure(controller_class, updates, name == 'off', args.duration))
+    print_table(('state', 'loop', 'wakeups_per_s', 'update_latency_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
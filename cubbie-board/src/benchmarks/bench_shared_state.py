@@ -0,0 +1,99 @@
+"""
+Benchmark handing updates to a render loop through the shared state block against the old Queue: time per update
+and per poll of the loop, idle and with a producer thread contending.
+
+"""
+
+import argparse
+import threading
+from Queue import Queue
+from timeit import default_timer
+
+from benchmarks.common import print_table
+from utils.shared_state import SharedState
+
+# Values in an update, as for the segment displays.
+SIZE = 4
+
+
+class QueueChannel(object):
+    """
+    The old hand-off: a tuple per update through a Queue, polled with empty().
+
+    """
+
+    def __init__(self):
+        self.queue = Queue()
+
+    def write(self):
+        self.queue.put(('home_team_runs', 3))
+
+    def poll(self):
+        if not self.queue.empty():
+            self.queue.get()
+
+
+class SharedStateChannel(object):
+    """
+    The shared state block, polled by sequence number.
+
+    """
+
+    def __init__(self):
+        self.shared_state = SharedState(SIZE)
+        self.sequence = self.shared_state.sequence
+        self.update = {2: 3}
+
+    def write(self):
+        self.shared_state.write(self.update)
+
+    def poll(self):
+        if self.shared_state.sequence != self.sequence:
+            self.sequence, _ = self.shared_state.read()
+
+
+def contend(channel, stop):
+    """
+    Keep writing updates, as a busy producer.
+
+    """
+    while not stop.is_set():
+        channel.write()
+
+
+def time_per_call(func, repeat):
+    """
+    Get the mean time of a call (microseconds), timing the calls as a batch.
+
+    """
+    start = default_timer()
+    for _ in range(repeat):
+        func()
+    return (default_timer() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=100000)
+    args = parser.parse_args()
+    rows = []
+    for name, channel_class in (('queue', QueueChannel), ('shared_state', SharedStateChannel)):
+        channel = channel_class()
+
+        def update():
+            channel.write()
+            channel.poll()
+
+        row = [name, time_per_call(update, args.repeat), time_per_call(channel.poll, args.repeat)]
+        stop = threading.Event()
+        producer = threading.Thread(target=contend, args=(channel, stop))
+        producer.start()
+        row.append(time_per_call(channel.poll, args.repeat))
+        stop.set()
+        producer.join()
+        rows.append(tuple(row))
+    print_table(('channel', 'update_us', 'idle_poll_us', 'contended_poll_us'), rows)
+
+
+if __name__ == '__main__':
+    main()
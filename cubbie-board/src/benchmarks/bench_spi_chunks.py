@@ -0,0 +1,98 @@
+"""
+Benchmark LCD frame push time versus SPI chunk size and clock speed.
+
+Notes:
+    Off the Pi, SPI transfers are modeled: each transfer costs a fixed syscall overhead plus its bits on the wire.
+    The Python-side cost of the push loop is measured for real and added to the modeled wire time.
+
+"""
+
+import argparse
+import os.path
+
+from PIL import Image
+
+from benchmarks.common import time_calls, summarize, print_table
+from lcd_display.frame_buffer import FrameBuffer
+
+# Modeled cost of one spidev ioctl on a Pi Zero (seconds).
+TRANSFER_OVERHEAD = 60e-6
+LOGO = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lcd_display', 'tests', 'img', 'Cubs.jpg')
+
+
+class ModeledSpiDevice(object):
+    """
+    Stand-in for spidev which accumulates modeled transfer time.
+
+    Attributes:
+        clock_speed (int): SPI clock speed (Hz)
+        wire_time (float): Accumulated modeled transfer time (seconds)
+
+    """
+
+    def __init__(self, clock_speed):
+        # type: (int) -> None
+        self.clock_speed = clock_speed  # type: int
+        self.wire_time = 0.0  # type: float
+
+    def writebytes(self, data):
+        self.wire_time += TRANSFER_OVERHEAD + len(data) * 8.0 / self.clock_speed
+
+    writebytes2 = writebytes
+
+
+def legacy_push(image, spi, chunk_size):
+    """
+    Push a frame the way the generic ST7735 library does: a list of byte ints, sliced per transfer.
+
+    """
+    pixels = image.convert('RGB').load()
+    width, height = image.size
+    data = []
+    for y in range(height):
+        for x in range(width):
+            r, g, b = pixels[x, y]
+            color = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+            data.append(color >> 8)
+            data.append(color & 0xFF)
+    for start in range(0, len(data), chunk_size):
+        spi.writebytes(data[start:start + chunk_size])
+
+
+def chunked_push(image, spi, frame_buffer):
+    """
+    Push a frame from the preallocated frame buffer.
+
+    """
+    frame_buffer.encode(image)
+    for chunk in frame_buffer.chunks:
+        spi.writebytes2(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--width', type=int, default=128)
+    parser.add_argument('--height', type=int, default=128)
+    args = parser.parse_args()
+    image = Image.open(LOGO).convert('RGB').resize((args.width, args.height))
+    rows = []
+    for clock_speed in (4000000, 16000000, 32000000):
+        for chunk_size in (1024, 4096, 16384, 65536):
+            # Legacy path.
+            spi = ModeledSpiDevice(clock_speed)
+            cpu = time_calls(lambda: legacy_push(image, spi, 4096), args.frames)
+            legacy_ms = summarize(cpu)[0] + spi.wire_time / args.frames * 1e3
+            # Chunked path.
+            spi = ModeledSpiDevice(clock_speed)
+            frame_buffer = FrameBuffer(args.width, args.height, chunk_size)
+            cpu = time_calls(lambda: chunked_push(image, spi, frame_buffer), args.frames)
+            p50, p95, _ = summarize(cpu)
+            wire_ms = spi.wire_time / args.frames * 1e3
+            rows.append((clock_speed // 1000000, chunk_size, len(frame_buffer.chunks), p50, wire_ms, p50 + wire_ms,
+                         legacy_ms))
+    print_table(('MHz', 'chunk', 'xfers', 'cpu_ms', 'wire_ms', 'frame_ms', 'legacy_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
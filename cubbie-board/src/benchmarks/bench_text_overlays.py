@@ -0,0 +1,67 @@
+"""
+Benchmark the text overlay cache: warm-up cost and per-frame annotation time with and without it.
+
+"""
+
+import argparse
+import os
+import os.path
+
+from PIL import Image, ImageFont, ImageDraw
+
+from benchmarks.common import time_calls, summarize, print_table
+from games.game_overview import GameOverview
+from lcd_display.text_renderer import TextRenderer
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FONT_PATH = os.path.join(ROOT_PATH, 'font', 'arial.ttf')
+LOGO_DIR = os.path.join(ROOT_PATH, 'img', 'logos')
+
+
+def uncached_annotate(font, image, width, height):
+    """
+    Annotate a final logo the way the display did before overlays were cached.
+
+    """
+    draw = ImageDraw.Draw(image)
+    text, font_color, bg_color = TextRenderer.STATUS_HEADERS[GameOverview.FINAL_STATUS]
+    text_w, text_h = font.getsize(text)
+    draw.rectangle((0, 0, width, text_h + 4), fill=bg_color)
+    draw.text(((width - text_w) // 2, 2), text, fill=font_color, font=font)
+    text = 'Cubs won!'
+    text_w, text_h = font.getsize(text)
+    text_y = height - 5 - text_h
+    draw.rectangle((0, text_y - 5, text_w + 10, text_y + text_h + 5), fill=TextRenderer.GRAY)
+    draw.text((5, text_y), text, fill=TextRenderer.WHITE, font=font)
+
+
+def cached_annotate(renderer, image):
+    """
+    Annotate a final logo from the overlay cache.
+
+    """
+    renderer.add_status_header(GameOverview.FINAL_STATUS, image)
+    renderer.add_winner_text('Cubs', image)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--size', type=int, default=128)
+    args = parser.parse_args()
+    font = ImageFont.truetype(FONT_PATH, 15)
+    teams = [item.split('.jpg')[0] for item in os.listdir(LOGO_DIR) if item.endswith('.jpg')]
+    renderer = TextRenderer(font, args.size, args.size)
+    warm_up = renderer.warm_up(teams)
+    logo = Image.new('RGB', (args.size, args.size), (255, 255, 255))
+    rows = [
+        ('uncached', ) + summarize(time_calls(lambda: uncached_annotate(font, logo.copy(), args.size, args.size),
+                                              args.frames)),
+        ('cached', ) + summarize(time_calls(lambda: cached_annotate(renderer, logo.copy()), args.frames))
+    ]
+    print('Warm-up: {:.2f} ms for {} overlays'.format(warm_up * 1e3, len(renderer._overlays)))
+    print_table(('path', 'p50_ms', 'p95_ms', 'max_ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
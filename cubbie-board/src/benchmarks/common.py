@@ -0,0 +1,111 @@
+"""
+Helpers shared by the benchmarks.
+
+"""
+
+import os
+from timeit import default_timer
+
+from typing import Callable, List, Tuple
+
+
+def time_calls(func, repeat):
+    # type: (Callable[[], None], int) -> List[float]
+    """
+    Time repeated calls of a function.
+
+    Args:
+        func (Callable[[], None]): Function to time
+        repeat (int): Number of calls
+
+    Returns:
+        List[float]: Duration of each call (seconds)
+
+    """
+    durations = []
+    for _ in range(repeat):
+        start = default_timer()
+        func()
+        durations.append(default_timer() - start)
+    return durations
+
+
+def percentile(values, pct):
+    # type: (List[float], float) -> float
+    """
+    Get a percentile of some values (nearest rank).
+
+    Args:
+        values (List[float]): Values to look at
+        pct (float): Percentile, 0 - 100
+
+    Returns:
+        float: The percentile value
+
+    """
+    ordered = sorted(values)
+    index = int(round(pct / 100.0 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(values):
+    # type: (List[float]) -> Tuple[float, float, float]
+    """
+    Get the p50, p95 and max of some durations, in milliseconds.
+
+    Args:
+        values (List[float]): Durations (seconds)
+
+    Returns:
+        Tuple[float, float, float]: (p50, p95, max) in milliseconds
+
+    """
+    return percentile(values, 50) * 1e3, percentile(values, 95) * 1e3, max(values) * 1e3
+
+
+def print_table(header, rows):
+    # type: (Tuple[str, ...], List[Tuple]) -> None
+    """
+    Print rows as an aligned table.
+
+    Args:
+        header (Tuple[str, ...]): Column names
+        rows (List[Tuple]): Rows of values
+
+    """
+    cells = [header] + [
+        tuple('{:.3f}'.format(value) if isinstance(value, float) else str(value) for value in row) for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    for row in cells:
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+# Config for running the board headless, used where the environment does not set it.
+HEADLESS_CONFIG = {
+    'LCD_BACKEND': 'virtual',
+    'LCD_WIDTH': '128',
+    'LCD_HEIGHT': '128',
+    'HOME_LCD_PWM_PIN': '12',
+    'AWAY_LCD_PWM_PIN': '13',
+    'LOGO_DIR': '../img/logos',
+    'FONT_DIR': '../font',
+    'HOME_MCP23008_ADDRESS': '0x20',
+    'AWAY_MCP23008_ADDRESS': '0x21',
+    'INNING_MCP23008_ADDRESS': '0x22',
+    'LEFT_DIGIT_PIN': '5',
+    'RIGHT_DIGIT_PIN': '6'
+}
+
+
+def configure_headless():
+    # type: () -> None
+    """
+    Default the config to run the board on simulated hardware.
+
+    Notes:
+        Must be called before importing modules which read config at import time.
+
+    """
+    for key, value in HEADLESS_CONFIG.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,371 @@
+"""
+For recording a game day from the APIs, synthesizing one, and serving one back in place of the APIs.
+
+Notes:
+    A day is stored as JSON lines. The first line is the date and the day game info API's response for it; each line
+    after is one poll: its time (seconds since midnight) and the game overview API's response for every game of the
+    day at that time, exactly as returned.
+
+    Record a day with `python -m benchmarks.game_day record day.jsonl` (needs the API config), or write the
+    synthetic day the replay benchmark uses by default with `python -m benchmarks.game_day synthesize day.jsonl`.
+
+"""
+
+import argparse
+import json
+import random
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import requests
+from typing import Any, Dict, List, Optional, Tuple
+
+# MLB code of each team with a logo, as used in game IDs.
+TEAM_CODES = {
+    'Angels': 'ana', 'Astros': 'hou', 'Athletics': 'oak', 'Blue Jays': 'tor', 'Braves': 'atl', 'Brewers': 'mil',
+    'Cardinals': 'sln', 'Cubs': 'chn', 'D-backs': 'ari', 'Dodgers': 'lan', 'Giants': 'sfn', 'Indians': 'cle',
+    'Mariners': 'sea', 'Marlins': 'mia', 'Mets': 'nyn', 'Nationals': 'was', 'Orioles': 'bal', 'Padres': 'sdn',
+    'Phillies': 'phi', 'Pirates': 'pit', 'Rangers': 'tex', 'Rays': 'tba', 'Red Sox': 'bos', 'Reds': 'cin',
+    'Rockies': 'col', 'Royals': 'kca', 'Tigers': 'det', 'Twins': 'min', 'White Sox': 'cha', 'Yankees': 'nya'
+}
+# Usual first pitch times (hours, minutes).
+START_TIMES = [(13, 5), (13, 10), (13, 20), (14, 10), (16, 5), (16, 10), (18, 10), (19, 5), (19, 10), (19, 15),
+               (20, 10), (21, 10), (21, 40)]
+# Runs scored in a half inning, drawn uniformly.
+HALF_INNING_RUNS = (0, 0, 0, 0, 0, 0, 0, 1, 1, 2, 3)
+# Seed and date of the synthetic day.
+SEED = 2019
+SYNTHETIC_DATE = date(2019, 6, 15)
+# Time between polls of the overview API (seconds).
+POLL_INTERVAL = 30
+# Warm-up before first pitch, break between half innings (seconds).
+WARM_UP_TIME = 30 * 60
+BREAK_TIME = 2 * 60
+
+GameDay = namedtuple('GameDay', ['date', 'games', 'polls'])
+Poll = namedtuple('Poll', ['time', 'overviews'])
+ReplayResponse = namedtuple('ReplayResponse', ['status_code', 'content'])
+
+
+def load_day(path):
+    # type: (str) -> GameDay
+    """
+    Load a recorded day.
+
+    Args:
+        path (str): Path of the recording
+
+    Returns:
+        GameDay: The day, with date as a date, and polls in time order
+
+    """
+    with open(path) as day_file:
+        header = json.loads(next(day_file))
+        polls = [Poll(poll['time'], poll['overviews']) for poll in (json.loads(line) for line in day_file)]
+    return GameDay(
+        datetime.strptime(header['date'], '%Y-%m-%d').date(),
+        header['games'],
+        sorted(polls, key=lambda poll: poll.time)
+    )
+
+
+def save_day(day, path):
+    # type: (GameDay, str) -> None
+    """
+    Save a day as a recording.
+
+    Args:
+        day (GameDay): The day
+        path (str): Path to write the recording to
+
+    """
+    with open(path, 'w') as day_file:
+        day_file.write(json.dumps({'date': day.date.isoformat(), 'games': day.games}) + '\n')
+        for poll in day.polls:
+            day_file.write(json.dumps({'time': poll.time, 'overviews': poll.overviews}) + '\n')
+
+
+def _format_time(day, seconds):
+    # type: (date, int) -> datetime
+    return datetime.combine(day, datetime.min.time()) + timedelta(seconds=seconds)
+
+
+def _overview(game, start, status, inning=0, inning_state='', home_runs=0, away_runs=0):
+    # type: (Dict[str, Any], datetime, str, int, str, int, int) -> Dict[str, Any]
+    return {
+        'game_id': game['game_id'],
+        'status': status,
+        'inning': inning,
+        'inning_state': inning_state,
+        'home_team_runs': home_runs,
+        'away_team_runs': away_runs,
+        'home_team_name': game['home_team'],
+        'away_team_name': game['away_team'],
+        'time_date': start.strftime('%Y/%m/%d %I:%M'),
+        'ampm': start.strftime('%p')
+    }
+
+
+def _play_game(rng, game, start_time, start):
+    # type: (random.Random, Dict[str, Any], int, datetime) -> List[Tuple[int, Dict[str, Any]]]
+    """
+    Play out a game, half inning by half inning.
+
+    Returns:
+        List[Tuple[int, Dict[str, Any]]]: (time, overview) for each change, in time order
+
+    """
+    events = [(0, _overview(game, start, 'Pre-Game')), (start_time - WARM_UP_TIME, _overview(game, start, 'Warmup'))]
+    now = start_time
+    runs = {'Top': 0, 'Bottom': 0}
+    inning, inning_state = 1, 'Top'
+    while True:
+        duration = rng.uniform(8, 12) * 60
+        events.append((int(now), _overview(game, start, 'In Progress', inning, inning_state, runs['Bottom'],
+                                           runs['Top'])))
+        for run_time in sorted(rng.uniform(now, now + duration) for _ in range(rng.choice(HALF_INNING_RUNS))):
+            runs[inning_state] += 1
+            events.append((int(run_time), _overview(game, start, 'In Progress', inning, inning_state,
+                                                    runs['Bottom'], runs['Top'])))
+            # Walk-off.
+            if inning >= 9 and runs['Bottom'] > runs['Top']:
+                duration = run_time - now
+                break
+        now += duration
+        # Over from the 9th once the home team leads, or either team leads after a full inning.
+        if inning >= 9 and (runs['Bottom'] > runs['Top'] or inning_state == 'Bottom' and runs['Bottom'] != runs['Top']):
+            break
+        events.append((int(now), _overview(game, start, 'In Progress', inning,
+                                           'Middle' if inning_state == 'Top' else 'End', runs['Bottom'], runs['Top'])))
+        now += BREAK_TIME
+        inning, inning_state = (inning, 'Bottom') if inning_state == 'Top' else (inning + 1, 'Top')
+    last = events[-1][1]
+    events.append((int(now), _overview(game, start, 'Final', last['inning'], last['inning_state'],
+                                       last['home_team_runs'], last['away_team_runs'])))
+    return events
+
+
+def synthesize_day(seed=SEED, day=SYNTHETIC_DATE, poll_interval=POLL_INTERVAL):
+    # type: (int, date, int) -> GameDay
+    """
+    Make up a full day of games, the same for a seed.
+
+    Notes:
+        Every team plays, starting at usual times, with one game postponed. Polled from an hour before the first game
+        until ten minutes after the last ends.
+
+    Args:
+        seed (int): Random seed
+        day (date): Date of the games
+        poll_interval (int): Time between polls (seconds)
+
+    Returns:
+        GameDay: The day
+
+    """
+    rng = random.Random(seed)
+    teams = sorted(TEAM_CODES)
+    rng.shuffle(teams)
+    games = []  # type: List[Dict[str, Any]]
+    timelines = []  # type: List[List[Tuple[int, Dict[str, Any]]]]
+    postponed = rng.randrange(len(teams) // 2)
+    for i in range(len(teams) // 2):
+        away_team, home_team = teams[2 * i], teams[2 * i + 1]
+        hours, minutes = rng.choice(START_TIMES)
+        start_time = hours * 3600 + minutes * 60
+        start = _format_time(day, start_time)
+        game = {
+            'game_id': '{}_{}mlb_{}mlb_1'.format(day.strftime('%Y_%m_%d'), TEAM_CODES[away_team],
+                                                 TEAM_CODES[home_team]),
+            'date': start.strftime('%Y-%m-%dT%H:%M:%S'),
+            'game_start_time': start.strftime('%I:%M %p'),
+            'game_status': 'PRE_GAME',
+            'home_team': home_team,
+            'away_team': away_team
+        }
+        games.append(game)
+        if i == postponed:
+            timelines.append([(0, _overview(game, start, 'Pre-Game')),
+                              (start_time - WARM_UP_TIME, _overview(game, start, 'Postponed'))])
+        else:
+            timelines.append(_play_game(rng, game, start_time, start))
+    first = min(timeline[1][0] for timeline in timelines) - 30 * 60
+    last = max(timeline[-1][0] for timeline in timelines) + 10 * 60
+    change_times = [[event_time for event_time, _ in timeline] for timeline in timelines]
+    polls = [
+        Poll(poll_time, [
+            timeline[bisect_right(times, poll_time) - 1][1] for times, timeline in zip(change_times, timelines)
+        ]) for poll_time in range(first, last + 1, poll_interval)
+    ]
+    return GameDay(day, games, polls)
+
+
+def record_day(path, day_game_info_url, game_overview_url, api_key, poll_interval=POLL_INTERVAL):
+    # type: (str, str, str, str, int) -> None
+    """
+    Record today's games from the APIs, polling until every game is over.
+
+    Notes:
+        Each poll is appended as it is made, so a recording cut short still replays.
+
+    Args:
+        path (str): Path to write the recording to
+        day_game_info_url (str): Day game info API URL
+        game_overview_url (str): Game overview API URL
+        api_key (str): API auth key
+        poll_interval (int): Time between polls (seconds)
+
+    """
+    from games.base_api import BaseAPI
+
+    headers = {'Content-Type': 'application/json', 'x-api-key': api_key}
+    today = date.today()
+    games = json.loads(BaseAPI.post_request_wrapper(
+        day_game_info_url,
+        json.dumps({'month': today.month, 'day': today.day, 'year': today.year}, separators=(',', ':')),
+        headers
+    ).content)
+    game_ids = [game['game_id'] for game in games]
+    with open(path, 'w') as day_file:
+        day_file.write(json.dumps({'date': today.isoformat(), 'games': games}) + '\n')
+        while True:
+            poll_start = time.time()
+            overviews = json.loads(BaseAPI.post_request_wrapper(
+                game_overview_url,
+                json.dumps(game_ids, separators=(',', ':')),
+                headers
+            ).content)
+            now = datetime.now()
+            day_file.write(json.dumps({
+                'time': int((now - datetime.combine(today, datetime.min.time())).total_seconds()),
+                'overviews': overviews
+            }) + '\n')
+            day_file.flush()
+            if isinstance(overviews, list) and all(
+                    overview['status'] in ('Final', 'Postponed') for overview in overviews):
+                return
+            time.sleep(max(poll_interval - (time.time() - poll_start), 0))
+
+
+class ReplayServer(object):
+    """
+    Answers API requests from a recorded day, as of a virtual time.
+
+    Notes:
+        Installed in place of requests.Session.post, so the APIs are exercised from the request on. Unknown URLs get
+        the APIs' error response, rather than an exception the APIs would retry forever.
+
+    Attributes:
+        day (GameDay): Day replayed
+        now (int): Virtual time (seconds since midnight)
+        request_count (int): Number of requests answered
+        _urls (Tuple[str, str]): Day game info and game overview API URLs
+        _poll_times (List[int]): Time of each poll
+        _poll_overviews (List[Dict[str, Dict[str, Any]]]): Game ID -> overview, for each poll
+        _original_post (Optional[Any]): requests.Session.post, while installed
+
+    """
+
+    def __init__(self, day, day_game_info_url, game_overview_url):
+        # type: (GameDay, str, str) -> None
+        """
+        Index the day's polls.
+
+        Args:
+            day (GameDay): Day to replay
+            day_game_info_url (str): Day game info API URL
+            game_overview_url (str): Game overview API URL
+
+        """
+        self.day = day  # type: GameDay
+        self.now = day.polls[0].time  # type: int
+        self.request_count = 0  # type: int
+        self._urls = (day_game_info_url, game_overview_url)  # type: Tuple[str, str]
+        self._poll_times = [poll.time for poll in day.polls]  # type: List[int]
+        self._poll_overviews = [
+            {overview['game_id']: overview for overview in poll.overviews} for poll in day.polls
+        ]  # type: List[Dict[str, Dict[str, Any]]]
+        self._original_post = None  # type: Optional[Any]
+
+    @property
+    def is_over(self):
+        # type: () -> bool
+        """
+        Check if the virtual time is past the last poll.
+
+        Returns:
+            bool: Whether the day is over
+
+        """
+        return self.now > self._poll_times[-1]
+
+    def post(self, url, data=None, **kwargs):
+        # type: (str, Optional[str], **Any) -> ReplayResponse
+        """
+        Answer a request with the latest poll at the virtual time.
+
+        Args:
+            url (str): Request URL
+            data (Optional[str]): Request body
+
+        Returns:
+            ReplayResponse: Response, with the body as content
+
+        """
+        self.request_count += 1
+        if url == self._urls[0]:
+            body = self.day.games  # type: Any
+        elif url == self._urls[1]:
+            overviews = self._poll_overviews[max(bisect_right(self._poll_times, self.now) - 1, 0)]
+            body = [overviews[game_id] for game_id in json.loads(data) if game_id in overviews]
+        else:
+            return ReplayResponse(404, json.dumps({'message': 'Not Found'}))
+        return ReplayResponse(200, json.dumps(body))
+
+    def install(self):
+        # type: () -> None
+        """
+        Answer every request made through requests.
+
+        """
+        server = self
+
+        def post(session, url, data=None, **kwargs):
+            return server.post(url, data, **kwargs)
+
+        self._original_post = requests.Session.post
+        requests.Session.post = post
+
+    def uninstall(self):
+        # type: () -> None
+        """
+        Restore requests.
+
+        """
+        requests.Session.post = self._original_post
+        self._original_post = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    synthesize_parser = subparsers.add_parser('synthesize', help='Write the synthetic day')
+    synthesize_parser.add_argument('path')
+    synthesize_parser.add_argument('--seed', type=int, default=SEED)
+    record_parser = subparsers.add_parser('record', help="Record today's games from the APIs")
+    record_parser.add_argument('path')
+    record_parser.add_argument('--interval', type=int, default=POLL_INTERVAL, help='Time between polls (seconds)')
+    args = parser.parse_args()
+    if args.command == 'synthesize':
+        save_day(synthesize_day(args.seed), args.path)
+    else:
+        from decouple import config
+
+        record_day(args.path, config('DAY_GAME_INFO_API_URL'), config('GAME_OVERVIEW_API_URL'), config('API_KEY'),
+                   args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,16 @@ For holding base API class used in more specific API classes.
 
 """
 
+import logging
+
 import requests
 from requests.adapters import HTTPAdapter
 from typing import Dict, Union, Any
 
+from utils import instrumentation
+
+logger = logging.getLogger(__name__)
+
 
 class BaseAPI(object):
     """
@@ -53,10 +59,12 @@ class BaseAPI(object):
             session.mount(url, HTTPAdapter(max_retries=4))
             # Make the request, catching errors.
             try:
-                return session.post(
-                    url,
-                    data=data,
-                    headers=headers
-                )
+                with instrumentation.span('api.round_trip'):
+                    return session.post(
+                        url,
+                        data=data,
+                        headers=headers
+                    )
             except Exception as e:
-                print(e)
+                instrumentation.count('api.retries')
+                logger.warning('Request to %s failed, retrying: %s', url, e)
@@ -1,10 +1,14 @@
 import json
+import logging
 
 from typing import List
 
+from utils import instrumentation
 from .base_api import BaseAPI
 from .day_game_info import DayGameInfo
 
+logger = logging.getLogger(__name__)
+
 
 class DayGameInfoAPI(BaseAPI):
     """
@@ -44,19 +48,22 @@ class DayGameInfoAPI(BaseAPI):
             headers
         )
         # Parse response.
-        json_response = json.loads(result.content)
+        with instrumentation.span('api.json_parse'):
+            json_response = json.loads(result.content)
         # If API failed, return nothing.
-        # TODO: Add logging!!
         if isinstance(json_response, dict) and 'message' in json_response:
+            logger.warning('Day game info API failed: %s', json_response['message'])
             return []
         # Create info instances and return.
-        return [
-            DayGameInfo(
-                game['game_id'],
-                game['date'],
-                game['game_start_time'],
-                game['game_status'],
-                game['home_team'],
-                game['away_team']
-            ) for game in json_response
-        ]
+        with instrumentation.span('api.model_construction'):
+            games = [
+                DayGameInfo(
+                    game['game_id'],
+                    game['date'],
+                    game['game_start_time'],
+                    game['game_status'],
+                    game['home_team'],
+                    game['away_team']
+                ) for game in json_response
+            ]
+        return games
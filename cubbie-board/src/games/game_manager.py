@@ -9,6 +9,7 @@ from datetime import date
 from decouple import config
 from typing import List, Union
 
+from utils import instrumentation
 from .day_game_info import DayGameInfo
 from .day_game_info_api import DayGameInfoAPI
 from .game_overview import GameOverview
@@ -198,7 +199,8 @@ class GameManager(object):
 
         """
         # Update games, getting preferred team game index if active.
-        pref_team_i = self._update_overviews()
+        with instrumentation.span('games.refresh'):
+            pref_team_i = self._update_overviews()
         # Refill game queue if not all games are over.
         if not self._are_all_over():
             self._refill_queue(pref_team_i=pref_team_i)
@@ -4,12 +4,16 @@ For holding the API manager for game overview details.
 """
 
 import json
+import logging
 
 from typing import List
 
+from utils import instrumentation
 from .base_api import BaseAPI
 from .game_overview import GameOverview
 
+logger = logging.getLogger(__name__)
+
 
 class GameOverviewAPI(BaseAPI):
     """
@@ -41,30 +45,34 @@ class GameOverviewAPI(BaseAPI):
             headers
         )
         # Parse response.
-        json_response = json.loads(result.content)
+        with instrumentation.span('api.json_parse'):
+            json_response = json.loads(result.content)
         # If API failed, return nothing.
-        # TODO: Add logging!!
         if isinstance(json_response, dict) and 'message' in json_response:
+            logger.warning('Game overview API failed: %s', json_response['message'])
             return []
         # DEBUG: Find what is causing the overview API to return unicode numbers sometimes.
         for game in json_response:
-            if isinstance(unicode, game['inning']) or isinstance(unicode, game['home_team_runs']) \
-                    or isinstance(unicode, game['away_team_runs']):
-                print('ASCII', json.dumps(json_response))
-                print('Unicode', json.dumps(json_response, ensure_ascii=False))
+            if isinstance(game['inning'], unicode) or isinstance(game['home_team_runs'], unicode) \
+                    or isinstance(game['away_team_runs'], unicode):
+                logger.error('ASCII %s', json.dumps(json_response))
+                logger.error('Unicode %s', json.dumps(json_response, ensure_ascii=False))
                 raise ValueError('Unicode error encountered')
         # Create info instances and return.
-        return [
-            GameOverview(
-                game['game_id'],
-                game['status'],
-                int(game['inning']),
-                game['inning_state'],
-                int(game['home_team_runs']),
-                int(game['away_team_runs']),
-                game['home_team_name'],
-                game['away_team_name'],
-                game['time_date'],
-                game['ampm']
-            ) for game in json_response
-        ]
+        with instrumentation.span('api.model_construction'):
+            overviews = [
+                GameOverview(
+                    game['game_id'],
+                    game['status'],
+                    int(game['inning']),
+                    game['inning_state'],
+                    int(game['home_team_runs']),
+                    int(game['away_team_runs']),
+                    game['home_team_name'],
+                    game['away_team_name'],
+                    game['time_date'],
+                    game['ampm']
+                ) for game in json_response
+            ]
+        instrumentation.mark('games.overviews_fetched')
+        return overviews
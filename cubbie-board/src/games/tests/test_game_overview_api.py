@@ -1,15 +1,22 @@
+import json
 from unittest import TestCase
 
 from decouple import config
 
+from games.game_overview import GameOverview
 from games.game_overview_api import GameOverviewAPI
 
-# API URL and key.
-API_URL = config('GAME_OVERVIEW_API_URL')
-API_KEY = config('API_KEY')
-
 
 class TestGameOverviewAPI(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Get the API URL and key.
+
+        """
+        self.api_url = config('GAME_OVERVIEW_API_URL')
+        self.api_key = config('API_KEY')
+
     def test_fetch_overviews(self):
         """
         Test API fetching.
@@ -20,7 +27,7 @@ class TestGameOverviewAPI(TestCase):
             '2019_05_24_cinmlb_chnmlb_1',
             '2019_05_24_miamlb_wasmlb_1'
         ]
-        overview_api = GameOverviewAPI(API_URL, API_KEY)
+        overview_api = GameOverviewAPI(self.api_url, self.api_key)
         # Get overview for 2 games.
         overviews = overview_api.fetch_overviews(ids)
         # There should be 2.
@@ -28,3 +35,79 @@ class TestGameOverviewAPI(TestCase):
         overviews.sort(key=lambda x: x.game_id)
         # Check IDs match.
         self.assertListEqual(ids, [game.game_id for game in overviews])
+
+
+class Response(object):
+    """
+    Stands in for a requests response.
+
+    """
+
+    def __init__(self, content):
+        self.content = content
+
+
+class TestGameOverviewResponse(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Answer requests with a stored response instead of the API.
+
+        """
+        self.content = None
+        self.post_request_wrapper = GameOverviewAPI.__dict__.get('post_request_wrapper')
+        GameOverviewAPI.post_request_wrapper = staticmethod(lambda url, data, headers: Response(self.content))
+        self.overview_api = GameOverviewAPI('https://example.com/overview/', 'asecretkey')
+
+    def tearDown(self):
+        # type: () -> None
+        if self.post_request_wrapper is None:
+            del GameOverviewAPI.post_request_wrapper
+        else:
+            GameOverviewAPI.post_request_wrapper = self.post_request_wrapper
+
+    @staticmethod
+    def get_game(inning, home_team_runs, away_team_runs):
+        return {
+            'game_id': '2019_05_24_cinmlb_chnmlb_1',
+            'status': GameOverview.IN_PROGRESS_STATUS,
+            'inning': inning,
+            'inning_state': 'Top',
+            'home_team_runs': home_team_runs,
+            'away_team_runs': away_team_runs,
+            'home_team_name': 'Cubs',
+            'away_team_name': 'Reds',
+            'time_date': '2019/05/24 1:20',
+            'ampm': 'PM'
+        }
+
+    def test_parse_overviews(self):
+        """
+        Test a non-empty response is parsed into overviews.
+
+        """
+        self.content = json.dumps([self.get_game(5, 3, 2)])
+        overviews = self.overview_api.fetch_overviews(['2019_05_24_cinmlb_chnmlb_1'])
+        self.assertEqual(1, len(overviews))
+        self.assertEqual(
+            ('2019_05_24_cinmlb_chnmlb_1', 5, 3, 2, 'Cubs', 'Reds'),
+            (overviews[0].game_id, overviews[0].inning, overviews[0].home_team_runs, overviews[0].away_team_runs,
+             overviews[0].home_team_name, overviews[0].away_team_name)
+        )
+
+    def test_unicode_numbers(self):
+        """
+        Test numbers sent as strings, which parse as unicode, raise an error.
+
+        """
+        self.content = json.dumps([self.get_game(u'5', 3, 2)])
+        with self.assertRaises(ValueError):
+            self.overview_api.fetch_overviews(['2019_05_24_cinmlb_chnmlb_1'])
+
+    def test_failed_response(self):
+        """
+        Test an error message from the API gives no overviews.
+
+        """
+        self.content = json.dumps({'message': 'Internal server error'})
+        self.assertListEqual([], self.overview_api.fetch_overviews(['2019_05_24_cinmlb_chnmlb_1']))
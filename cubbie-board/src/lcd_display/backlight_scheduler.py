@@ -0,0 +1,339 @@
+"""
+For fading the backlights of any number of LCD displays from one thread.
+
+"""
+
+import logging
+import threading
+from timeit import default_timer
+
+import pigpio
+from decouple import config
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.shared_state import SharedState
+from .backlight_controller import BacklightController
+
+PWM_FREQUENCY = 500
+# Range of the pigpio DMA PWM duty cycle.
+PWM_RANGE = 1000
+# Highest GPIO pigpio can drive DMA PWM on.
+MAX_DMA_PWM_PIN = 31
+# Hardware PWM channel of each GPIO that has one. GPIOs on a channel share its output.
+PWM_CHANNELS = {12: 0, 18: 0, 40: 0, 52: 0, 13: 1, 19: 1, 41: 1, 45: 1, 53: 1}
+# Duration of a full brightness change (seconds).
+FADE_DURATION = config('BACKLIGHT_FADE_DURATION', default=0.5, cast=float)
+# Max PWM writes per second per pin while fading.
+FADE_RATE = config('BACKLIGHT_FADE_RATE', default=50, cast=int)
+# Name of the easing curve fades follow.
+FADE_EASING = config('BACKLIGHT_FADE_EASING', default='ease_in_out')
+
+# Easing curves, mapping fade progress (0 - 1) to brightness progress (0 - 1).
+EASING_FUNCTIONS = {
+    'linear': lambda t: t,
+    'ease_in': lambda t: t * t,
+    'ease_out': lambda t: 1 - (1 - t) * (1 - t),
+    'ease_in_out': lambda t: t * t * (3 - 2 * t)
+}  # type: Dict[str, Callable[[float], float]]
+
+logger = logging.getLogger(__name__)
+
+
+class Fade(object):
+    """
+    A backlight fade in progress.
+
+    Attributes:
+        start_duty_cycle (float): Duty cycle the fade started at
+        duty_cycle (float): Duty cycle the fade ends at
+        start_time (float): When the fade started
+        writes (int): PWM writes made so far
+
+    """
+
+    def __init__(self, start_duty_cycle, duty_cycle, start_time):
+        # type: (float, float, float) -> None
+        """
+        Setup the fade.
+
+        Args:
+            start_duty_cycle (float): Duty cycle to start at
+            duty_cycle (float): Duty cycle to end at
+            start_time (float): When the fade starts
+
+        """
+        self.start_duty_cycle = start_duty_cycle  # type: float
+        self.duty_cycle = duty_cycle  # type: float
+        self.start_time = start_time  # type: float
+        self.writes = 0  # type: int
+
+
+class BacklightScheduler(threading.Thread):
+    """
+    Fades the PWM backlights of all displays over a single pigpio connection.
+
+    Notes:
+        The Pi has only two hardware PWM channels. The first pin registered on each drives its backlight through
+        hardware PWM, and any other pin through pigpio's DMA-timed PWM, so any number of backlights can be driven.
+
+        Target duty cycles are written to a SharedState, one slot per pin. The scheduler blocks on it while no fade is
+        running, so it only wakes up for new duty cycles (or the stop request).
+
+        Changes fade over FADE_DURATION along an easing curve. All running fades are stepped on the same tick, at
+        most FADE_RATE times per second, so displays changed together fade in lockstep. A newer duty cycle for a pin
+        supersedes its fade in flight, and duty cycles written between wake-ups are coalesced to the newest.
+
+    Attributes:
+        _gpio (pigpio.pi): For controlling PWM
+        _shared_state (SharedState): Target duty cycle of each pin, by slot
+        _slots (Dict[int, int]): Pin -> slot in the shared state
+        _hardware_pins (Dict[int, int]): Hardware PWM channel -> pin driven through it
+        _sequence (int): Sequence number of the shared state last read
+        _targets (Dict[int, float]): Target duty cycle of each pin last read
+        _stop_handle (threading.Event): Handle to stop the thread
+        _duty_cycles (Dict[int, float]): Current duty cycle of each pin
+        _fades (Dict[int, Fade]): Fades in progress, by pin
+        _easing (Callable[[float], float]): Easing curve of fades
+        wakeups (int): Number of times the thread has woken up
+        transitions (int): Number of fades started
+        pwm_writes (int): Total PWM writes
+        last_transition_writes (Dict[int, int]): PWM writes made by each pin's last fade
+
+    """
+
+    def __init__(self, gpio):
+        # type: (pigpio.pi) -> None
+        """
+        Setup the scheduler.
+
+        Args:
+            gpio (pigpio.pi): GPIO connection, owned by the scheduler from now on
+
+        """
+        threading.Thread.__init__(self, name='BacklightScheduler')
+        self._gpio = gpio  # type: pigpio.pi
+        # Sized again as each pin is registered.
+        self._shared_state = SharedState(0, 'd')  # type: SharedState
+        self._slots = {}  # type: Dict[int, int]
+        self._hardware_pins = {}  # type: Dict[int, int]
+        self._sequence = 0  # type: int
+        self._targets = {}  # type: Dict[int, float]
+        self._stop_handle = threading.Event()  # type: threading.Event
+        self._duty_cycles = {}  # type: Dict[int, float]
+        self._fades = {}  # type: Dict[int, Fade]
+        self._easing = EASING_FUNCTIONS[FADE_EASING]  # type: Callable[[float], float]
+        self.wakeups = 0  # type: int
+        self.transitions = 0  # type: int
+        self.pwm_writes = 0  # type: int
+        self.last_transition_writes = {}  # type: Dict[int, int]
+
+    def channel(self, pin):
+        # type: (int) -> BacklightController
+        """
+        Get a controller for one backlight, turning it off to start.
+
+        Notes:
+            Must be called before any duty cycle is set. The pin uses hardware PWM if its channel is still free, DMA
+            PWM otherwise.
+
+        Args:
+            pin (int): The PWM pin
+
+        Returns:
+            BacklightController: Controller for the backlight
+
+        Raises:
+            ValueError: If the pin already drives a backlight, or can drive neither hardware nor DMA PWM
+
+        """
+        if pin in self._slots:
+            raise ValueError('GPIO {} already drives a backlight'.format(pin))
+        if pin in PWM_CHANNELS and PWM_CHANNELS[pin] not in self._hardware_pins:
+            self._hardware_pins[PWM_CHANNELS[pin]] = pin
+        elif pin <= MAX_DMA_PWM_PIN:
+            self._gpio.set_PWM_frequency(pin, PWM_FREQUENCY)
+            self._gpio.set_PWM_range(pin, PWM_RANGE)
+        else:
+            raise ValueError('GPIO {} has no PWM'.format(pin))
+        self._slots[pin] = len(self._slots)
+        self._shared_state = SharedState(len(self._slots), 'd')
+        self._targets[pin] = 0
+        self._duty_cycles[pin] = 0
+        self._write_duty_cycle(pin, 0)
+        return BacklightController(self, pin)
+
+    def get_duty_cycle(self, pin):
+        # type: (int) -> float
+        """
+        Get the current duty cycle of a pin.
+
+        Args:
+            pin (int): The PWM pin
+
+        Returns:
+            float: Current duty cycle
+
+        """
+        return self._duty_cycles[pin]
+
+    def set_duty_cycles(self, duty_cycles):
+        # type: (Dict[int, float]) -> None
+        """
+        Fade pins to new duty cycles, together.
+
+        Notes:
+            Thread-safe.
+
+        Args:
+            duty_cycles (Dict[int, float]): Pin -> new duty cycle (0 - 100)
+
+        """
+        self._shared_state.write({
+            self._slots[pin]: min(max(duty_cycle, 0), 100) for pin, duty_cycle in duty_cycles.items()
+        })
+
+    def stop(self):
+        # type: () -> None
+        """
+        Stop the scheduler thread and release the GPIO connection.
+
+        Notes:
+            The newest duty cycles written before stopping are still applied, without fading.
+
+        """
+        self._stop_handle.set()
+        self._shared_state.changed.set()
+        # Join the thread.
+        self.join()
+        self._gpio.stop()
+
+    def _write_duty_cycle(self, pin, duty_cycle):
+        # type: (int, float) -> None
+        """
+        Write a duty cycle to a PWM pin.
+
+        Args:
+            pin (int): The PWM pin
+            duty_cycle (float): Duty cycle to write
+
+        """
+        if pin in self._hardware_pins.values():
+            self._gpio.hardware_PWM(pin, PWM_FREQUENCY, int(round(1e4 * duty_cycle)))
+        else:
+            self._gpio.set_PWM_dutycycle(pin, int(round(duty_cycle * PWM_RANGE / 100)))
+        self.pwm_writes += 1
+
+    def _read_updates(self, timeout=None):
+        # type: (Optional[float]) -> Tuple[Dict[int, float], bool]
+        """
+        Wait for an update, then read the newest duty cycles.
+
+        Args:
+            timeout (Optional[float]): Max time to wait (seconds), None to wait indefinitely
+
+        Returns:
+            Tuple[Dict[int, float], bool]: (newest duty cycle of each changed pin, whether the thread should stop)
+
+        """
+        if not self._shared_state.wait(timeout):
+            return {}, False
+        self.wakeups += 1
+        # Checked before reading, so duty cycles written before stopping are read.
+        stop = self._stop_handle.is_set()
+        if self._shared_state.sequence == self._sequence:
+            return {}, stop
+        self._sequence, targets = self._shared_state.read()
+        duty_cycles = {
+            pin: targets[slot] for pin, slot in self._slots.items() if targets[slot] != self._targets[pin]
+        }
+        self._targets.update(duty_cycles)
+        return duty_cycles, stop
+
+    def _start_fades(self, duty_cycles, now):
+        # type: (Dict[int, float], float) -> None
+        """
+        Start fading pins to new duty cycles, superseding their fades in flight.
+
+        Args:
+            duty_cycles (Dict[int, float]): Pin -> new duty cycle
+            now (float): Current time
+
+        """
+        for pin, duty_cycle in duty_cycles.items():
+            if pin in self._fades:
+                self._log_transition(pin, self._fades.pop(pin), superseded=True)
+            # Nothing to do if already set.
+            if duty_cycle == self._duty_cycles[pin]:
+                continue
+            self.transitions += 1
+            self._fades[pin] = Fade(self._duty_cycles[pin], duty_cycle, now)
+
+    def _step_fades(self, now):
+        # type: (float) -> None
+        """
+        Write the next step of every fade in progress.
+
+        Args:
+            now (float): Current time
+
+        """
+        for pin, fade in list(self._fades.items()):
+            # Progress is by time, so slow PWM writes shorten the fade's steps, not lengthen the fade.
+            progress = min((now - fade.start_time) / FADE_DURATION, 1.0) if FADE_DURATION > 0 else 1.0
+            duty_cycle = fade.start_duty_cycle + (fade.duty_cycle - fade.start_duty_cycle) * self._easing(progress)
+            self._duty_cycles[pin] = duty_cycle
+            self._write_duty_cycle(pin, duty_cycle)
+            fade.writes += 1
+            if progress >= 1:
+                self._log_transition(pin, self._fades.pop(pin), superseded=False)
+
+    def _finish_fades(self):
+        # type: () -> None
+        """
+        Jump every fade in progress to its end.
+
+        """
+        for pin, fade in list(self._fades.items()):
+            self._duty_cycles[pin] = fade.duty_cycle
+            self._write_duty_cycle(pin, fade.duty_cycle)
+            fade.writes += 1
+            self._log_transition(pin, self._fades.pop(pin), superseded=False)
+
+    def _log_transition(self, pin, fade, superseded):
+        # type: (int, Fade, bool) -> None
+        """
+        Record the PWM writes made by a fade.
+
+        Args:
+            pin (int): The PWM pin
+            fade (Fade): The fade, finished or superseded
+            superseded (bool): Whether a newer update cut the fade short
+
+        """
+        self.last_transition_writes[pin] = fade.writes
+        logger.debug(
+            'Backlight on pin %d faded %.1f -> %.1f in %d PWM writes%s',
+            pin, fade.start_duty_cycle, self._duty_cycles[pin], fade.writes, ' (superseded)' if superseded else ''
+        )
+
+    def run(self):
+        # type: () -> None
+        """
+        Wait for duty cycle changes and step fades as needed.
+
+        """
+        interval = 1.0 / FADE_RATE
+        next_tick = 0.0
+        while True:
+            # Block until there is an update, or only until the next step while fading.
+            timeout = max(next_tick - default_timer(), 0) if self._fades else None
+            duty_cycles, stop = self._read_updates(timeout)
+            now = default_timer()
+            self._start_fades(duty_cycles, now)
+            if stop:
+                # Apply the last duty cycles directly, no time to fade.
+                self._finish_fades()
+                return
+            if self._fades and now >= next_tick:
+                self._step_fades(now)
+                next_tick = now + interval
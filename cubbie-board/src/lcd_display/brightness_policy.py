@@ -0,0 +1,379 @@
+"""
+For picking LCD backlight brightness from the time of day, the game shown and ambient light.
+
+"""
+
+import logging
+from datetime import datetime, time
+
+from decouple import config
+from typing import List, Optional, Tuple
+
+from games.game_overview import GameOverview
+
+# Time of day -> duty cycle, each applying until the next ('HH:MM=duty,...').
+SCHEDULE = config('BACKLIGHT_SCHEDULE', default='07:00=100,21:00=70,23:00=40')
+# Night time window, as 'HH:MM-HH:MM'.
+NIGHT = config('BACKLIGHT_NIGHT', default='22:00-07:00')
+# Scale applied to the duty cycle when showing a final at night.
+FINAL_NIGHT_SCALE = config('BACKLIGHT_FINAL_NIGHT_SCALE', default=0.5, cast=float)
+# Light sensor: 'none' or 'iio' (Linux industrial I/O illuminance file).
+LIGHT_SENSOR = config('LIGHT_SENSOR', default='none')
+LIGHT_SENSOR_PATH = config('LIGHT_SENSOR_PATH', default='/sys/bus/iio/devices/iio:device0/in_illuminance_raw')
+# Sensor reading treated as full daylight.
+LIGHT_SENSOR_MAX = config('LIGHT_SENSOR_MAX', default=1000, cast=float)
+# Scale applied to the duty cycle in total darkness, rising to 1 in full daylight.
+AMBIENT_MIN_SCALE = config('BACKLIGHT_AMBIENT_MIN_SCALE', default=0.3, cast=float)
+# Power drawn by one backlight at full brightness (watts).
+MAX_POWER = config('BACKLIGHT_MAX_POWER', default=0.5, cast=float)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_time(text):
+    # type: (str) -> time
+    """
+    Parse a time of day.
+
+    Args:
+        text (str): Time as 'HH:MM'
+
+    Returns:
+        time: The time
+
+    """
+    return datetime.strptime(text.strip(), '%H:%M').time()
+
+
+def parse_schedule(text):
+    # type: (str) -> List[Tuple[time, float]]
+    """
+    Parse a brightness schedule.
+
+    Args:
+        text (str): Schedule as 'HH:MM=duty,...'
+
+    Returns:
+        List[Tuple[time, float]]: (start time, duty cycle) entries, sorted by start time
+
+    Raises:
+        ValueError: If the schedule is empty or malformed
+
+    """
+    entries = []
+    for entry in text.split(','):
+        start, _, duty_cycle = entry.partition('=')
+        entries.append((parse_time(start), min(max(float(duty_cycle), 0), 100)))
+    return sorted(entries)
+
+
+def parse_window(text):
+    # type: (str) -> Tuple[time, time]
+    """
+    Parse a time window, which may wrap past midnight.
+
+    Args:
+        text (str): Window as 'HH:MM-HH:MM'
+
+    Returns:
+        Tuple[time, time]: (start, end) of the window
+
+    """
+    start, _, end = text.partition('-')
+    return parse_time(start), parse_time(end)
+
+
+class LightSensor(object):
+    """
+    Source of ambient light readings.
+
+    """
+
+    def read(self):
+        # type: () -> Optional[float]
+        """
+        Read the ambient light level.
+
+        Returns:
+            Optional[float]: Light level from 0 (dark) to 1 (daylight), None if unavailable
+
+        """
+        raise NotImplementedError
+
+
+class NullLightSensor(LightSensor):
+    """
+    Light sensor for boards without one.
+
+    """
+
+    def read(self):
+        # type: () -> Optional[float]
+        return None
+
+
+class IioLightSensor(LightSensor):
+    """
+    Light sensor read from a Linux industrial I/O illuminance file.
+
+    Attributes:
+        _path (str): Path of the reading
+        _max_value (float): Reading treated as full daylight
+
+    """
+
+    def __init__(self, path, max_value):
+        # type: (str, float) -> None
+        """
+        Setup the sensor.
+
+        Args:
+            path (str): Path of the reading
+            max_value (float): Reading treated as full daylight
+
+        """
+        self._path = path  # type: str
+        self._max_value = max_value  # type: float
+
+    def read(self):
+        # type: () -> Optional[float]
+        try:
+            with open(self._path) as reading:
+                value = float(reading.read())
+        except (IOError, ValueError) as e:
+            logger.warning('Could not read light sensor: %s', e)
+            return None
+        return min(max(value / self._max_value, 0), 1)
+
+
+def create_light_sensor():
+    # type: () -> LightSensor
+    """
+    Create the light sensor from its config.
+
+    Returns:
+        LightSensor: The light sensor
+
+    Raises:
+        ValueError: If LIGHT_SENSOR is unknown
+
+    """
+    if LIGHT_SENSOR == 'none':
+        return NullLightSensor()
+    if LIGHT_SENSOR == 'iio':
+        return IioLightSensor(LIGHT_SENSOR_PATH, LIGHT_SENSOR_MAX)
+    raise ValueError('Unknown light sensor: {}'.format(LIGHT_SENSOR))
+
+
+class BrightnessPolicy(object):
+    """
+    Picks backlight duty cycles.
+
+    Notes:
+        The schedule gives the base duty cycle for the time of day. It is scaled down for finals shown at night, and
+        by the ambient light level when a sensor reading is available.
+
+    Attributes:
+        _schedule (List[Tuple[time, float]]): (start time, duty cycle) entries, sorted by start time
+        _night (Tuple[time, time]): (start, end) of night time
+        _final_night_scale (float): Scale for finals shown at night
+        _light_sensor (LightSensor): Source of ambient light readings
+        _ambient_min_scale (float): Scale in total darkness
+
+    """
+
+    def __init__(self, schedule, night, final_night_scale, light_sensor, ambient_min_scale):
+        # type: (List[Tuple[time, float]], Tuple[time, time], float, LightSensor, float) -> None
+        """
+        Setup the policy.
+
+        Args:
+            schedule (List[Tuple[time, float]]): (start time, duty cycle) entries, sorted by start time
+            night (Tuple[time, time]): (start, end) of night time
+            final_night_scale (float): Scale for finals shown at night
+            light_sensor (LightSensor): Source of ambient light readings
+            ambient_min_scale (float): Scale in total darkness
+
+        """
+        self._schedule = schedule  # type: List[Tuple[time, float]]
+        self._night = night  # type: Tuple[time, time]
+        self._final_night_scale = final_night_scale  # type: float
+        self._light_sensor = light_sensor  # type: LightSensor
+        self._ambient_min_scale = ambient_min_scale  # type: float
+
+    def _get_scheduled_duty_cycle(self, now):
+        # type: (time) -> float
+        """
+        Get the scheduled duty cycle for a time of day.
+
+        Args:
+            now (time): Time of day
+
+        Returns:
+            float: Duty cycle of the latest entry started, wrapping to the day before
+
+        """
+        duty_cycle = self._schedule[-1][1]
+        for start, entry_duty_cycle in self._schedule:
+            if start > now:
+                break
+            duty_cycle = entry_duty_cycle
+        return duty_cycle
+
+    def is_night(self, now):
+        # type: (time) -> bool
+        """
+        Check if a time of day is night time.
+
+        Args:
+            now (time): Time of day
+
+        Returns:
+            bool: Whether it's night
+
+        """
+        start, end = self._night
+        if start <= end:
+            return start <= now < end
+        return now >= start or now < end
+
+    def get_duty_cycle(self, now, game_overview=None):
+        # type: (datetime, Optional[GameOverview]) -> float
+        """
+        Get the duty cycle to show a game with.
+
+        Args:
+            now (datetime): Current time
+            game_overview (Optional[GameOverview]): Game shown, if any
+
+        Returns:
+            float: Duty cycle (0 - 100)
+
+        """
+        duty_cycle = self._get_scheduled_duty_cycle(now.time())
+        # Dim finals late at night.
+        if game_overview is not None and game_overview.is_final() and self.is_night(now.time()):
+            duty_cycle *= self._final_night_scale
+        # Dim in the dark.
+        light_level = self._light_sensor.read()
+        if light_level is not None:
+            duty_cycle *= self._ambient_min_scale + (1 - self._ambient_min_scale) * light_level
+        return duty_cycle
+
+
+def create_brightness_policy():
+    # type: () -> BrightnessPolicy
+    """
+    Create the brightness policy from its config.
+
+    Returns:
+        BrightnessPolicy: The brightness policy
+
+    """
+    return BrightnessPolicy(
+        parse_schedule(SCHEDULE),
+        parse_window(NIGHT),
+        FINAL_NIGHT_SCALE,
+        create_light_sensor(),
+        AMBIENT_MIN_SCALE
+    )
+
+
+class EnergyMeter(object):
+    """
+    Tracks the average backlight duty cycle and estimates the energy used.
+
+    Attributes:
+        _max_power (float): Power of all backlights at full brightness (watts)
+        _duty_cycle (float): Current duty cycle
+        _start_time (Optional[float]): When metering started (seconds since epoch)
+        _last_time (Optional[float]): When the duty cycle last changed (seconds since epoch)
+        _duty_seconds (float): Integral of the duty cycle over time
+
+    """
+
+    def __init__(self, max_power):
+        # type: (float) -> None
+        """
+        Setup the meter.
+
+        Args:
+            max_power (float): Power of all backlights at full brightness (watts)
+
+        """
+        self._max_power = max_power  # type: float
+        self._duty_cycle = 0.0  # type: float
+        self._start_time = None  # type: Optional[float]
+        self._last_time = None  # type: Optional[float]
+        self._duty_seconds = 0.0  # type: float
+
+    @property
+    def duty_cycle(self):
+        # type: () -> float
+        """
+        Get the current duty cycle.
+
+        Returns:
+            float: Current duty cycle
+
+        """
+        return self._duty_cycle
+
+    def update(self, duty_cycle, now):
+        # type: (float, float) -> None
+        """
+        Record a new duty cycle.
+
+        Args:
+            duty_cycle (float): New duty cycle
+            now (float): Current time (seconds since epoch)
+
+        """
+        self._advance(now)
+        self._duty_cycle = duty_cycle
+
+    def _advance(self, now):
+        # type: (float) -> None
+        """
+        Account for the time spent at the current duty cycle.
+
+        Args:
+            now (float): Current time (seconds since epoch)
+
+        """
+        if self._start_time is None:
+            self._start_time = now
+        else:
+            self._duty_seconds += self._duty_cycle * (now - self._last_time)
+        self._last_time = now
+
+    def get_average_duty_cycle(self, now):
+        # type: (float) -> float
+        """
+        Get the time-weighted average duty cycle so far.
+
+        Args:
+            now (float): Current time (seconds since epoch)
+
+        Returns:
+            float: Average duty cycle (0 - 100)
+
+        """
+        self._advance(now)
+        elapsed = now - self._start_time
+        return self._duty_seconds / elapsed if elapsed > 0 else self._duty_cycle
+
+    def get_energy(self, now):
+        # type: (float) -> float
+        """
+        Estimate the energy used so far.
+
+        Args:
+            now (float): Current time (seconds since epoch)
+
+        Returns:
+            float: Energy (watt hours)
+
+        """
+        self._advance(now)
+        return self._duty_seconds / 100 * self._max_power / 3600
@@ -0,0 +1,32 @@
+"""
+For holding the interface LCD displays send frames through.
+
+"""
+
+from .frame_buffer import FrameBuffer
+
+
+class DisplayBackend(object):
+    """
+    Interface to the device an LCD display's frames are sent to.
+
+    """
+
+    def begin(self):
+        # type: () -> None
+        """
+        Initialize the device.
+
+        """
+        raise NotImplementedError
+
+    def write_frame(self, frame_buffer):
+        # type: (FrameBuffer) -> None
+        """
+        Send a full frame to the device.
+
+        Args:
+            frame_buffer (FrameBuffer): Encoded frame to send, chunk by chunk
+
+        """
+        raise NotImplementedError
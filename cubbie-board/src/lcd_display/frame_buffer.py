@@ -0,0 +1,79 @@
+"""
+For holding the preallocated RGB565 frame sent to an LCD display.
+
+"""
+
+import ctypes
+from array import array
+
+from PIL import Image
+from typing import List
+
+
+class FrameBuffer(object):
+    """
+    Preallocated RGB565 frame buffer, split into chunks for SPI transfer.
+
+    Notes:
+        The chunks are memoryviews sharing the buffer's memory, so sending a frame allocates nothing. Encoding
+        allocates only Pillow's RGB565 image and its bytes; the byte swap for the panel is done in place.
+
+    Attributes:
+        width (int): Frame width (pixels)
+        height (int): Frame height (pixels)
+        chunk_size (int): Max bytes per chunk
+        frame (bytearray): Big-endian RGB565 pixel data
+        chunks (List[memoryview]): Views over consecutive chunks of the frame
+        _pixels (array): RGB565 pixels being byte-swapped
+        _pixels_address (int): Address of the pixels' memory
+        _frame_memory (ctypes.Array): The frame's memory, as a ctypes array sharing it
+
+    """
+
+    def __init__(self, width, height, chunk_size):
+        # type: (int, int, int) -> None
+        """
+        Allocate the frame buffer.
+
+        Args:
+            width (int): Frame width (pixels)
+            height (int): Frame height (pixels)
+            chunk_size (int): Max bytes per chunk
+
+        """
+        if chunk_size <= 0:
+            raise ValueError('Chunk size must be positive')
+        self.width = width  # type: int
+        self.height = height  # type: int
+        self.chunk_size = chunk_size  # type: int
+        self.frame = bytearray(width * height * 2)  # type: bytearray
+        frame_view = memoryview(self.frame)
+        self.chunks = [
+            frame_view[start:start + chunk_size] for start in range(0, len(self.frame), chunk_size)
+        ]  # type: List[memoryview]
+        self._pixels = array('H', [0]) * (width * height)  # type: array
+        self._pixels_address = self._pixels.buffer_info()[0]  # type: int
+        self._frame_memory = (ctypes.c_char * len(self.frame)).from_buffer(self.frame)  # type: ctypes.Array
+
+    def encode(self, image):
+        # type: (Image) -> None
+        """
+        Encode an image into the frame buffer.
+
+        Notes:
+            Images not matching the frame size are scaled to fit.
+
+        Args:
+            image (Image): The image to encode
+
+        """
+        # Scale to the frame if needed.
+        if image.size != (self.width, self.height):
+            image = image.resize((self.width, self.height))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        # Pack to RGB565 in C (little-endian), swap to big-endian for the panel, then copy into the frame.
+        packed = image.convert('BGR;16').tobytes()
+        ctypes.memmove(self._pixels_address, packed, len(self.frame))
+        self._pixels.byteswap()
+        ctypes.memmove(self._frame_memory, self._pixels_address, len(self.frame))
@@ -3,16 +3,28 @@ Module for managing the home and away LCD displays.
 
 """
 
+import logging
 import os
 import os.path
+import time
+from datetime import datetime
 
 import pigpio
 from PIL import Image
 from decouple import config
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from games.game_overview import GameOverview
+from utils import instrumentation
+from . import brightness_policy
+from .backlight_scheduler import BacklightScheduler
+from .brightness_policy import BrightnessPolicy, EnergyMeter, create_brightness_policy
+from .display_backend import DisplayBackend
 from .lcd_display import LCDDisplay
+from .logo_atlas import LogoAtlas, VARIANT_SEPARATOR, variant_name
+from .virtual_backend import VirtualBackend, VirtualGpio
+
+logger = logging.getLogger(__name__)
 
 
 class LcdController:
@@ -20,9 +32,14 @@ class LcdController:
     LCD display controller.
 
     Attributes:
+        backlight_scheduler (BacklightScheduler): Fades the backlights of all displays
         home_display (LCDDisplay): Home LCD display
         away_display (LCDDisplay): Away LCD display
-        logos (Dict[str, Image]): Team name -> team logo for all logos
+        displays (List[LCDDisplay]): All LCD displays
+        brightness_policy (BrightnessPolicy): Picks the backlight duty cycle
+        energy_meter (EnergyMeter): Tracks backlight duty cycle and energy
+        logos (Union[LogoAtlas, Dict[str, Image]]): Team name -> team logo for all logos
+        text_warm_up_time (float): Time taken to pre-render text overlays at startup (seconds)
 
     """
 
@@ -32,51 +49,115 @@ class LcdController:
         Initialize LCD displays.
 
         """
+        is_virtual = config('LCD_BACKEND', default='st7735') == 'virtual'
+        # One GPIO connection and thread drives every backlight.
+        self.backlight_scheduler = BacklightScheduler(
+            VirtualGpio() if is_virtual else pigpio.pi()
+        )  # type: BacklightScheduler
         # Configure the home and away LCD displays.
-        self.home_display = LCDDisplay(
-            config('HOME_LCD_RESET_PIN', cast=int),
-            config('HOME_LCD_SPI_DEVICE', cast=int),
-            config('LCD_SPI_PORT', cast=int),
-            config('HOME_LCD_PWM_PIN', cast=int),
-            config('LCD_DC_PIN', cast=int),
-            config('LCD_SPI_CLOCK_SPEED', cast=int),
-            pigpio.pi(),
-            config('LCD_WIDTH', cast=int),
-            config('LCD_HEIGHT', cast=int)
-        )  # type: LCDDisplay
-        self.away_display = LCDDisplay(
-            config('AWAY_LCD_RESET_PIN', cast=int),
-            config('AWAY_LCD_SPI_DEVICE', cast=int),
-            config('LCD_SPI_PORT', cast=int),
-            config('AWAY_LCD_PWM_PIN', cast=int),
-            config('LCD_DC_PIN', cast=int),
-            config('LCD_SPI_CLOCK_SPEED', cast=int),
-            pigpio.pi(),
+        self.home_display = self._create_display('HOME', is_virtual)  # type: LCDDisplay
+        self.away_display = self._create_display('AWAY', is_virtual)  # type: LCDDisplay
+        self.displays = [self.home_display, self.away_display]  # type: List[LCDDisplay]
+        self.brightness_policy = create_brightness_policy()  # type: BrightnessPolicy
+        self.energy_meter = EnergyMeter(brightness_policy.MAX_POWER * len(self.displays))  # type: EnergyMeter
+        self.energy_meter.update(0, time.time())
+        # Start backlight thread.
+        self.backlight_scheduler.start()
+        # Format paths where logos are stored.
+        root_path = os.path.dirname(os.path.dirname(__file__))
+        logo_path = os.path.abspath(os.path.join(root_path, config('LOGO_DIR')))
+        atlas_path = os.path.abspath(os.path.join(root_path, config('LOGO_ATLAS', default='../img/logos.atlas')))
+        # Load all logos into logos attribute.
+        self.logos = self._get_logos(
+            logo_path,
+            atlas_path,
             config('LCD_WIDTH', cast=int),
             config('LCD_HEIGHT', cast=int)
-        )  # type: LCDDisplay
-        # Format path where logos are stored.
-        logo_path = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), config('LOGO_DIR')))
-        # Load all logos into logos attribute.
-        self.logos = self._get_images(logo_path)  # type: Dict[str, Image]
+        )  # type: Union[LogoAtlas, Dict[str, Image]]
+        # Pre-render all status and winner text, timing it.
+        teams = self._get_team_names(self.logos)
+        self.text_warm_up_time = self.home_display.warm_up_text(teams) + self.away_display.warm_up_text(teams)
+
+    def _create_display(self, side, is_virtual):
+        # type: (str, bool) -> LCDDisplay
+        """
+        Create a display from its config.
+
+        Notes:
+            LCD_BACKEND selects the 'st7735' hardware (default) or a headless 'virtual' display.
+
+        Args:
+            side (str): Config prefix of the display ('HOME' or 'AWAY')
+            is_virtual (bool): Whether to create a headless display
+
+        Returns:
+            LCDDisplay: The display
 
-    def turn_on_displays(self):
-        # type: () -> None
         """
-        Turn both displays' backlights on.
+        width = config('LCD_WIDTH', cast=int)
+        height = config('LCD_HEIGHT', cast=int)
+        if is_virtual:
+            backend = VirtualBackend(width, height)  # type: DisplayBackend
+        else:
+            # Imported here so headless boards need no display hardware libraries.
+            from .st7735_backend import ST7735Backend
+            backend = ST7735Backend(
+                config(side + '_LCD_RESET_PIN', cast=int),
+                config(side + '_LCD_SPI_DEVICE', cast=int),
+                config('LCD_SPI_PORT', cast=int),
+                config('LCD_DC_PIN', cast=int),
+                config('LCD_SPI_CLOCK_SPEED', cast=int),
+                width,
+                height
+            )
+        return LCDDisplay(
+            backend,
+            self.backlight_scheduler.channel(config(side + '_LCD_PWM_PIN', cast=int)),
+            width,
+            height,
+            config('LCD_SPI_CHUNK_SIZE', default=4096, cast=int)
+        )
+
+    def _set_displays_duty_cycle(self, duty_cycle):
+        # type: (float) -> None
+        """
+        Fade all displays' backlights to a duty cycle, together.
+
+        Notes:
+            Logs the average duty cycle and energy used when the duty cycle changes.
+
+        Args:
+            duty_cycle (float): New duty cycle
+
+        """
+        now = time.time()
+        changed = duty_cycle != self.energy_meter.duty_cycle
+        self.energy_meter.update(duty_cycle, now)
+        self.backlight_scheduler.set_duty_cycles({display.backlight.pin: duty_cycle for display in self.displays})
+        if changed:
+            logger.info(
+                'Backlight duty cycle %.1f%% (average %.1f%%, %.3f Wh used)',
+                duty_cycle, self.energy_meter.get_average_duty_cycle(now), self.energy_meter.get_energy(now)
+            )
+
+    def turn_on_displays(self, game_overview=None):
+        # type: (Optional[GameOverview]) -> None
+        """
+        Turn all displays' backlights on, at the brightness the policy picks.
+
+        Args:
+            game_overview (Optional[GameOverview]): Game shown, if any
 
         """
-        self.home_display.backlight.turn_on()
-        self.away_display.backlight.turn_on()
+        self._set_displays_duty_cycle(self.brightness_policy.get_duty_cycle(datetime.now(), game_overview))
 
     def turn_off_displays(self):
         # type: () -> None
         """
-        Turn both displays' backlights off.
+        Turn all displays' backlights off.
 
         """
-        self.home_display.backlight.turn_off()
-        self.away_display.backlight.turn_off()
+        self._set_displays_duty_cycle(0)
 
     def exit(self):
         # type: () -> None
@@ -86,9 +167,8 @@ class LcdController:
         """
         # Turn off displays.
         self.turn_off_displays()
-        # Exit the displays.
-        self.home_display.exit()
-        self.away_display.exit()
+        # Stop backlight thread.
+        self.backlight_scheduler.stop()
 
     @staticmethod
     def _get_images(path):
@@ -108,20 +188,74 @@ class LcdController:
             for item in os.listdir(path) if item.endswith('.jpg')
         }
 
-    def _display_images(self, home_image, away_image):
-        # type: (Image, Image) -> None
+    @staticmethod
+    def _get_logos(logo_path, atlas_path, width, height):
+        # type: (str, str, int, int) -> Union[LogoAtlas, Dict[str, Image]]
+        """
+        Get all team logos.
+
+        Notes:
+            Maps the prebuilt logo atlas if it exists, matches the panel size and holds every jpg logo, else falls
+            back to the jpg logos. An atlas built before a logo was added or renamed is stale, and would be missing it.
+
+        Args:
+            logo_path (str): Directory of jpg logos
+            atlas_path (str): Path of the logo atlas
+            width (int): Panel width (pixels)
+            height (int): Panel height (pixels)
+
+        Returns:
+            Union[LogoAtlas, Dict[str, Image]]: Team name -> team logo
+
+        """
+        if os.path.exists(atlas_path):
+            atlas = LogoAtlas(atlas_path)
+            missing = [
+                item.split('.jpg')[0] for item in os.listdir(logo_path)
+                if item.endswith('.jpg') and item.split('.jpg')[0] not in atlas
+            ]
+            if (atlas.width, atlas.height) == (width, height) and not missing:
+                return atlas
+            logger.warning(
+                'Logo atlas %s is stale (%dx%d for a %dx%d panel, missing logos: %s), loading jpg logos',
+                atlas_path, atlas.width, atlas.height, width, height, ', '.join(missing) or 'none'
+            )
+            atlas.close()
+        return LcdController._get_images(logo_path)
+
+    @staticmethod
+    def _get_team_names(logos):
+        # type: (Union[LogoAtlas, Dict[str, Image]]) -> List[str]
+        """
+        Get the names of all teams with a logo.
+
+        Args:
+            logos (Union[LogoAtlas, Dict[str, Image]]): Team name -> team logo
+
+        Returns:
+            List[str]: Team names
+
+        """
+        return [
+            name for name in (logos.names if isinstance(logos, LogoAtlas) else logos)
+            if name != 'cubs_w_flag' and VARIANT_SEPARATOR not in name
+        ]
+
+    def _display_images(self, home_image, away_image, game_overview):
+        # type: (Image, Image, GameOverview) -> None
         """
         Display images on the home and away displays.
 
         Args:
             home_image (Image): Image to show on home display
             away_image (Image): Image to show on away display
+            game_overview (GameOverview): Game shown
 
         """
         self.home_display.display_image(home_image)
         self.away_display.display_image(away_image)
         # Ensure backlights are on.
-        self.turn_on_displays()
+        self.turn_on_displays(game_overview)
 
     def _add_winner_text(self, home_logo, away_logo, game_overview):
         # type: (Image, Image, GameOverview) -> Tuple[Image, Image]
@@ -142,10 +276,11 @@ class LcdController:
             return self.home_display.add_winner_text(game_overview.home_team_name, home_logo), away_logo
         return home_logo, self.away_display.add_winner_text(game_overview.away_team_name, away_logo)
 
-    def _get_team_logos(self, game_overview):
-        # type: (GameOverview) -> Tuple[Image, Image]
+    @staticmethod
+    def _get_team_logo_names(game_overview):
+        # type: (GameOverview) -> Tuple[str, str]
         """
-        Get the team logos.
+        Get the names of the team logos.
 
         Notes:
             Gets Cubs 'W' logo when they win.
@@ -154,19 +289,38 @@ class LcdController:
             game_overview (GameOverview): Overview of game
 
         Returns:
-            Tuple[Image, Image]: (home, away) logos
+            Tuple[str, str]: (home, away) logo names
 
         """
-        # Get the logos.
-        home_logo = self.logos[game_overview.home_team_name]
-        away_logo = self.logos[game_overview.away_team_name]
         # Get Cubs 'W' logo if they won.
         if game_overview.is_final() and game_overview.is_playing('Cubs'):
             if game_overview.home_team_name == 'Cubs':
-                return self.logos['cubs_w_flag'].copy(), away_logo.copy()
-            return home_logo.copy(), self.logos['cubs_w_flag'].copy()
-        # Else, just return copies of the team logos.
-        return home_logo.copy(), away_logo.copy()
+                return 'cubs_w_flag', game_overview.away_team_name
+            return game_overview.home_team_name, 'cubs_w_flag'
+        # Else, just the team logos.
+        return game_overview.home_team_name, game_overview.away_team_name
+
+    def _get_status_logo(self, name, status, display):
+        # type: (str, str, LCDDisplay) -> Image
+        """
+        Get a copy of a logo with the status header added.
+
+        Notes:
+            Uses the logo's pre-rendered status variant if one was built.
+
+        Args:
+            name (str): Name of the logo
+            status (str): Game status
+            display (LCDDisplay): Display the logo will be shown on
+
+        Returns:
+            Image: Logo with status header
+
+        """
+        variant = variant_name(name, status)
+        if variant in self.logos:
+            return self.logos[variant].copy()
+        return display.add_status_header(status, self.logos[name].copy())
 
     def display_team_logos(self, game_overview):
         # type: (GameOverview) -> None
@@ -177,13 +331,13 @@ class LcdController:
             game_overview (GameOverview): Overview of game
 
         """
-        # Get the team logos.
-        home_logo, away_logo = self._get_team_logos(game_overview)
-        # Add status headers.
-        home_logo = self.home_display.add_status_header(game_overview.status, home_logo)
-        away_logo = self.away_display.add_status_header(game_overview.status, away_logo)
-        # If final, annotate with winner message.
-        if game_overview.is_final():
-            home_logo, away_logo = self._add_winner_text(home_logo, away_logo, game_overview)
+        with instrumentation.span('lcd.compose'):
+            # Get the team logos, with status headers.
+            home_name, away_name = self._get_team_logo_names(game_overview)
+            home_logo = self._get_status_logo(home_name, game_overview.status, self.home_display)
+            away_logo = self._get_status_logo(away_name, game_overview.status, self.away_display)
+            # If final, annotate with winner message.
+            if game_overview.is_final():
+                home_logo, away_logo = self._add_winner_text(home_logo, away_logo, game_overview)
         # Display the logos.
-        self._display_images(home_logo, away_logo)
+        self._display_images(home_logo, away_logo, game_overview)
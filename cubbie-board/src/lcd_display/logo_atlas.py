@@ -0,0 +1,216 @@
+"""
+For building and loading the packed logo atlas.
+
+Notes:
+    The atlas is a single file holding every logo already scaled to the panel size as raw RGBX pixels, so loading
+    it is a memory map and no JPEG decoding happens at runtime.
+
+    Layout (little-endian):
+        header: magic (4s), version (H), width (H), height (H), logo count (H), index length (I)
+        index: JSON object of logo name -> frame number
+        frames: width * height * 4 bytes each, directly after the index
+
+"""
+
+import json
+import mmap
+import os
+import os.path
+import struct
+
+from PIL import Image
+from typing import ClassVar, Dict, List
+
+# Separates the team and status in status variant names.
+VARIANT_SEPARATOR = '@'
+
+
+class LogoAtlas(object):
+    """
+    Memory-mapped logo atlas.
+
+    Attributes:
+        width (int): Logo width (pixels)
+        height (int): Logo height (pixels)
+        _file (file): The open atlas file
+        _map (mmap.mmap): Read-only map of the atlas file
+        _logos (Dict[str, Image]): Logo name -> image backed by the map
+
+    """
+
+    MAGIC = b'CBLA'  # type: ClassVar[bytes]
+    VERSION = 1  # type: ClassVar[int]
+    HEADER = struct.Struct('<4sHHHHI')  # type: ClassVar[struct.Struct]
+    # Pillow can only map RGBX (not RGB) buffers without copying.
+    PIXEL_MODE = 'RGBX'  # type: ClassVar[str]
+    PIXEL_SIZE = 4  # type: ClassVar[int]
+
+    def __init__(self, path):
+        # type: (str) -> None
+        """
+        Map an atlas file.
+
+        Args:
+            path (str): Path of the atlas
+
+        Raises:
+            ValueError: If the file is not an atlas of a supported version
+
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)  # type: mmap.mmap
+        magic, version, self.width, self.height, count, index_length = LogoAtlas.HEADER.unpack_from(self._map)
+        if magic != LogoAtlas.MAGIC or version != LogoAtlas.VERSION:
+            self.close()
+            raise ValueError('{} is not a version {} logo atlas'.format(path, LogoAtlas.VERSION))
+        index_start = LogoAtlas.HEADER.size
+        frames_start = index_start + index_length
+        index = json.loads(self._map[index_start:frames_start].decode('utf-8'))  # type: Dict[str, int]
+        frame_size = self.width * self.height * LogoAtlas.PIXEL_SIZE
+        # Wrap each frame in an image sharing the map's memory.
+        self._logos = {
+            name: Image.frombuffer(
+                LogoAtlas.PIXEL_MODE,
+                (self.width, self.height),
+                buffer(self._map, frames_start + frame_number * frame_size, frame_size),
+                'raw',
+                LogoAtlas.PIXEL_MODE,
+                0,
+                1
+            ) for name, frame_number in index.items()
+        }  # type: Dict[str, Image]
+
+    def __getitem__(self, name):
+        # type: (str) -> Image
+        """
+        Get a logo.
+
+        Notes:
+            The image is read-only; copy it before drawing on it.
+
+        Args:
+            name (str): Name of the logo
+
+        Returns:
+            Image: The logo
+
+        """
+        return self._logos[name]
+
+    def __contains__(self, name):
+        # type: (str) -> bool
+        return name in self._logos
+
+    @property
+    def names(self):
+        # type: () -> List[str]
+        """
+        Get the names of all logos in the atlas.
+
+        Returns:
+            List[str]: Logo names
+
+        """
+        return sorted(self._logos)
+
+    def close(self):
+        # type: () -> None
+        """
+        Unmap and close the atlas file.
+
+        """
+        self._logos = {}
+        self._map.close()
+        self._file.close()
+
+
+def variant_name(team, status):
+    # type: (str, str) -> str
+    """
+    Get the logo name of a team's pre-rendered status variant.
+
+    Args:
+        team (str): Team logo name
+        status (str): Game status
+
+    Returns:
+        str: Name of the variant, e.g. 'Cubs@Final'
+
+    """
+    return team + VARIANT_SEPARATOR + status
+
+
+def fit_logo(image, width, height):
+    # type: (Image, int, int) -> Image
+    """
+    Pad a logo to the panel's aspect ratio with white and scale it to the panel size.
+
+    Args:
+        image (Image): Logo to fit
+        width (int): Panel width (pixels)
+        height (int): Panel height (pixels)
+
+    Returns:
+        Image: Fitted RGB logo
+
+    """
+    image = image.convert('RGB')
+    image_w, image_h = image.size
+    # Smallest canvas with the panel's aspect ratio that holds the logo.
+    scale = max(float(image_w) / width, float(image_h) / height)
+    canvas_w, canvas_h = int(round(width * scale)), int(round(height * scale))
+    background = Image.new('RGB', (canvas_w, canvas_h), (255, 255, 255))
+    background.paste(image, ((canvas_w - image_w) // 2, (canvas_h - image_h) // 2))
+    return background.resize((width, height), Image.LANCZOS)
+
+
+def build_atlas(logos, atlas_path, width, height):
+    # type: (Dict[str, Image], str, int, int) -> None
+    """
+    Write an atlas of logos.
+
+    Args:
+        logos (Dict[str, Image]): Logo name -> logo image
+        atlas_path (str): Path of the atlas to write
+        width (int): Panel width (pixels)
+        height (int): Panel height (pixels)
+
+    """
+    names = sorted(logos)
+    index = json.dumps({name: i for i, name in enumerate(names)}, sort_keys=True).encode('utf-8')
+    # Write to a temporary file first so a running board never maps a partial atlas.
+    temp_path = atlas_path + '.tmp'
+    with open(temp_path, 'wb') as atlas_file:
+        atlas_file.write(
+            LogoAtlas.HEADER.pack(LogoAtlas.MAGIC, LogoAtlas.VERSION, width, height, len(names), len(index))
+        )
+        atlas_file.write(index)
+        for name in names:
+            logo = logos[name]
+            if logo.size != (width, height):
+                logo = fit_logo(logo, width, height)
+            atlas_file.write(logo.convert(LogoAtlas.PIXEL_MODE).tobytes())
+    os.rename(temp_path, atlas_path)
+
+
+def build_atlas_from_dir(logo_dir, atlas_path, width, height):
+    # type: (str, str, int, int) -> List[str]
+    """
+    Write an atlas of every jpg or png logo in a directory.
+
+    Args:
+        logo_dir (str): Directory of logos
+        atlas_path (str): Path of the atlas to write
+        width (int): Panel width (pixels)
+        height (int): Panel height (pixels)
+
+    Returns:
+        List[str]: Names of the logos written
+
+    """
+    logos = {
+        os.path.splitext(item)[0]: Image.open(os.path.join(logo_dir, item))
+        for item in os.listdir(logo_dir) if item.endswith(('.jpg', '.png'))
+    }
+    build_atlas(logos, atlas_path, width, height)
+    return sorted(logos)
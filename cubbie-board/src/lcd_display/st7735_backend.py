@@ -0,0 +1,79 @@
+"""
+For sending frames to an ST7735 LCD over SPI.
+
+"""
+
+import Adafruit_GPIO.SPI as SPI
+import ST7735 as TFT
+import spidev
+
+from .display_backend import DisplayBackend
+from .frame_buffer import FrameBuffer
+
+
+# Default RST pins 25 and 23
+# Default SPI devices 0 and 1
+
+class ST7735Backend(TFT.ST7735, DisplayBackend):
+    """
+    ST7735 display hardware.
+
+    Notes:
+        Inherits from display controller class, fundamental representation of display.
+
+    Attributes:
+        _spi_device (spidev.SpiDev): Raw SPI device
+        _width (int): Display width
+        _height (int): Display height
+
+    """
+
+    def __init__(self, reset_pin, spi_device, spi_port, dc_pin, clock_speed, width, height):
+        # type: (int, int, int, int, int, int, int) -> None
+        """
+        Setup display hardware.
+
+        Args:
+            reset_pin (int): Reset pin for display
+            spi_device (int): SPI Device index
+            spi_port (int): SPI port number
+            dc_pin (int): Data/Command pin
+            clock_speed (int): SPI clock speed
+            width (int): Width of display (pixels)
+            height (int): Height of display (pixels)
+
+        """
+        spi = SPI.SpiDev(
+            spi_port,
+            spi_device,
+            max_speed_hz=clock_speed
+        )
+        # Construct super.
+        TFT.ST7735.__init__(
+            self,
+            dc_pin,
+            rst=reset_pin,
+            spi=spi
+        )
+        # Raw spidev handle, written to directly to skip the list conversions in the generic SPI wrapper.
+        self._spi_device = spi._device  # type: spidev.SpiDev
+        self._width = width  # type: int
+        self._height = height  # type: int
+
+    def write_frame(self, frame_buffer):
+        # type: (FrameBuffer) -> None
+        """
+        Send a frame to the display RAM.
+
+        Notes:
+            Sends the frame's preallocated chunk views as-is, so nothing is allocated per frame.
+
+        Args:
+            frame_buffer (FrameBuffer): Encoded frame to send
+
+        """
+        self.set_window(0, 0, self._width - 1, self._height - 1)
+        # Switch to data mode.
+        self._gpio.output(self._dc, True)
+        for chunk in frame_buffer.chunks:
+            self._spi_device.writebytes2(chunk)
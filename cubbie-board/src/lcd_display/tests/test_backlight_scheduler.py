@@ -0,0 +1,136 @@
+import time
+from unittest import TestCase
+
+from lcd_display import backlight_scheduler
+from lcd_display.backlight_scheduler import BacklightScheduler
+from lcd_display.virtual_backend import VirtualGpio
+
+
+class TestBacklightScheduler(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Start a scheduler driving two backlights on a virtual GPIO.
+
+        """
+        self.gpio = VirtualGpio()
+        self.scheduler = BacklightScheduler(self.gpio)
+        self.home = self.scheduler.channel(12)
+        self.away = self.scheduler.channel(13)
+        self.scheduler.start()
+
+    def tearDown(self):
+        # type: () -> None
+        if self.scheduler.is_alive():
+            self.scheduler.stop()
+
+    def _wait_for_fade(self):
+        time.sleep(backlight_scheduler.FADE_DURATION + 0.2)
+
+    def test_idle(self):
+        """
+        Test the scheduler does not wake up while idle.
+
+        """
+        time.sleep(0.3)
+        self.assertEqual(0, self.scheduler.wakeups)
+        self.scheduler.stop()
+        self.assertEqual(1, self.scheduler.wakeups)
+
+    def test_turn_on(self):
+        """
+        Test turning on fades to full brightness at a bounded rate.
+
+        """
+        self.home.turn_on()
+        self._wait_for_fade()
+        duty_cycles = [duty for _, duty in self.gpio.get_duty_cycles(12)]
+        self.assertEqual(1000000, duty_cycles[-1])
+        self.assertEqual(100, self.home.duty_cycle)
+        # Fade increases monotonically.
+        self.assertListEqual(sorted(duty_cycles), duty_cycles)
+        # Initial write, then at most one write per fade step.
+        max_writes = backlight_scheduler.FADE_DURATION * backlight_scheduler.FADE_RATE + 2
+        self.assertTrue(self.scheduler.last_transition_writes[12] <= max_writes)
+        self.assertEqual(len(duty_cycles) - 1, self.scheduler.last_transition_writes[12])
+        # Other backlight untouched.
+        self.assertEqual(1, len(self.gpio.get_duty_cycles(13)))
+
+    def test_lockstep(self):
+        """
+        Test backlights changed together fade in lockstep.
+
+        """
+        self.scheduler.set_duty_cycles({12: 100, 13: 100})
+        self._wait_for_fade()
+        self.assertEqual(1, self.scheduler.wakeups)
+        self.assertListEqual(
+            [duty for _, duty in self.gpio.get_duty_cycles(12)],
+            [duty for _, duty in self.gpio.get_duty_cycles(13)]
+        )
+
+    def test_supersede(self):
+        """
+        Test a newer duty cycle supersedes a fade in flight.
+
+        """
+        self.home.turn_on()
+        time.sleep(backlight_scheduler.FADE_DURATION / 4)
+        self.home.turn_off()
+        self._wait_for_fade()
+        duty_cycles = [duty for _, duty in self.gpio.get_duty_cycles(12)]
+        # Never reached full brightness.
+        self.assertTrue(max(duty_cycles) < 1000000)
+        self.assertEqual(0, duty_cycles[-1])
+        self.assertEqual(2, self.scheduler.transitions)
+
+    def test_coalesce(self):
+        """
+        Test queued duty cycles are coalesced to the newest.
+
+        """
+        self.scheduler.stop()
+        self.scheduler = BacklightScheduler(self.gpio)
+        home = self.scheduler.channel(12)
+        for duty_cycle in (100, 10, 50):
+            home._set_duty_cycle(duty_cycle)
+        self.scheduler.start()
+        self._wait_for_fade()
+        self.assertEqual(1, self.scheduler.transitions)
+        self.assertEqual(500000, self.gpio.get_duty_cycles(12)[-1][1])
+
+    def test_dma_pwm(self):
+        """
+        Test backlights beyond the two hardware PWM channels are driven through DMA PWM, in lockstep.
+
+        """
+        self.scheduler.stop()
+        self.gpio = VirtualGpio()
+        self.scheduler = BacklightScheduler(self.gpio)
+        pins = [12, 13, 18, 5]
+        for pin in pins:
+            self.scheduler.channel(pin)
+        # The first pin on each channel uses hardware PWM.
+        self.assertEqual({0: 12, 1: 13}, self.scheduler._hardware_pins)
+        self.assertRaises(ValueError, self.scheduler.channel, 5)
+        self.assertRaises(ValueError, self.scheduler.channel, 40)
+        self.scheduler.start()
+        self.scheduler.set_duty_cycles({pin: 100 for pin in pins})
+        self._wait_for_fade()
+        fades = [[duty for _, duty in self.gpio.get_duty_cycles(pin)] for pin in pins]
+        self.assertListEqual([1000000] * 4, [fade[-1] for fade in fades])
+        resolution = 1e6 / backlight_scheduler.PWM_RANGE
+        for step in zip(*fades):
+            self.assertTrue(max(step) - min(step) <= resolution)
+
+    def test_stop(self):
+        """
+        Test stopping applies the newest duty cycle right away.
+
+        """
+        self.home.turn_on()
+        self.away._set_duty_cycle(150)
+        self.scheduler.stop()
+        self.assertEqual(1000000, self.gpio.get_duty_cycles(12)[-1][1])
+        # Clamped to full brightness.
+        self.assertEqual(1000000, self.gpio.get_duty_cycles(13)[-1][1])
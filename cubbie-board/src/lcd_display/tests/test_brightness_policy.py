@@ -0,0 +1,102 @@
+import os
+import tempfile
+from datetime import datetime, time
+from unittest import TestCase
+
+from games.game_overview import GameOverview
+from lcd_display.brightness_policy import (
+    BrightnessPolicy, EnergyMeter, IioLightSensor, LightSensor, NullLightSensor, parse_schedule, parse_window
+)
+
+
+class FixedLightSensor(LightSensor):
+    def __init__(self, level):
+        self.level = level
+
+    def read(self):
+        return self.level
+
+
+class TestBrightnessPolicy(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a policy with a day/evening/night schedule.
+
+        """
+        self.sensor = NullLightSensor()
+        self.policy = BrightnessPolicy(
+            parse_schedule('21:00=60, 07:00=100,23:00=30'),
+            parse_window('22:00-07:00'),
+            0.5,
+            self.sensor,
+            0.2
+        )
+        self.final = GameOverview('g1', GameOverview.FINAL_STATUS, 9, 'Top', 7, 6, 'Cubs', 'Brewers',
+                                  '2019/05/25 7:05', 'PM')
+        self.in_progress = GameOverview('g2', GameOverview.IN_PROGRESS_STATUS, 5, 'Top', 2, 3, 'Cubs', 'Cardinals',
+                                        '2019/05/25 7:05', 'PM')
+
+    def test_parse_schedule(self):
+        """
+        Test schedules are sorted and clamped.
+
+        """
+        self.assertListEqual([(time(7), 100), (time(21), 60)], parse_schedule('21:00=60,07:00=120'))
+        self.assertRaises(ValueError, parse_schedule, '')
+
+    def test_schedule(self):
+        """
+        Test the duty cycle follows the schedule, wrapping past midnight.
+
+        """
+        self.assertEqual(100, self.policy.get_duty_cycle(datetime(2019, 5, 25, 12)))
+        self.assertEqual(60, self.policy.get_duty_cycle(datetime(2019, 5, 25, 21, 30)))
+        self.assertEqual(30, self.policy.get_duty_cycle(datetime(2019, 5, 25, 3)))
+
+    def test_final_at_night(self):
+        """
+        Test finals are dimmed at night only.
+
+        """
+        self.assertEqual(15, self.policy.get_duty_cycle(datetime(2019, 5, 25, 23, 30), self.final))
+        self.assertEqual(30, self.policy.get_duty_cycle(datetime(2019, 5, 25, 23, 30), self.in_progress))
+        self.assertEqual(60, self.policy.get_duty_cycle(datetime(2019, 5, 25, 21, 30), self.final))
+
+    def test_light_sensor(self):
+        """
+        Test the duty cycle is scaled by the ambient light level.
+
+        """
+        self.policy._light_sensor = FixedLightSensor(0)
+        self.assertAlmostEqual(20, self.policy.get_duty_cycle(datetime(2019, 5, 25, 12)))
+        self.policy._light_sensor = FixedLightSensor(1)
+        self.assertAlmostEqual(100, self.policy.get_duty_cycle(datetime(2019, 5, 25, 12)))
+
+    def test_iio_light_sensor(self):
+        """
+        Test reading an illuminance file, and a missing one.
+
+        """
+        handle, path = tempfile.mkstemp()
+        os.write(handle, b'250\n')
+        os.close(handle)
+        try:
+            self.assertEqual(0.25, IioLightSensor(path, 1000).read())
+        finally:
+            os.remove(path)
+        self.assertIsNone(IioLightSensor(path, 1000).read())
+
+
+class TestEnergyMeter(TestCase):
+    def test_energy(self):
+        """
+        Test the average duty cycle and energy are weighted by time.
+
+        """
+        meter = EnergyMeter(2.0)
+        meter.update(100, 0)
+        meter.update(50, 1800)
+        self.assertEqual(75, meter.get_average_duty_cycle(3600))
+        # An hour at 75% of 2 W.
+        self.assertEqual(1.5, meter.get_energy(3600))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from PIL import Image
+
+from lcd_display.frame_buffer import FrameBuffer
+
+
+class TestFrameBuffer(TestCase):
+    def test_chunks(self):
+        """
+        Test the frame is split into chunks sharing its memory.
+
+        """
+        frame_buffer = FrameBuffer(4, 3, 10)
+        # 24 bytes in chunks of 10.
+        self.assertListEqual([10, 10, 4], [len(chunk) for chunk in frame_buffer.chunks])
+        frame_buffer.frame[0] = 0xAB
+        self.assertEqual(b'\xab', frame_buffer.chunks[0][:1].tobytes())
+        # Chunk size must be positive.
+        self.assertRaises(ValueError, FrameBuffer, 4, 3, 0)
+
+    def test_encode(self):
+        """
+        Test encoding an image as big-endian RGB565.
+
+        """
+        frame_buffer = FrameBuffer(2, 1, 4096)
+        image = Image.new('RGB', (2, 1), (255, 0, 0))
+        image.putpixel((1, 0), (0, 0, 255))
+        frame_buffer.encode(image)
+        self.assertEqual(b'\xf8\x00\x00\x1f', bytes(frame_buffer.frame))
+
+    def test_encode_resize(self):
+        """
+        Test images are scaled to the frame size.
+
+        """
+        frame_buffer = FrameBuffer(2, 2, 4096)
+        frame_buffer.encode(Image.new('RGB', (8, 8), (0, 255, 0)))
+        self.assertEqual(b'\x07\xe0' * 4, bytes(frame_buffer.frame))
+
+    def test_encode_again(self):
+        """
+        Test encoding into the same buffer replaces the previous frame, in the same memory.
+
+        """
+        frame_buffer = FrameBuffer(2, 1, 4096)
+        frame = frame_buffer.frame
+        frame_buffer.encode(Image.new('RGB', (2, 1), (255, 0, 0)))
+        frame_buffer.encode(Image.new('RGB', (2, 1), (0, 0, 255)))
+        self.assertIs(frame, frame_buffer.frame)
+        self.assertEqual(b'\x00\x1f\x00\x1f', frame_buffer.chunks[0].tobytes())
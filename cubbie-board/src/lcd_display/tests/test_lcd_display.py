@@ -3,7 +3,9 @@ from unittest import TestCase
 import pigpio
 from PIL import Image
 
+from lcd_display.backlight_scheduler import BacklightScheduler
 from lcd_display.lcd_display import LCDDisplay
+from lcd_display.st7735_backend import ST7735Backend
 
 
 class TestLCDDisplay(TestCase):
@@ -13,17 +15,21 @@ class TestLCDDisplay(TestCase):
         Set up the right display.
 
         """
-        self.gpio = pigpio.pi()
+        self.scheduler = BacklightScheduler(pigpio.pi())
         self.display = LCDDisplay(
-            25,
-            0,
-            0,
-            12,
-            24,
-            4000000,
-            self.gpio,
+            ST7735Backend(
+                25,
+                0,
+                0,
+                24,
+                4000000,
+                128,
+                128
+            ),
+            self.scheduler.channel(12),
             128,
-            128
+            128,
+            4096
         )
         # Test logos.
         self.cubs_logo = Image.open('img/Cubs.jpg')
@@ -0,0 +1,97 @@
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+
+from PIL import Image
+
+from lcd_display.lcd_controller import LcdController
+from lcd_display.logo_atlas import LogoAtlas, build_atlas, fit_logo
+
+
+class TestLogoAtlas(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Build a small atlas in a temporary directory.
+
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.atlas_path = os.path.join(self.temp_dir, 'logos.atlas')
+        build_atlas(
+            {
+                'Cubs': Image.new('RGB', (4, 4), (0, 0, 255)),
+                'Cardinals': Image.new('RGB', (8, 8), (255, 0, 0))
+            },
+            self.atlas_path,
+            4,
+            4
+        )
+        self.atlas = LogoAtlas(self.atlas_path)
+
+    def tearDown(self):
+        # type: () -> None
+        self.atlas.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_load(self):
+        """
+        Test loading logos from the atlas.
+
+        """
+        self.assertEqual((4, 4), (self.atlas.width, self.atlas.height))
+        self.assertListEqual(['Cardinals', 'Cubs'], self.atlas.names)
+        self.assertTrue('Cubs' in self.atlas)
+        self.assertFalse('Mets' in self.atlas)
+        # Logos keep their pixels; the larger one was scaled to fit.
+        self.assertEqual((0, 0, 255), self.atlas['Cubs'].convert('RGB').getpixel((1, 1)))
+        self.assertEqual((4, 4), self.atlas['Cardinals'].size)
+        self.assertEqual((255, 0, 0), self.atlas['Cardinals'].convert('RGB').getpixel((2, 2)))
+
+    def test_copy_is_writable(self):
+        """
+        Test that copies of the mapped logos can be drawn on.
+
+        """
+        logo = self.atlas['Cubs'].copy()
+        logo.putpixel((0, 0), (1, 2, 3, 255))
+        self.assertEqual((1, 2, 3), logo.convert('RGB').getpixel((0, 0)))
+        # Atlas is unchanged.
+        self.assertEqual((0, 0, 255), self.atlas['Cubs'].convert('RGB').getpixel((0, 0)))
+
+    def test_invalid_file(self):
+        """
+        Test that files which are not atlases are rejected.
+
+        """
+        path = os.path.join(self.temp_dir, 'bad.atlas')
+        with open(path, 'wb') as bad_file:
+            bad_file.write(b'\x00' * 64)
+        self.assertRaises(ValueError, LogoAtlas, path)
+
+    def test_fit_logo(self):
+        """
+        Test that wide logos are padded with white, not stretched.
+
+        """
+        fitted = fit_logo(Image.new('RGB', (20, 10), (0, 0, 0)), 10, 10)
+        self.assertEqual((10, 10), fitted.size)
+        # Resampling softens the edge, so only check the padding is near white.
+        self.assertTrue(min(fitted.getpixel((5, 0))) > 240)
+        self.assertTrue(max(fitted.getpixel((5, 5))) < 15)
+
+    def test_stale_atlas(self):
+        """
+        Test the jpg logos are loaded instead of an atlas missing one of them, or built for another panel size.
+
+        """
+        for name in ('Cubs', 'Cardinals'):
+            Image.new('RGB', (4, 4)).save(os.path.join(self.temp_dir, name + '.jpg'))
+        logos = LcdController._get_logos(self.temp_dir, self.atlas_path, 4, 4)
+        self.assertTrue(isinstance(logos, LogoAtlas))
+        logos.close()
+        self.assertTrue(isinstance(LcdController._get_logos(self.temp_dir, self.atlas_path, 8, 8), dict))
+        # A logo added since the atlas was built.
+        Image.new('RGB', (4, 4)).save(os.path.join(self.temp_dir, 'Mets.jpg'))
+        logos = LcdController._get_logos(self.temp_dir, self.atlas_path, 4, 4)
+        self.assertListEqual(['Cardinals', 'Cubs', 'Mets'], sorted(logos))
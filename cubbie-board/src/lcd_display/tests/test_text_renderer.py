@@ -0,0 +1,62 @@
+import os.path
+from unittest import TestCase
+
+from PIL import Image, ImageFont
+
+from games.game_overview import GameOverview
+from lcd_display.text_renderer import TextRenderer
+
+FONT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'font', 'arial.ttf'
+)
+
+
+class TestTextRenderer(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a renderer for a 128 x 128 display.
+
+        """
+        self.renderer = TextRenderer(ImageFont.truetype(FONT_PATH, 15), 128, 128)
+        self.logo = Image.new('RGB', (128, 128), (255, 255, 255))
+
+    def test_add_status_header(self):
+        """
+        Test status headers are drawn with their background color.
+
+        """
+        image = self.renderer.add_status_header(GameOverview.POSTPONED_STATUS, self.logo.copy())
+        self.assertEqual(TextRenderer.RED, image.getpixel((0, 0)))
+        # Rest of the logo is untouched.
+        self.assertEqual((255, 255, 255), image.getpixel((0, 127)))
+
+    def test_add_status_header_no_header(self):
+        """
+        Test statuses without a header leave the image alone.
+
+        """
+        image = self.renderer.add_status_header(GameOverview.IN_PROGRESS_STATUS, self.logo.copy())
+        self.assertEqual(self.logo.tobytes(), image.tobytes())
+
+    def test_add_winner_text(self):
+        """
+        Test the winner banner is drawn in the bottom left corner.
+
+        """
+        image = self.renderer.add_winner_text('Cubs', self.logo.copy())
+        self.assertEqual(TextRenderer.GRAY, image.getpixel((0, 120)))
+        self.assertEqual((255, 255, 255), image.getpixel((127, 120)))
+
+    def test_warm_up(self):
+        """
+        Test warm-up renders every overlay, which are then reused.
+
+        """
+        self.renderer.warm_up(['Cubs', 'Cardinals'])
+        # One per status header, one per team.
+        self.assertEqual(len(TextRenderer.STATUS_HEADERS) + 2, len(self.renderer._overlays))
+        overlays = dict(self.renderer._overlays)
+        self.renderer.add_winner_text('Cubs', self.logo.copy())
+        self.renderer.add_status_header(GameOverview.FINAL_STATUS, self.logo.copy())
+        self.assertEqual(overlays, self.renderer._overlays)
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from PIL import Image
+
+from lcd_display.frame_buffer import FrameBuffer
+from lcd_display.backlight_scheduler import BacklightScheduler
+from lcd_display.lcd_display import LCDDisplay
+from lcd_display.virtual_backend import VirtualBackend, VirtualGpio
+
+
+class TestVirtualBackend(TestCase):
+    def test_write_frame(self):
+        """
+        Test frames are stored and recorded.
+
+        """
+        backend = VirtualBackend(4, 4)
+        frame_buffer = FrameBuffer(4, 4, 10)
+        image = Image.new('RGB', (4, 4), (255, 0, 0))
+        image.putpixel((3, 3), (0, 0, 255))
+        frame_buffer.encode(image)
+        backend.write_frame(frame_buffer)
+        # Display shows the image.
+        self.assertEqual(image.tobytes(), backend.get_image().tobytes())
+        # Write was recorded.
+        self.assertEqual(1, len(backend.writes))
+        self.assertEqual(32, backend.byte_count)
+        self.assertEqual(4, backend.writes[0].transfer_count)
+
+    def test_virtual_gpio(self):
+        """
+        Test PWM writes are recorded per pin.
+
+        """
+        gpio = VirtualGpio()
+        gpio.hardware_PWM(12, 500, 0)
+        gpio.hardware_PWM(13, 500, 1000000)
+        self.assertListEqual([1000000], [duty for _, duty in gpio.get_duty_cycles(13)])
+
+
+class TestVirtualLCDDisplay(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a headless display.
+
+        """
+        self.backend = VirtualBackend(128, 128)
+        self.scheduler = BacklightScheduler(VirtualGpio())
+        self.display = LCDDisplay(self.backend, self.scheduler.channel(12), 128, 128, 4096)
+        self.scheduler.start()
+
+    def tearDown(self):
+        # type: () -> None
+        self.scheduler.stop()
+
+    def test_display_image(self):
+        """
+        Test displaying an image on the headless display.
+
+        """
+        self.assertTrue(self.backend.is_begun)
+        image = self.display.add_winner_text('Cubs', Image.new('RGB', (128, 128), (255, 255, 255)))
+        self.display.display_image(image)
+        self.assertEqual(1, len(self.backend.writes))
+        self.assertEqual(128 * 128 * 2, self.backend.byte_count)
+
+    def test_skip_identical_frame(self):
+        """
+        Test a frame identical to the one last sent is skipped.
+
+        """
+        white = Image.new('RGB', (128, 128), (255, 255, 255))
+        self.display.display_image(white)
+        self.display.display_image(white.copy())
+        self.assertEqual(1, len(self.backend.writes))
+        self.display.display_image(Image.new('RGB', (128, 128), (0, 0, 255)))
+        self.assertEqual(2, len(self.backend.writes))
+        self.assertEqual((2, 1), (self.display.frames_pushed, self.display.frames_skipped))
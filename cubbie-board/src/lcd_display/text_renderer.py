@@ -0,0 +1,301 @@
+"""
+For drawing status and winner text on team logos.
+
+"""
+
+import os.path as path
+from timeit import default_timer
+
+from PIL import Image, ImageFont, ImageDraw
+from decouple import config
+from typing import Tuple, ClassVar, Dict, Iterable
+
+from games.game_overview import GameOverview
+
+
+class TextRenderer(object):
+    """
+    Draws text banners on logos for a display of a given size.
+
+    Notes:
+        Kept free of display hardware so logos can also be annotated offline.
+
+        Text is rasterized once per string into an overlay (background box and text, transparent elsewhere) which
+        is then pasted onto logos, so FreeType only runs the first time a string is drawn.
+
+    Attributes:
+        _font (ImageFont.FreeTypeFont): Font used to draw on images
+        _width (int): Display width
+        _height (int): Display height
+        _overlays (Dict[Tuple, Tuple[Image, Tuple[int, int]]]): Overlay key -> (RGBA overlay, position on logo)
+
+    """
+
+    # Background colors.
+    RED = (224, 13, 13)  # type: ClassVar[Tuple[int, int, int]]
+    BLACK = (0, 0, 0)  # type: ClassVar[Tuple[int, int, int]]
+    BLUE = (0, 53, 178)  # type: ClassVar[Tuple[int, int, int]]
+    GRAY = (76, 76, 76)  # type: ClassVar[Tuple[int, int, int]]
+    # Font colors.
+    WHITE = (255, 255, 255)  # type: ClassVar[Tuple[int, int, int]]
+    # Status -> (header text, font color, background color).
+    STATUS_HEADERS = {
+        GameOverview.WARM_UP_STATUS: ('Warm-Up', WHITE, BLUE),
+        GameOverview.FINAL_STATUS: ('Final', WHITE, BLACK),
+        GameOverview.POSTPONED_STATUS: ('Postponed', WHITE, RED)
+    }  # type: ClassVar[Dict[str, Tuple[str, Tuple[int, int, int], Tuple[int, int, int]]]]
+
+    def __init__(self, font, width, height):
+        # type: (ImageFont.FreeTypeFont, int, int) -> None
+        """
+        Set up the renderer.
+
+        Args:
+            font (ImageFont.FreeTypeFont): Font to draw with
+            width (int): Width of display (pixels)
+            height (int): Height of display (pixels)
+
+        """
+        self._font = font  # type: ImageFont.FreeTypeFont
+        self._width = width  # type: int
+        self._height = height  # type: int
+        self._overlays = {}  # type: Dict[Tuple, Tuple[Image, Tuple[int, int]]]
+
+    @staticmethod
+    def get_font(font_file, size):
+        # type: (str, int) -> ImageFont.FreeTypeFont
+        """
+        Load font from a file.
+
+        Args:
+            font_file (str): File to load from
+            size (int): Size of font
+
+        Returns:
+            ImageFont.FreeTypeFont: Font instance
+
+        """
+        return ImageFont.truetype(
+            path.join(
+                path.dirname(path.dirname(__file__)),
+                config('FONT_DIR'),
+                font_file
+            ), size
+        )
+
+    @staticmethod
+    def _draw_text_background(text, image, text_x, text_y, bg_x, bg_y, bg_w, bg_h, font, font_color, bg_color):
+        """
+        Draw text with background on an image.
+
+        Args:
+            text (str): Text to draw
+            image (Image): Image to draw on
+            text_x (int): X-coordinate of text
+            text_y (int): Y-coordinate of text
+            bg_x (int): X-coordinate of background
+            bg_y (int): Y-coordinate of background
+            bg_w (int): Width of background
+            bg_h (int): Height of background
+            font (ImageFont.FreeTypeFont): Font to draw with
+            font_color (Tuple[int, int, int]): Color of font in RGB
+            bg_color (Tuple[int, int, int]): Color of background in RGB
+
+        Returns:
+            Image: Image with text drawn on it
+
+        """
+        # Get draw instance.
+        draw = ImageDraw.Draw(image)
+        # Draw the background.
+        draw.rectangle((bg_x, bg_y, bg_w, bg_h), fill=bg_color)
+        # Draw the text.
+        draw.text((text_x, text_y), text, fill=font_color, font=font)
+        return image
+
+    def _render_overlay(self, text, text_x, text_y, bg_box, font_color, bg_color):
+        # type: (str, int, int, Tuple[int, int, int, int], Tuple[int, int, int], Tuple[int, int, int]) -> Tuple[Image, Tuple[int, int]]
+        """
+        Rasterize text on a background box into an overlay.
+
+        Args:
+            text (str): Text to draw
+            text_x (int): X-coordinate of text on the logo
+            text_y (int): Y-coordinate of text on the logo
+            bg_box (Tuple[int, int, int, int]): Background box on the logo, as inclusive (x0, y0, x1, y1)
+            font_color (Tuple[int, int, int]): Color of font in RGB
+            bg_color (Tuple[int, int, int]): Color of background in RGB
+
+        Returns:
+            Tuple[Image, Tuple[int, int]]: RGBA overlay and its position on the logo
+
+        """
+        # Clip the box to the display.
+        bg_x0, bg_y0 = max(bg_box[0], 0), max(bg_box[1], 0)
+        bg_x1, bg_y1 = min(bg_box[2], self._width - 1), min(bg_box[3], self._height - 1)
+        overlay = Image.new('RGBA', (bg_x1 - bg_x0 + 1, bg_y1 - bg_y0 + 1), (0, 0, 0, 0))
+        self._draw_text_background(
+            text,
+            overlay,
+            text_x - bg_x0,
+            text_y - bg_y0,
+            0,
+            0,
+            bg_x1 - bg_x0,
+            bg_y1 - bg_y0,
+            self._font,
+            font_color,
+            bg_color
+        )
+        return overlay, (bg_x0, bg_y0)
+
+    def _get_header_overlay(self, text, font_color, bg_color):
+        # type: (str, Tuple[int, int, int], Tuple[int, int, int]) -> Tuple[Image, Tuple[int, int]]
+        """
+        Get the overlay for header text, rendering it if not cached.
+
+        Args:
+            text (str): Text of the header
+            font_color (Tuple[int, int, int]): Color of font
+            bg_color (Tuple[int, int, int]): Color of background
+
+        Returns:
+            Tuple[Image, Tuple[int, int]]: RGBA overlay and its position on the logo
+
+        """
+        key = ('header', text, font_color, bg_color)
+        if key not in self._overlays:
+            # Get dimensions of text with font.
+            text_w, text_h = self._font.getsize(text)
+            # Centered at the top, with the background spanning the display.
+            self._overlays[key] = self._render_overlay(
+                text,
+                (self._width - text_w) // 2,
+                2,
+                (0, 0, self._width, text_h + 4),
+                font_color,
+                bg_color
+            )
+        return self._overlays[key]
+
+    def _get_bottom_overlay(self, text):
+        # type: (str) -> Tuple[Image, Tuple[int, int]]
+        """
+        Get the overlay for bottom text, rendering it if not cached.
+
+        Args:
+            text (str): The text
+
+        Returns:
+            Tuple[Image, Tuple[int, int]]: RGBA overlay and its position on the logo
+
+        """
+        key = ('bottom', text)
+        if key not in self._overlays:
+            # Get size of text.
+            text_w, text_h = self._font.getsize(text)
+            # Bottom left, with the background just around the text.
+            text_y = self._height - 5 - text_h
+            self._overlays[key] = self._render_overlay(
+                text,
+                5,
+                text_y,
+                (0, text_y - 5, text_w + 10, text_y + text_h + 5),
+                TextRenderer.WHITE,
+                TextRenderer.GRAY
+            )
+        return self._overlays[key]
+
+    def warm_up(self, teams):
+        # type: (Iterable[str]) -> float
+        """
+        Render the overlays for every status header and for each team's winner text.
+
+        Args:
+            teams (Iterable[str]): Names of the teams
+
+        Returns:
+            float: Time taken (seconds)
+
+        """
+        start = default_timer()
+        for text, font_color, bg_color in TextRenderer.STATUS_HEADERS.values():
+            self._get_header_overlay(text, font_color, bg_color)
+        for team in teams:
+            self._get_bottom_overlay(team + ' won!')
+        return default_timer() - start
+
+    def add_header_text(self, text, image, font_color, bg_color):
+        # type: (str, Image, Tuple[int, int, int], Tuple[int, int, int]) -> Image
+        """
+        Add header text to an image.
+
+        Adds text to the top of the image.
+
+        Args:
+            text (str): Text to add
+            image (Image): Image to add header to
+            font_color (Tuple[int, int, int]): Color of font
+            bg_color (Tuple[int, int, int]): Color of background
+
+        Returns:
+            Image: Image with header
+
+        """
+        overlay, position = self._get_header_overlay(text, font_color, bg_color)
+        image.paste(overlay, position, overlay)
+        return image
+
+    def add_bottom_text(self, text, image):
+        # type: (str, Image) -> Image
+        """
+        Add text to the bottom of an image.
+
+        Args:
+            text (str): The text to add
+            image (Image): Image to draw on
+
+        Returns:
+            Image: Annotated image
+
+        """
+        overlay, position = self._get_bottom_overlay(text)
+        image.paste(overlay, position, overlay)
+        return image
+
+    def add_winner_text(self, team, logo):
+        # type: (str, Image) -> Image
+        """
+        Add text saying who won the game.
+
+        Args:
+            team (str): Name of team who won
+            logo (Image): Logo of team who won
+
+        Returns:
+            Image: Team logo with winner text
+
+        """
+        # Text to add.
+        win_label = team + ' won!'
+        # Add text.
+        return self.add_bottom_text(win_label, logo)
+
+    def add_status_header(self, status, image):
+        # type: (str, Image) -> Image
+        """
+        Add status text to the top of the image.
+
+        Args:
+            status (str): Status of the game
+            image (Image): Image to draw text on
+
+        Returns:
+            Image: Image with status text
+
+        """
+        # If no header for status, do nothing.
+        if status not in TextRenderer.STATUS_HEADERS:
+            return image
+        text, font_color, bg_color = TextRenderer.STATUS_HEADERS[status]
+        return self.add_header_text(text, image, font_color, bg_color)
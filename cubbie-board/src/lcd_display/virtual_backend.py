@@ -0,0 +1,209 @@
+"""
+For running the LCD displays headless, e.g. for benchmarks on a machine without the display hardware.
+
+"""
+
+from collections import namedtuple
+from timeit import default_timer
+
+from PIL import Image
+from typing import Dict, List, Tuple
+
+from .display_backend import DisplayBackend
+from .frame_buffer import FrameBuffer
+
+# Record of one frame sent to a virtual display.
+FrameWrite = namedtuple('FrameWrite', ['time', 'byte_count', 'transfer_count', 'duration'])
+# Record of one PWM write to a virtual GPIO.
+PwmWrite = namedtuple('PwmWrite', ['time', 'pin', 'frequency', 'duty_cycle'])
+
+
+class VirtualBackend(DisplayBackend):
+    """
+    In-memory display which records every frame written to it.
+
+    Attributes:
+        width (int): Display width
+        height (int): Display height
+        framebuffer (bytearray): Display RAM, as big-endian RGB565
+        writes (List[FrameWrite]): Every frame written
+        is_begun (bool): Whether the display was initialized
+
+    """
+
+    def __init__(self, width, height):
+        # type: (int, int) -> None
+        """
+        Set up the display RAM.
+
+        Args:
+            width (int): Width of display (pixels)
+            height (int): Height of display (pixels)
+
+        """
+        self.width = width  # type: int
+        self.height = height  # type: int
+        self.framebuffer = bytearray(width * height * 2)  # type: bytearray
+        self.writes = []  # type: List[FrameWrite]
+        self.is_begun = False  # type: bool
+
+    def begin(self):
+        # type: () -> None
+        """
+        Initialize the display.
+
+        """
+        self.is_begun = True
+
+    def write_frame(self, frame_buffer):
+        # type: (FrameBuffer) -> None
+        """
+        Copy a frame into display RAM chunk by chunk, as it would go over SPI.
+
+        Args:
+            frame_buffer (FrameBuffer): Encoded frame to send
+
+        """
+        start = default_timer()
+        offset = 0
+        for chunk in frame_buffer.chunks:
+            self.framebuffer[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        self.writes.append(FrameWrite(start, offset, len(frame_buffer.chunks), default_timer() - start))
+
+    @property
+    def byte_count(self):
+        # type: () -> int
+        """
+        Get the total bytes written.
+
+        Returns:
+            int: Bytes written
+
+        """
+        return sum(write.byte_count for write in self.writes)
+
+    def get_image(self):
+        # type: () -> Image
+        """
+        Decode the display RAM into an image.
+
+        Returns:
+            Image: What the display is showing
+
+        """
+        # Swap back to little-endian, which Pillow can unpack.
+        packed = bytearray(len(self.framebuffer))
+        packed[0::2] = self.framebuffer[1::2]
+        packed[1::2] = self.framebuffer[0::2]
+        return Image.frombytes('RGB', (self.width, self.height), bytes(packed), 'raw', 'BGR;16')
+
+
+class VirtualGpio(object):
+    """
+    Stand-in for pigpio.pi which records PWM writes.
+
+    Notes:
+        DMA PWM duty cycles are recorded scaled to 0 - 1e6, as hardware PWM duty cycles are.
+
+    Attributes:
+        pwm_writes (List[PwmWrite]): Every PWM write
+        _frequencies (Dict[int, int]): DMA PWM frequency of each pin
+        _ranges (Dict[int, int]): DMA PWM range of each pin
+
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.pwm_writes = []  # type: List[PwmWrite]
+        self._frequencies = {}  # type: Dict[int, int]
+        self._ranges = {}  # type: Dict[int, int]
+
+    def hardware_PWM(self, pin, frequency, duty_cycle):
+        # type: (int, int, int) -> int
+        """
+        Record a PWM write.
+
+        Args:
+            pin (int): PWM pin
+            frequency (int): PWM frequency (Hz)
+            duty_cycle (int): Duty cycle, 0 - 1e6
+
+        Returns:
+            int: 0, as pigpio returns on success
+
+        """
+        self.pwm_writes.append(PwmWrite(default_timer(), pin, frequency, duty_cycle))
+        return 0
+
+    def set_PWM_frequency(self, pin, frequency):
+        # type: (int, int) -> int
+        """
+        Set the DMA PWM frequency of a pin.
+
+        Args:
+            pin (int): PWM pin
+            frequency (int): PWM frequency (Hz)
+
+        Returns:
+            int: The frequency set
+
+        """
+        self._frequencies[pin] = frequency
+        return frequency
+
+    def set_PWM_range(self, pin, duty_range):
+        # type: (int, int) -> int
+        """
+        Set the DMA PWM duty cycle range of a pin.
+
+        Args:
+            pin (int): PWM pin
+            duty_range (int): Duty cycle of full brightness
+
+        Returns:
+            int: The range set
+
+        """
+        self._ranges[pin] = duty_range
+        return duty_range
+
+    def set_PWM_dutycycle(self, pin, duty_cycle):
+        # type: (int, int) -> int
+        """
+        Record a DMA PWM write.
+
+        Args:
+            pin (int): PWM pin
+            duty_cycle (int): Duty cycle, 0 - the pin's range (255 by default)
+
+        Returns:
+            int: 0, as pigpio returns on success
+
+        """
+        self.pwm_writes.append(PwmWrite(
+            default_timer(), pin, self._frequencies.get(pin, 0),
+            int(round(duty_cycle * 1e6 / self._ranges.get(pin, 255)))
+        ))
+        return 0
+
+    def get_duty_cycles(self, pin):
+        # type: (int) -> List[Tuple[float, int]]
+        """
+        Get the duty cycles written to a pin.
+
+        Args:
+            pin (int): PWM pin
+
+        Returns:
+            List[Tuple[float, int]]: (time, duty cycle) of each write
+
+        """
+        return [(write.time, write.duty_cycle) for write in self.pwm_writes if write.pin == pin]
+
+    def stop(self):
+        # type: () -> None
+        """
+        Release the connection (nothing to release).
+
+        """
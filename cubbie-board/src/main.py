@@ -4,6 +4,7 @@ Main python module for running the scoreboard.
 
 """
 
+import logging
 import os
 import signal
 import sys
@@ -11,7 +12,7 @@ import time
 from datetime import date, timedelta
 
 from decouple import config
-from typing import ClassVar
+from typing import ClassVar, Optional, Union
 
 # Setup src path.
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
@@ -20,6 +21,17 @@ from games.game_manager import GameManager
 from games.game_overview import GameOverview
 from lcd_display.lcd_controller import LcdController
 from segment_display.segment_controller import SegmentController
+from segment_display.segment_process import SegmentProcess
+from segment_display.segment_state import SegmentState
+from utils import instrumentation, metrics_server, sampling_profiler
+from utils.metrics_server import MetricsServer
+from utils.sampling_profiler import SamplingProfiler
+
+
+logging.basicConfig(
+    level=config('LOG_LEVEL', default='WARNING'),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
 
 
 class CubbieBoard(object):
@@ -30,7 +42,9 @@ class CubbieBoard(object):
         preferred_team (str): The user's preferred team
         game_manager (GameManager): Game info manager
         lcd_controller (LcdController): Controller for LCD displays
-        segment_controller (SegmentController): Controller for 7-segment displays
+        segment_controller (Union[SegmentController, SegmentProcess]): Controller for 7-segment displays
+        metrics_server (Optional[MetricsServer]): Serves metrics to local scrapers, if enabled
+        profiler (Optional[SamplingProfiler]): Sampling profiler last started by SIGUSR1, if any
 
     """
 
@@ -45,15 +59,29 @@ class CubbieBoard(object):
         self.preferred_team = config('PREFERRED_TEAM')  # type: str
         # Setup the game manager.
         self.game_manager = self._setup_game_manager()  # type: GameManager
+        # Setup 7-segment display controller, first so a segment process forks before any other thread starts.
+        # SEGMENT_PROCESS multiplexes in a dedicated process instead of a thread.
+        if config('SEGMENT_PROCESS', default=False, cast=bool):
+            self.segment_controller = SegmentProcess()  # type: Union[SegmentController, SegmentProcess]
+        else:
+            self.segment_controller = SegmentController()
+        self.segment_controller.start()
+        # INSTRUMENTATION_TARGET dumps hot path timings to a file or UNIX socket, from a thread started after the fork.
+        instrumentation.start('main')
+        # METRICS_PORT serves them to local scrapers, in Prometheus text format.
+        self.metrics_server = metrics_server.start()  # type: Optional[MetricsServer]
+        instrumentation.collect('segment.multiplex_cycles', lambda: self.segment_controller.multiplex_cycles)
         # Setup LCD controller.
         self.lcd_controller = LcdController()  # type: LcdController
-        # Setup 7-segment display controller.
-        self.segment_controller = SegmentController()  # type: SegmentController
-        self.segment_controller.start()
         # Register exit signal handler.
         signal.signal(signal.SIGINT, self.exit_signal_handler)
         signal.signal(signal.SIGHUP, self.exit_signal_handler)
         signal.signal(signal.SIGTERM, self.exit_signal_handler)
+        # Register profiler toggle signal handler.
+        self.profiler = None  # type: Optional[SamplingProfiler]
+        signal.signal(signal.SIGUSR1, self.profile_signal_handler)
+        # Restart system calls the signal interrupts (Python 2 does not), so a toggle never fails an API request.
+        signal.siginterrupt(signal.SIGUSR1, False)
 
     def _setup_game_manager(self):
         # type: () -> GameManager
@@ -104,10 +132,7 @@ class CubbieBoard(object):
         # Update LCD displays.
         self.lcd_controller.display_team_logos(new_overview)
         # Update segment displays.
-        self.segment_controller.write_update('inning', new_overview.inning)
-        self.segment_controller.write_update('inning_state', new_overview.inning_state)
-        self.segment_controller.write_update('home_team_runs', new_overview.home_team_runs)
-        self.segment_controller.write_update('away_team_runs', new_overview.away_team_runs)
+        self.segment_controller.apply_state(SegmentState.from_overview(new_overview))
 
     def exit(self):
         # type: () -> None
@@ -122,6 +147,9 @@ class CubbieBoard(object):
         """
         self.lcd_controller.exit()
         self.segment_controller.exit()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        instrumentation.stop()
 
     def exit_signal_handler(self, sig, frame):
         """
@@ -139,6 +167,23 @@ class CubbieBoard(object):
         self.exit()
         exit(0)
 
+    def profile_signal_handler(self, sig, frame):
+        """
+        Signal handler for starting a sampling profile of every thread, or ending the running one early.
+
+        Notes:
+            Profiles are written to PROFILER_DIR as collapsed stacks, for flamegraphs.
+
+        Args:
+            sig: The signal
+            frame: The frame
+
+        Returns:
+            None
+
+        """
+        self.profiler = sampling_profiler.toggle(self.profiler)
+
     def run(self):
         """
         Main execution loop.
@@ -0,0 +1,101 @@
+"""
+For sharing one I2C bus between all the MCP23008 chips.
+
+"""
+
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+from utils import instrumentation
+
+if TYPE_CHECKING:
+    import smbus
+
+
+class I2CBus(object):
+    """
+    One SMBus handle shared by every chip, which remembers what each register holds.
+
+    Notes:
+        Writes of the value a register already holds are skipped. Only registers written through this bus are
+        remembered, so the first write of each always goes out.
+
+    Attributes:
+        _bus (smbus.SMBus): The I2C bus
+        _registers (Dict[Tuple[int, int], int]): (chip address, register) -> value last written
+        writes (int): Number of write transactions made
+        skipped_writes (int): Number of writes skipped as the register already held the value
+
+    """
+
+    def __init__(self, bus):
+        # type: (smbus.SMBus) -> None
+        """
+        Setup the bus.
+
+        Args:
+            bus (smbus.SMBus): The I2C bus, or anything with the same interface
+
+        """
+        self._bus = bus  # type: smbus.SMBus
+        self._registers = {}  # type: Dict[Tuple[int, int], int]
+        self.writes = 0  # type: int
+        self.skipped_writes = 0  # type: int
+
+    def write_register(self, address, register, value):
+        # type: (int, int, int) -> None
+        """
+        Write a register, unless it already holds the value.
+
+        Args:
+            address (int): Chip address
+            register (int): Register to write
+            value (int): Byte to write
+
+        """
+        key = (address, register)
+        if self._registers.get(key) == value:
+            self.skipped_writes += 1
+            return
+        # Forget the value until written, in case the write fails.
+        self._registers.pop(key, None)
+        with instrumentation.span('i2c.write'):
+            self._bus.write_byte_data(address, register, value)
+        self._registers[key] = value
+        self.writes += 1
+
+    def forget(self, address, register):
+        # type: (int, int) -> None
+        """
+        Forget what a register holds, so its next write goes out.
+
+        Notes:
+            For registers written other than through this bus, e.g. by the pigpio daemon.
+
+        Args:
+            address (int): Chip address
+            register (int): Register written elsewhere
+
+        """
+        self._registers.pop((address, register), None)
+
+    def write_registers(self, address, register, values):
+        # type: (int, int, List[int]) -> None
+        """
+        Write consecutive registers in one transaction.
+
+        Notes:
+            Relies on the chip's sequential mode, where the register address increments after each byte.
+
+        Args:
+            address (int): Chip address
+            register (int): First register to write
+            values (List[int]): Bytes to write, one per register
+
+        """
+        keys = [(address, register + i) for i in range(len(values))]
+        for key in keys:
+            self._registers.pop(key, None)
+        with instrumentation.span('i2c.write'):
+            self._bus.write_i2c_block_data(address, register, values)
+        self._registers.update(zip(keys, values))
+        self.writes += 1
@@ -0,0 +1,182 @@
+"""
+For multiplexing the 7-segment displays inside the pigpio daemon.
+
+"""
+
+import time
+
+import pigpio
+from typing import Dict, List, Sequence, Tuple
+
+from .segment_display import SegmentDisplay
+
+
+class PigpioMultiplexer(object):
+    """
+    Runs the multiplex cycle as a pigpio daemon script, so its timing does not depend on the Python scheduler.
+
+    Notes:
+        pigpio's DMA waveforms can only toggle GPIOs, but the displays' I2C data has to change with each digit. The
+        whole cycle (digit-enable sequencing and I2C writes) runs as a script in the daemon instead, with the same
+        sequencing as SegmentController._blink_digits.
+
+        A script is stored for each number of digits scanned, with the I2C handles built in. Script parameters hold
+        the codes of each display for each scanned digit, so new values only need a parameter update.
+
+    Attributes:
+        _gpio (pigpio.pi): Connection to the pigpio daemon
+        _handles (List[int]): I2C handle of each display
+        _digit_pins (List[int]): Pins enabling each digit, left to right
+        _refresh_rate (float): Times per second every scanned digit is lit
+        _brightness (float): Brightness of the displays (0 - 1)
+        _script_ids (Dict[int, int]): Number of digits scanned -> ID of its stored script
+        _running_phase_count (int): Number of digits the running script scans, 0 if not running
+
+    """
+
+    # Number of script parameters, which hold every code scanned.
+    MAX_PARAMS = 10
+    # Time to wait for a stored script to be ready (seconds).
+    SCRIPT_INIT_TIMEOUT = 1.0
+
+    def __init__(self, gpio, displays, i2c_bus, digit_pins, refresh_rate, brightness=1.0):
+        # type: (pigpio.pi, Sequence[SegmentDisplay], int, List[int], float, float) -> None
+        """
+        Open the displays' I2C handles in the daemon.
+
+        Args:
+            gpio (pigpio.pi): Connection to the pigpio daemon
+            displays (Sequence[SegmentDisplay]): Displays to multiplex
+            i2c_bus (int): I2C bus the displays are connected to
+            digit_pins (List[int]): Pins enabling each digit, left to right
+            refresh_rate (float): Times per second every scanned digit is lit
+            brightness (float): Brightness of the displays (0 - 1)
+
+        Raises:
+            ValueError: If there are too many display digits for the script parameters
+
+        """
+        if len(displays) * len(digit_pins) > PigpioMultiplexer.MAX_PARAMS:
+            raise ValueError('At most {} display digits can be multiplexed'.format(PigpioMultiplexer.MAX_PARAMS))
+        self._gpio = gpio  # type: pigpio.pi
+        self._handles = [gpio.i2c_open(i2c_bus, display.i2c_addr) for display in displays]  # type: List[int]
+        self._digit_pins = digit_pins  # type: List[int]
+        self._refresh_rate = refresh_rate  # type: float
+        self._brightness = brightness  # type: float
+        self._script_ids = {}  # type: Dict[int, int]
+        self._running_phase_count = 0  # type: int
+
+    @property
+    def is_running(self):
+        # type: () -> bool
+        """
+        Get whether a script is multiplexing.
+
+        Returns:
+            bool: Whether a script is running
+
+        """
+        return self._running_phase_count > 0
+
+    def _build_script(self, phase_count):
+        # type: (int) -> bytes
+        """
+        Build the script scanning the rightmost digits.
+
+        Args:
+            phase_count (int): Number of digits to scan
+
+        Returns:
+            bytes: Script text
+
+        """
+        pins = self._digit_pins[-phase_count:]
+        # Every scanned digit gets an equal share of each refresh.
+        phase_time = int(1e6 / (self._refresh_rate * phase_count))
+        # Lit for as long as a lone digit (as in SegmentController._blink_digits), dark for the rest of the phase.
+        on_time = min(int(phase_time * self._brightness * phase_count / len(self._digit_pins)), phase_time)
+        lines = ['tag 0']
+        for phase, pin in enumerate(pins):
+            # Switch off the lit digit before writing, as in SegmentController._blink_digits.
+            lines.append('w {} 0'.format(pins[phase - 1]))
+            lines.extend(
+                'i2cwb {} {} p{}'.format(handle, SegmentDisplay.OLAT, phase * len(self._handles) + i)
+                for i, handle in enumerate(self._handles)
+            )
+            lines.append('w {} 1'.format(pin))
+            lines.append('mics {}'.format(on_time))
+            if on_time < phase_time:
+                lines.append('w {} 0'.format(pin))
+                lines.append('mics {}'.format(phase_time - on_time))
+        lines.append('jmp 0')
+        return ' '.join(lines).encode('ascii')
+
+    def _get_script_id(self, phase_count):
+        # type: (int) -> int
+        """
+        Get the script scanning some digits, storing it if needed.
+
+        Args:
+            phase_count (int): Number of digits to scan
+
+        Returns:
+            int: ID of the stored script
+
+        Raises:
+            RuntimeError: If the script is not ready in time
+
+        """
+        if phase_count not in self._script_ids:
+            script_id = self._gpio.store_script(self._build_script(phase_count))
+            # Wait for the daemon to be ready to run the script.
+            deadline = time.time() + PigpioMultiplexer.SCRIPT_INIT_TIMEOUT
+            while self._gpio.script_status(script_id)[0] == pigpio.PI_SCRIPT_INITING:
+                if time.time() > deadline:
+                    raise RuntimeError('Multiplex script was not ready in time')
+                time.sleep(0.01)
+            self._script_ids[phase_count] = script_id
+        return self._script_ids[phase_count]
+
+    def show(self, codes):
+        # type: (Sequence[Tuple[int, ...]]) -> None
+        """
+        Start multiplexing codes, or switch to them if already running.
+
+        Args:
+            codes (Sequence[Tuple[int, ...]]): Codes of each display for each scanned digit, left to right
+
+        """
+        phase_count = len(codes[0])
+        # Phase-major, as the script reads them.
+        params = [display_codes[phase] for phase in range(phase_count) for display_codes in codes]
+        if self._running_phase_count == phase_count:
+            self._gpio.update_script(self._script_ids[phase_count], params)
+            return
+        self.stop()
+        self._gpio.run_script(self._get_script_id(phase_count), params)
+        self._running_phase_count = phase_count
+
+    def stop(self):
+        # type: () -> None
+        """
+        Stop multiplexing.
+
+        Notes:
+            The script may have stopped on any digit, so the caller has to light the digits it wants.
+
+        """
+        if self._running_phase_count:
+            self._gpio.stop_script(self._script_ids[self._running_phase_count])
+            self._running_phase_count = 0
+
+    def close(self):
+        # type: () -> None
+        """
+        Stop multiplexing and release the scripts and I2C handles.
+
+        """
+        self.stop()
+        for script_id in self._script_ids.values():
+            self._gpio.delete_script(script_id)
+        for handle in self._handles:
+            self._gpio.i2c_close(handle)
@@ -3,60 +3,123 @@ Module for managing the 7-segment displays.
 
 """
 
+import multiprocessing
 import threading
-from Queue import Queue
 from time import sleep
+from timeit import default_timer
 
-import RPi.GPIO as GPIO
-from decouple import config
-from typing import Union, Dict, Tuple, Callable
+from decouple import Csv, config
+from typing import TYPE_CHECKING, Any, Union, Dict, List, Optional, Tuple, Callable
 
+from .i2c_bus import I2CBus
 from .segment_display import SegmentDisplay
+from utils.shared_state import SharedState
+from .segment_state import OFF_STATE, SegmentState
+from .sim_bus import SimBus, SimGpio
+
+if TYPE_CHECKING:
+    import pigpio
+    from .pigpio_multiplexer import PigpioMultiplexer
+
+# A precomputed chip write: (register write function, chip address, register, code).
+FrameWrite = Tuple[Callable[[int, int, int], None], int, int, int]
 
 
 class SegmentController(threading.Thread):
     """
     Threaded controller for the 7-segment displays.
 
+    Notes:
+        The displays share one digit-enable line per digit. While any display needs more than its rightmost digit,
+        the digits from the leftmost one needed to the rightmost are scanned, each lit for an equal share of every
+        refresh. Otherwise only the rightmost digit is lit, and nothing is scanned.
+
+        Every lit digit is on for the same share of the time in either mode, the brightness over the number of digits,
+        so numbers do not dim as they widen. Scanned digits are switched off early for their share, and the lone
+        rightmost digit has its enable line driven by the pigpio daemon's DMA-timed PWM, which needs no bus writes,
+        and no thread in this process.
+
     Attributes:
         home_display (SegmentDisplay): Home display
         away_display (SegmentDisplay): Away display
         inning_display (SegmentDisplay): Inning display
-        _left_digit_pin (int): Pin for enabling the left digit
-        _right_digit_pin (int): Pin for enabling the right digit
-        _update_queue (Queue): For receiving updates
+        _displays (Tuple[SegmentDisplay, ...]): Every display
+        _digit_pins (List[int]): Pins for enabling each digit, left to right
+        _shared_state (SharedState): Encoded state to show, written by other threads (or processes)
+        _sequence (Optional[int]): Sequence number of the shared state last shown
         _stop_handle (threading.Event): Handle to stop the thread
-        _is_double_mode (bool): Whether the display is in double digit mode
+        _phase_count (int): Number of rightmost digits scanned, 1 when not multiplexing
         _is_top_inning (bool): Whether or not it is the top of the inning
         _update_functions (Dict[str, Callable]): Functions for handling updates of specific fields
+        _state (Optional[SegmentState]): State last applied as a whole, kept current by field updates
+        _frame_table (Tuple[Tuple[FrameWrite, ...], ...]): Chip writes for each digit, by digit position
+        _gpio (Any): The RPi.GPIO module, or a SimGpio when simulated
+        i2c_bus (I2CBus): I2C bus shared by the displays
+        wakeups (int): Number of times the thread has woken up
+        _multiplex_cycles (multiprocessing.RawValue): Number of scans of the digits, readable from another process
+        _multiplexer (Optional[PigpioMultiplexer]): Multiplexes in the pigpio daemon, if enabled
+        _brightness (float): Brightness of the displays (0 - 1)
+        _pi (Optional[pigpio.pi]): Connection to the pigpio daemon, if needed
+        _pwm (Optional[Any]): pigpio.pi (or SimGpio) driving PWM on the rightmost digit's enable line, None if it is
+            always on when lit
+        _is_pwm_running (bool): Whether PWM is driving the rightmost digit
 
     """
 
-    # Timeout between blinking digits.
-    BLINK_TIMEOUT = 0.005
+    # Times per second each scanned digit is lit while multiplexing.
+    REFRESH_RATE = 50
+    # Frequency of the rightmost digit's PWM when lit alone (Hz), and its duty cycle range (steps at that frequency
+    # with pigpio's default 5 us sample rate).
+    PWM_FREQUENCY = 200
+    PWM_RANGE = 1000
 
-    def __init__(self):
-        # type: () -> None
+    def __init__(self, shared_state=None, multiplex_cycles=None):
+        # type: (Optional[SharedState], Optional[multiprocessing.RawValue]) -> None
         """
         Construct the segment display controller.
 
-        """
-        threading.Thread.__init__(self)
+        Args:
+            shared_state (Optional[SharedState]): Encoded state to show, blank and owned by the controller if None
+            multiplex_cycles (Optional[multiprocessing.RawValue]): Shared counter of scans, owned by the controller if
+                None
+
+        """
+        threading.Thread.__init__(self, name='SegmentController')
+        addresses = [
+            int(config(key), 0)
+            for key in ('HOME_MCP23008_ADDRESS', 'AWAY_MCP23008_ADDRESS', 'INNING_MCP23008_ADDRESS')
+        ]
+        # I2C_BACKEND selects the 'smbus' hardware (default) or a 'sim' bus and GPIOs, running at I2C_SPEED (Hz, 0 for
+        # transactions to take no time).
+        is_simulated = config('I2C_BACKEND', default='smbus') == 'sim'
+        if is_simulated:
+            self._gpio = SimGpio()  # type: Any
+            bus = SimBus(addresses, config('I2C_SPEED', default=100000, cast=int) or None)
+        else:
+            import RPi.GPIO
+            import smbus
+            self._gpio = RPi.GPIO
+            bus = smbus.SMBus(1)
+        self.i2c_bus = I2CBus(bus)  # type: I2CBus
+        # DIGIT_PINS lists the digit-enable pins left to right, else there are LEFT_DIGIT_PIN and RIGHT_DIGIT_PIN.
+        self._digit_pins = config('DIGIT_PINS', default='', cast=Csv(int)) or [
+            config('LEFT_DIGIT_PIN', cast=int), config('RIGHT_DIGIT_PIN', cast=int)
+        ]  # type: List[int]
         # Construct the segment displays.
-        self.home_display = SegmentDisplay(
-            1, int(config('HOME_MCP23008_ADDRESS'), 0)
-        )  # type: SegmentDisplay
-        self.away_display = SegmentDisplay(
-            1, int(config('AWAY_MCP23008_ADDRESS'), 0)
-        )  # type: SegmentDisplay
-        self.inning_display = SegmentDisplay(
-            1, int(config('INNING_MCP23008_ADDRESS'), 0)
-        )  # type: SegmentDisplay
-        self._left_digit_pin = config('LEFT_DIGIT_PIN', cast=int)  # type: int
-        self._right_digit_pin = config('RIGHT_DIGIT_PIN', cast=int)  # type: int
-        self._update_queue = Queue()  # type: Queue
+        digit_count = len(self._digit_pins)
+        self.home_display = SegmentDisplay(self.i2c_bus, addresses[0], digit_count)  # type: SegmentDisplay
+        self.away_display = SegmentDisplay(self.i2c_bus, addresses[1], digit_count)  # type: SegmentDisplay
+        self.inning_display = SegmentDisplay(self.i2c_bus, addresses[2], digit_count)  # type: SegmentDisplay
+        self._displays = (
+            self.home_display, self.away_display, self.inning_display
+        )  # type: Tuple[SegmentDisplay, ...]
+        if shared_state is None:
+            shared_state = SharedState(len(SegmentState._fields))
+            shared_state.write(dict(enumerate(OFF_STATE.encode())))
+        self._shared_state = shared_state  # type: SharedState
+        self._sequence = None  # type: Optional[int]
         self._stop_handle = threading.Event()  # type: threading.Event
-        self._is_double_mode = False  # type: bool
+        self._phase_count = 1  # type: int
         self._is_top_inning = True  # type: bool
         self._update_functions = {
             'inning': self.update_inning,
@@ -64,13 +127,104 @@ class SegmentController(threading.Thread):
             'home_team_runs': self.update_home_score,
             'away_team_runs': self.update_away_score
         }  # type: Dict[str, Callable]
+        self._state = None  # type: Optional[SegmentState]
+        self._frame_table = self._build_frame_table()  # type: Tuple[Tuple[FrameWrite, ...], ...]
+        self.wakeups = 0  # type: int
+        if multiplex_cycles is None:
+            multiplex_cycles = multiprocessing.RawValue('L', 0)
+        self._multiplex_cycles = multiplex_cycles  # type: multiprocessing.RawValue
+        # SEGMENT_BRIGHTNESS dims every display (0 - 1).
+        self._brightness = min(max(config('SEGMENT_BRIGHTNESS', default=1.0, cast=float), 0.0), 1.0)  # type: float
+        self._pi = None  # type: Optional[pigpio.pi]
+        # SEGMENT_MULTIPLEXER selects multiplexing in this 'thread' (default) or in the 'pigpio' daemon.
+        self._multiplexer = None  # type: Optional[PigpioMultiplexer]
+        if config('SEGMENT_MULTIPLEXER', default='thread') == 'pigpio':
+            from .pigpio_multiplexer import PigpioMultiplexer
+            self._multiplexer = PigpioMultiplexer(
+                self._get_pi(), self._displays, 1, self._digit_pins, SegmentController.REFRESH_RATE, self._brightness
+            )
         # Set up digit pins.
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self._left_digit_pin, GPIO.OUT)
-        GPIO.setup(self._right_digit_pin, GPIO.OUT)
-        # Initially set to display the right digit.
-        GPIO.output(self._left_digit_pin, GPIO.LOW)
-        GPIO.output(self._right_digit_pin, GPIO.HIGH)
+        self._gpio.setmode(self._gpio.BCM)
+        for pin in self._digit_pins:
+            self._gpio.setup(pin, self._gpio.OUT)
+        self._pwm = None  # type: Optional[Any]
+        if self._get_lone_duty_cycle() < 100:
+            self._pwm = self._gpio if is_simulated else self._get_pi()
+            self._pwm.set_PWM_frequency(self._digit_pins[-1], SegmentController.PWM_FREQUENCY)
+            self._pwm.set_PWM_range(self._digit_pins[-1], SegmentController.PWM_RANGE)
+        self._is_pwm_running = False  # type: bool
+        # Initially set to display the rightmost digit.
+        self._light_rightmost_digit()
+
+    def _get_pi(self):
+        # type: () -> pigpio.pi
+        """
+        Get the connection to the pigpio daemon, connecting on first use.
+
+        Returns:
+            pigpio.pi: The connection
+
+        """
+        if self._pi is None:
+            import pigpio
+            self._pi = pigpio.pi()
+        return self._pi
+
+    def _get_lone_duty_cycle(self):
+        # type: () -> float
+        """
+        Get the duty cycle of the rightmost digit when lit alone, for the same on-time as a scanned digit.
+
+        Returns:
+            float: Duty cycle (0 - 100)
+
+        """
+        return 100.0 * self._brightness / len(self._digit_pins)
+
+    def _light_rightmost_digit(self):
+        # type: () -> None
+        """
+        Light only the rightmost digit, at its lone duty cycle.
+
+        Returns:
+            None
+
+        """
+        for pin in self._digit_pins[:-1]:
+            self._gpio.output(pin, self._gpio.LOW)
+        if self._pwm is None:
+            self._gpio.output(self._digit_pins[-1], self._gpio.HIGH)
+        elif not self._is_pwm_running:
+            self._pwm.set_PWM_dutycycle(
+                self._digit_pins[-1], int(round(self._get_lone_duty_cycle() * SegmentController.PWM_RANGE / 100))
+            )
+            self._is_pwm_running = True
+
+    def _stop_pwm(self):
+        # type: () -> None
+        """
+        Stop driving the rightmost digit with PWM, so its enable line can be scanned.
+
+        Returns:
+            None
+
+        """
+        if self._is_pwm_running:
+            # Switches the pin low, after which it can be driven as a plain output.
+            self._pwm.set_PWM_dutycycle(self._digit_pins[-1], 0)
+            self._is_pwm_running = False
+
+    @property
+    def multiplex_cycles(self):
+        # type: () -> int
+        """
+        Get the number of scans of the digits, whose rate is the multiplex frequency.
+
+        Returns:
+            int: Number of scans
+
+        """
+        return self._multiplex_cycles.value
 
     def update_inning(self, inning):
         # type: (int) -> None
@@ -143,174 +297,228 @@ class SegmentController(threading.Thread):
         """
         self.away_display.number = away_score
 
-    def _update_display_mode(self):
-        # type: () -> None
+    def update_state(self, state):
+        # type: (SegmentState) -> None
         """
-        Update whether the display is in single or double digit mode.
+        Update every display from a new state.
+
+        Notes:
+            Only the fields that differ from the current state are updated.
+
+        Args:
+            state (SegmentState): New state
 
         Returns:
             None
 
         """
-        # System is in double digit mode if only one display is.
-        if (
-                self.home_display.is_double_digit_mode
-                or self.away_display.is_double_digit_mode
-                or self.inning_display.is_double_digit_mode
-        ):
-            self._is_double_mode = True
-        else:
-            self._is_double_mode = False
+        for field, value in zip(state._fields, state):
+            if self._state is None or getattr(self._state, field) != value:
+                self._update_functions[field](value)
+        self._state = state
 
-    def _read_update(self):
-        # type: () -> Union[Tuple[str, Union[str, int]], None]
+    def _update_display_mode(self):
+        # type: () -> None
         """
-        Read and return an update from the update queue.
+        Update how many digits are scanned.
 
         Returns:
-            Union[Tuple[str, Union[str, int]], None]: Next item on the update queue
+            None
 
         """
-        # Return nothing if no items in queue.
-        if self._update_queue.empty():
-            return None
-        item = self._update_queue.get()
-        return item[0], item[1]
+        # Enough to show the widest display's number, at least the rightmost digit.
+        self._phase_count = max([1] + [display.lit_digit_count for display in self._displays])
 
-    def write_update(self, key, value):
-        # type: (str, Union[str, int]) -> None
+    def _build_frame_table(self):
+        # type: () -> Tuple[Tuple[FrameWrite, ...], ...]
         """
-        Write an update to the update queue.
+        Precompute the chip writes for each digit.
 
         Notes:
-            Thread-safe
-
-        Args:
-            key (str): Field name
-            value (Union[str, int]): Update value
+            Must be rebuilt whenever a display's value changes, so multiplexing only replays the writes.
 
         Returns:
-            None
+            Tuple[Tuple[FrameWrite, ...], ...]: Chip writes for each digit, by digit position
 
         """
-        self._update_queue.put((key, value))
+        return tuple(
+            tuple(
+                (display.bus.write_register, display.i2c_addr, SegmentDisplay.OLAT, display.codes[position])
+                for display in self._displays
+            )
+            for position in range(len(self._digit_pins))
+        )
 
-    def process_update(self, key, value):
-        # type: (str, Union[str, int]) -> None
+    def _write_frame(self, position):
+        # type: (int) -> None
         """
-        Process an update taken from the queue.
-
-        Notes:
-            Passes the key and value to the function needed to process them.
+        Replay the chip writes of a digit.
 
         Args:
-            key (str): Field name
-            value (Union[str, int]): Update value
+            position (int): Digit position, 0 for leftmost
 
         Returns:
             None
 
         """
-        # Get the function handler.
-        handler = self._update_functions[key]
-        # Execute it.
-        handler(value)
-        # Update the display mode.
-        self._update_display_mode()
+        for write, address, register, code in self._frame_table[position]:
+            write(address, register, code)
 
-    def process_updates(self):
+    def _update_multiplexer(self):
         # type: () -> None
         """
-        Read and process all updates on the update queue.
+        Start, update or stop multiplexing in the pigpio daemon, if enabled.
 
         Returns:
             None
 
         """
-        while not self._update_queue.empty():
-            update_item = self._read_update()
-            self.process_update(update_item[0], update_item[1])
-        # If not in double digit mode, display second digit on each display.
-        if not self._is_double_mode:
-            self._display_digit_2()
+        if self._multiplexer is None:
+            return
+        if self._phase_count > 1:
+            self._multiplexer.show([display.codes[-self._phase_count:] for display in self._displays])
+        elif self._multiplexer.is_running:
+            self._multiplexer.stop()
+        else:
+            return
+        # The daemon writes the output latches through its own handles, so the bus no longer knows what they hold.
+        for display in self._displays:
+            self.i2c_bus.forget(display.i2c_addr, SegmentDisplay.OLAT)
 
-    def _display_digit_1(self):
-        # type: () -> None
+    def _write_frame_changes(self, position, old_frame_table):
+        # type: (int, Tuple[Tuple[FrameWrite, ...], ...]) -> None
         """
-        Display the first digit on each display.
+        Write only the chip writes of a digit which differ from an older frame table.
+
+        Args:
+            position (int): Digit position, 0 for leftmost
+            old_frame_table (Tuple[Tuple[FrameWrite, ...], ...]): Frame table the displays currently show
 
         Returns:
             None
 
         """
-        self.home_display.display_digit_1()
-        self.away_display.display_digit_1()
-        self.inning_display.display_digit_1()
+        for (write, address, register, code), old_write in zip(
+                self._frame_table[position], old_frame_table[position]
+        ):
+            if code != old_write[3]:
+                write(address, register, code)
 
-    def _display_digit_2(self):
-        # type: () -> None
+    def write_update(self, key, value):
+        # type: (str, Union[str, int]) -> None
+        """
+        Write an update of one field to the shared state.
+
+        Notes:
+            Thread-safe
+
+        Args:
+            key (str): Field name
+            value (Union[str, int]): Update value
+
+        Returns:
+            None
+
+        """
+        self._shared_state.write({SegmentState._fields.index(key): SegmentState.encode_field(key, value)})
+
+    def apply_state(self, state):
+        # type: (SegmentState) -> None
         """
-        Display the second digit on each display.
+        Write a whole new state to the shared state, to be applied at once.
+
+        Notes:
+            Thread-safe. The displays never show part of the state, and only the displays whose values change are
+            written.
+
+        Args:
+            state (SegmentState): New state
 
         Returns:
             None
 
         """
-        self.home_display.display_digit_2()
-        self.away_display.display_digit_2()
-        self.inning_display.display_digit_2()
+        self._shared_state.write(dict(enumerate(state.encode())))
 
-    def _clear(self):
+    def process_updates(self):
         # type: () -> None
         """
-        Quickly clear the display.
+        Read and show the latest shared state.
 
         Returns:
             None
 
         """
-        self.home_display.display_digit(-1)
-        self.away_display.display_digit(-1)
-        self.inning_display.display_digit(-1)
+        was_multiplexing = self._phase_count > 1
+        old_frame_table = self._frame_table
+        self._sequence, values = self._shared_state.read()
+        self.update_state(SegmentState.decode(values))
+        self._update_display_mode()
+        # Precompute what to write for the new values.
+        self._frame_table = self._build_frame_table()
+        # Scanning drives the rightmost digit's enable line directly.
+        if self._phase_count > 1:
+            self._stop_pwm()
+        self._update_multiplexer()
+        # If not multiplexing, display the rightmost digit on each display.
+        if self._phase_count == 1:
+            rightmost = len(self._digit_pins) - 1
+            # Multiplexing may have stopped on any digit, else the displays still show the old table's.
+            if was_multiplexing:
+                self._write_frame(rightmost)
+                self._light_rightmost_digit()
+            else:
+                self._write_frame_changes(rightmost, old_frame_table)
 
     def _blink_digits(self):
         # type: () -> None
         """
-        Blink each digit on each display.
+        Light each scanned digit in turn, left to right, for an equal share of one refresh.
+
+        Notes:
+            No digit is lit while the displays' values change, which prevents ghosting without blanking writes. Ends
+            with the rightmost digit lit, unless dimmed.
+
+            A digit is switched off before the end of its phase if it would otherwise be on for longer than the
+            rightmost digit lit alone.
+
+            Each phase ends on a deadline rather than after a fixed sleep, so the time spent writing does not slow the
+            refresh, and is taken equally from every digit.
 
         Returns:
             None
 
         """
-        # Clear displays.
-        self._clear()
-        # Switch to lighting left digit.
-        GPIO.output(self._right_digit_pin, GPIO.LOW)
-        GPIO.output(self._left_digit_pin, GPIO.HIGH)
-        # Display digit 1 on each display.
-        self._display_digit_1()
-        sleep(SegmentController.BLINK_TIMEOUT)
-        # Clear again.
-        self._clear()
-        # Switch to lighting right digit.
-        GPIO.output(self._left_digit_pin, GPIO.LOW)
-        GPIO.output(self._right_digit_pin, GPIO.HIGH)
-        # Display digit 2 on each display.
-        self._display_digit_2()
-        sleep(SegmentController.BLINK_TIMEOUT)
+        pins = self._digit_pins[-self._phase_count:]
+        first_position = len(self._digit_pins) - self._phase_count
+        phase_time = 1.0 / (SegmentController.REFRESH_RATE * self._phase_count)
+        lit_time = phase_time * self._brightness * self._phase_count / len(self._digit_pins)
+        phase_end = default_timer()
+        for phase, pin in enumerate(pins):
+            phase_end += phase_time
+            # Switch off the lit digit before writing, so it never shows this digit's value.
+            self._gpio.output(pins[phase - 1], self._gpio.LOW)
+            self._write_frame(first_position + phase)
+            self._gpio.output(pin, self._gpio.HIGH)
+            if lit_time < phase_time:
+                lit_end = min(default_timer() + lit_time, phase_end)
+                sleep(max(lit_end - default_timer(), 0))
+                self._gpio.output(pin, self._gpio.LOW)
+            sleep(max(phase_end - default_timer(), 0))
 
     def turn_off_displays(self):
         # type: () -> None
         """
         Turn off the displays.
 
+        Notes:
+            Thread-safe. Applied as the blank state, so the next state applied is compared with what is shown.
+
         Returns:
             None
 
         """
-        self.home_display.off()
-        self.away_display.off()
-        self.inning_display.off()
+        self.apply_state(OFF_STATE)
 
     def exit(self):
         # type: () -> None
@@ -321,12 +529,18 @@ class SegmentController(threading.Thread):
             None
 
         """
-        # Stop the thread.
+        # Stop the thread, waking it if idle.
         self._stop_handle.set()
+        self._shared_state.changed.set()
         # Join thread.
         self.join()
+        if self._multiplexer is not None:
+            self._multiplexer.close()
+        self._stop_pwm()
+        if self._pi is not None:
+            self._pi.stop()
         # Cleanup GPIO and shut off displays.
-        GPIO.cleanup()
+        self._gpio.cleanup()
         self.home_display.off()
         self.away_display.off()
         self.inning_display.off()
@@ -337,18 +551,22 @@ class SegmentController(threading.Thread):
         Main thread execution function.
 
         Notes:
-            Continue updating the display until stop handle is set.
+            Continue updating the display until stop handle is set. Blocks while there is nothing to multiplex, waking
+            only for updates or the stop request.
 
         Returns:
             None
 
         """
         while not self._stop_handle.is_set():
+            self.wakeups += 1
             # If there are updates, process them.
-            if not self._update_queue.empty():
+            if self._shared_state.sequence != self._sequence:
                 self.process_updates()
-            # If in double digit mode, blink digits.
-            if self._is_double_mode:
+            # If multiplexing, scan the digits (unless the pigpio daemon does), checking for updates after each scan.
+            if self._phase_count > 1 and self._multiplexer is None:
                 self._blink_digits()
-            # Delay some amount of time.
-            sleep(0.01)
+                self._multiplex_cycles.value += 1
+            # Else, nothing to do until the next update.
+            else:
+                self._shared_state.wait()
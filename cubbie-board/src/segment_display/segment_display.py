@@ -3,32 +3,42 @@ For interfacing with the MCP23008 chip.
 
 """
 
-import smbus
+import logging
 
-from decouple import config
+from typing import Tuple
 
-from .Adafruit_MCP230xx import Adafruit_MCP230XX
+from .i2c_bus import I2CBus
+
+logger = logging.getLogger(__name__)
 
 
 class SegmentDisplay(object):
     """
-    Interface for controlling a dual, 7-segment display using a MCP23008 chip.
+    Interface for controlling a multi-digit, 7-segment display using a MCP23008 chip.
+
+    Notes:
+        The chip drives the segments of every digit, and the digit-enable lines (shared by all displays) select which
+        digit lights up, so the digits are multiplexed.
 
     Attributes:
-        i2c_bus (int): I2C bus the chip is connected to
         i2c_addr (int): I2C address of the chip
         _number (int): The number to display
-        is_extra_pin_on (bool): Whether the extra pin on the chip is on or off
-        bus (smbus.SMBus): The I2C bus
-        _digit_1 (int): The first (leftmost) digit to display
-        _digit_2 (int): The second (rightmost) digit to display
+        _is_extra_pin_on (bool): Whether the extra pin on the chip is on or off
+        bus (I2CBus): The I2C bus, shared with the other displays
+        _digits (Tuple[int, ...]): Digits to display, left to right (-1 for blank)
+        _codes (Tuple[int, ...]): Encoded digits to write to the chip, left to right
 
     """
 
     # Code for enabling extra pin.
     EXTRA_PIN_CODE = 0x80
-    # Register to control GPIO pins.
-    GPIO = 0x09
+    # Register to set pin directions, first of the configuration registers.
+    IODIR = 0x00
+    # Output latch register, controlling the output pins.
+    OLAT = 0x0A
+    # Configuration registers IODIR to GPPU: all outputs, no input polarity, interrupts or pull-ups, sequential
+    # operation on.
+    OUTPUT_CONFIG = [0x00] * 7
     # Hex codes representing digits on the chip.
     DIGIT_CODES = {
         -1: 0x00,
@@ -44,83 +54,129 @@ class SegmentDisplay(object):
         9: 0x6F
     }
 
-    def __init__(self, i2c_bus, i2c_addr):
-        # type: (int, int) -> None
+    def __init__(self, bus, i2c_addr, digit_count=2):
+        # type: (I2CBus, int, int) -> None
         """
         Setup the segment display controller chip.
         
         Args:
-            i2c_bus (int): I2C bus the chip is connected to
+            bus (I2CBus): The I2C bus the chip is connected to
             i2c_addr (int): I2C address of the chip
+            digit_count (int): Number of digits on the display
         
         """
-        self._i2c_bus = i2c_bus  # type: int
         self._i2c_addr = i2c_addr  # type: int
         self._number = -1  # type: int
-        self.is_extra_pin_on = False  # type: bool
-        self.bus = smbus.SMBus(i2c_bus)  # type: smbus.SMBus
-        self._digit_1 = -1  # type: int
-        self._digit_2 = -1  # type: int
+        self._is_extra_pin_on = False  # type: bool
+        self.bus = bus  # type: I2CBus
+        self._digits = (-1, ) * digit_count  # type: Tuple[int, ...]
+        self._codes = self._encode_codes()  # type: Tuple[int, ...]
         # Set up chip pins.
-        self._setup_pins(i2c_bus, i2c_addr, config('NUM_GPIOS', cast=int))
+        self._setup_pins()
 
-    @staticmethod
-    def _setup_pins(i2c_bus, i2c_addr, num_gpios):
-        # type: (int, int, int) -> None
+    def _setup_pins(self):
+        # type: () -> None
         """
         Setup the chip's GPIO pins.
         
         Notes:
-            Sets all pins to output.
-        
-        Args:
-            i2c_bus (int): I2C bus the chip is connected to
-            i2c_addr (int): I2C address of the chip
-            num_gpios (int): Number of GPIO pins on the chip
+            Sets all pins to output, writing the configuration registers in one transaction. The output latch is
+            blanked first, so no segment lights up with a stale value as the pins become outputs.
+
+        """
+        self.bus.write_register(self._i2c_addr, SegmentDisplay.OLAT, SegmentDisplay.DIGIT_CODES[-1])
+        self.bus.write_registers(self._i2c_addr, SegmentDisplay.IODIR, SegmentDisplay.OUTPUT_CONFIG)
+
+    @property
+    def digits(self):
+        # type: () -> Tuple[int, ...]
+        """
+        Get the digits to display.
+
+        Returns:
+            Tuple[int, ...]: Digits to display, left to right (-1 for blank)
 
         """
-        # Create chip controller.
-        mcp = Adafruit_MCP230XX(busnum=i2c_bus, address=i2c_addr, num_gpios=num_gpios)
-        # Configure each pin for output.
-        for i in range(8):
-            mcp.config(i, mcp.OUTPUT)
+        return self._digits
 
     @property
-    def digit_1(self):
+    def digit_count(self):
         # type: () -> int
         """
-        Get the first (leftmost) digit to display.
+        Get the number of digits on the display.
 
         Returns:
-            int: First digit to display
+            int: Number of digits
 
         """
-        return self._digit_1
+        return len(self._digits)
 
     @property
-    def digit_2(self):
+    def i2c_addr(self):
         # type: () -> int
         """
-        Get the second (rightmost) digit to display.
+        Get the I2C address of the chip.
+
+        Returns:
+            int: I2C address of the chip
+
+        """
+        return self._i2c_addr
+
+    @property
+    def codes(self):
+        # type: () -> Tuple[int, ...]
+        """
+        Get the encoded digits, as written to the chip.
+
+        Notes:
+            Recomputed whenever the number or extra pin changes.
 
         Returns:
-            int: Second digit to display
+            Tuple[int, ...]: Digit codes, left to right
 
         """
-        return self._digit_2
+        return self._codes
 
     @property
-    def is_double_digit_mode(self):
+    def is_extra_pin_on(self):
         # type: () -> bool
         """
-        Checks whether the display is in double digit mode.
+        Get whether the extra pin on the chip is on.
+
+        Returns:
+            bool: Whether the extra pin is on
+
+        """
+        return self._is_extra_pin_on
+
+    @is_extra_pin_on.setter
+    def is_extra_pin_on(self, is_extra_pin_on):
+        # type: (bool) -> None
+        """
+        Turn the extra pin on or off.
+
+        Args:
+            is_extra_pin_on (bool): Whether the extra pin is on
+
+        """
+        self._is_extra_pin_on = is_extra_pin_on
+        self._codes = self._encode_codes()
+
+    @property
+    def lit_digit_count(self):
+        # type: () -> int
+        """
+        Get how many of the rightmost digits have to be lit to show the number.
 
         Returns:
-            bool: Whether the display is in double digit mode
+            int: Number of digits from the leftmost non-blank digit (0 if all blank)
 
         """
-        # If first digit set to some non-negative value, display is in double digit mode.
-        return self._digit_1 != -1
+        for i, digit in enumerate(self._digits):
+            if digit != -1:
+                return len(self._digits) - i
+        return 0
 
     @property
     def number(self):
@@ -141,23 +197,59 @@ class SegmentDisplay(object):
         Set a new number value.
 
         Notes:
-            Also calculates and sets new digit values.
+            Also calculates and sets new digit values. Numbers too wide for the display are shown as the largest that
+            fits (e.g. 99 on 2 digits).
 
         Args:
-            number (int): New number value
+            number (int): New number value (-1 for blank)
 
         """
+        max_number = 10 ** self.digit_count - 1
+        if number > max_number:
+            logger.warning('%d does not fit on %d digits, showing %d', number, self.digit_count, max_number)
+            number = max_number
         self._number = number
-        # If default, set both digits accordingly.
+        # If default, blank all digits.
         if number == -1:
-            self._digit_1 = self._digit_2 = -1
-            return
-        # Set the first and second digits to display.
-        self._digit_1 = (self._number // 10) % 10
-        # If only one digit, turn off second digit.
-        if self._digit_1 == 0:
-            self._digit_1 = -1
-        self._digit_2 = self._number % 10
+            self._digits = (-1, ) * self.digit_count
+        else:
+            # Split into digits, right to left, blanking leading zeros (but always showing the last digit).
+            digits = []
+            for _ in range(self.digit_count):
+                digits.append(number % 10 if number or not digits else -1)
+                number //= 10
+            self._digits = tuple(reversed(digits))
+        self._codes = self._encode_codes()
+
+    def encode_digit(self, digit):
+        # type: (int) -> int
+        """
+        Encode a digit as written to the chip.
+
+        Args:
+            digit (int): Digit to encode (-1 for blank)
+
+        Returns:
+            int: Code for the digit, with the extra pin if on
+
+        """
+        # Encode the digit.
+        coded_digit = SegmentDisplay.DIGIT_CODES[digit]
+        # Add in extra pin if set to on.
+        if self._is_extra_pin_on:
+            coded_digit += SegmentDisplay.EXTRA_PIN_CODE
+        return coded_digit
+
+    def _encode_codes(self):
+        # type: () -> Tuple[int, ...]
+        """
+        Encode the digits.
+
+        Returns:
+            Tuple[int, ...]: Digit codes, left to right
+
+        """
+        return tuple(self.encode_digit(digit) for digit in self._digits)
 
     def _write_code(self, code):
         # type: (int) -> None
@@ -168,8 +260,8 @@ class SegmentDisplay(object):
             code (int): Code to write
         
         """
-        # Write to chip.
-        self.bus.write_byte_data(self._i2c_addr, SegmentDisplay.GPIO, code)
+        # Write to chip, unless it already shows the code.
+        self.bus.write_register(self._i2c_addr, SegmentDisplay.OLAT, code)
 
     def display_digit(self, digit):
         # type: (int) -> None
@@ -180,29 +272,19 @@ class SegmentDisplay(object):
             digit (int): Digit to display
         
         """
-        # Encode the digit.
-        coded_digit = SegmentDisplay.DIGIT_CODES[digit]
-        # Add in extra pin if set to on.
-        if self.is_extra_pin_on:
-            coded_digit += SegmentDisplay.EXTRA_PIN_CODE
         # Write digit to chip.
-        self._write_code(coded_digit)
-
-    def display_digit_1(self):
-        # type: () -> None
-        """
-        Display the first digit.
+        self._write_code(self.encode_digit(digit))
 
+    def display_position(self, position):
+        # type: (int) -> None
         """
-        self.display_digit(self._digit_1)
+        Display the digit at a position.
 
-    def display_digit_2(self):
-        # type: () -> None
-        """
-        Display the second digit.
+        Args:
+            position (int): Digit position, 0 for leftmost
 
         """
-        self.display_digit(self._digit_2)
+        self._write_code(self._codes[position])
 
     def off(self):
         # type: () -> None
@@ -214,5 +296,5 @@ class SegmentDisplay(object):
         self.is_extra_pin_on = False
         # Set to blank number.
         self.number = -1
-        # Display a digit.
-        self.display_digit_1()
+        # Display a (blank) digit.
+        self.display_position(0)
@@ -0,0 +1,157 @@
+"""
+For multiplexing the 7-segment displays in a dedicated process, away from the main process' GIL.
+
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+
+from decouple import config
+
+from utils import instrumentation
+from utils.shared_state import SharedState
+from .segment_controller import SegmentController
+from .segment_state import OFF_STATE, SegmentState
+
+logger = logging.getLogger(__name__)
+
+# Niceness of the segment process (-20 - 19, lower is higher priority). Raising priority needs root.
+NICENESS = config('SEGMENT_PROCESS_NICE', default=-10, cast=int)  # type: int
+
+
+class SegmentProcess(multiprocessing.Process):
+    """
+    Runs the segment controller in a child process at raised priority, with the same interface as SegmentController.
+
+    Notes:
+        The child owns the I2C bus and GPIOs, and only contends for its own GIL, so rendering and parsing in the main
+        process do not disturb multiplexing. Start it before other threads, as only the forking thread is copied.
+
+        States reach the child's controller through a shared-memory SharedState, written without locking the child.
+
+    Attributes:
+        _shared_state (SharedState): Encoded state for the child to show
+        _stop_handle (multiprocessing.Event): Handle to stop the child
+        _multiplex_cycles (multiprocessing.RawValue): Number of scans of the digits by the child
+
+    """
+
+    def __init__(self):
+        # type: () -> None
+        """
+        Setup the process.
+
+        """
+        multiprocessing.Process.__init__(self, name='SegmentProcess')
+        # Shut the displays off even if the main process dies without exiting.
+        self.daemon = True
+        self._shared_state = SharedState(
+            len(SegmentState._fields), event=multiprocessing.Event()
+        )  # type: SharedState
+        self._shared_state.write(dict(enumerate(OFF_STATE.encode())))
+        self._stop_handle = multiprocessing.Event()  # type: multiprocessing.Event
+        self._multiplex_cycles = multiprocessing.RawValue('L', 0)  # type: multiprocessing.RawValue
+
+    @property
+    def multiplex_cycles(self):
+        # type: () -> int
+        """
+        Get the number of scans of the digits by the child, whose rate is the multiplex frequency.
+
+        Returns:
+            int: Number of scans
+
+        """
+        return self._multiplex_cycles.value
+
+    def apply_state(self, state):
+        # type: (SegmentState) -> None
+        """
+        Show a whole new state.
+
+        Notes:
+            Only the latest state is shown, older ones not yet read by the child are skipped.
+
+        Args:
+            state (SegmentState): New state
+
+        Returns:
+            None
+
+        """
+        self._shared_state.write(dict(enumerate(state.encode())))
+
+    def turn_off_displays(self):
+        # type: () -> None
+        """
+        Turn off the displays.
+
+        Returns:
+            None
+
+        """
+        self.apply_state(OFF_STATE)
+
+    def exit(self):
+        # type: () -> None
+        """
+        Stop the child, which turns off the displays.
+
+        Returns:
+            None
+
+        """
+        self._stop_handle.set()
+        self.join()
+
+    @staticmethod
+    def _raise_priority():
+        # type: () -> None
+        """
+        Set the process' niceness to the configured value.
+
+        Returns:
+            None
+
+        """
+        try:
+            os.nice(NICENESS - os.nice(0))
+        except OSError:
+            logger.warning('Could not set segment process niceness to %d', NICENESS)
+
+    def _serve(self):
+        # type: () -> SegmentController
+        """
+        Run the controller on the shared state until stopped.
+
+        Returns:
+            SegmentController: The stopped controller
+
+        """
+        # The main process handles signals and stops the child through exit(). SIGUSR1 toggles the main process'
+        # profiler, and would otherwise kill the child when sent to the whole process group or cgroup.
+        for sig in (signal.SIGINT, signal.SIGHUP, signal.SIGTERM, signal.SIGUSR1):
+            signal.signal(sig, signal.SIG_IGN)
+        SegmentProcess._raise_priority()
+        # Record and dump apart from the main process.
+        instrumentation.start(self.name)
+        instrumentation.collect('segment.multiplex_cycles', lambda: self.multiplex_cycles)
+        controller = SegmentController(self._shared_state, self._multiplex_cycles)
+        controller.start()
+        self._stop_handle.wait()
+        controller.exit()
+        instrumentation.stop()
+        return controller
+
+    def run(self):
+        # type: () -> None
+        """
+        Main process execution function.
+
+        Returns:
+            None
+
+        """
+        self._serve()
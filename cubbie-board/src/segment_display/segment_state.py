@@ -0,0 +1,97 @@
+"""
+For holding everything the 7-segment displays show.
+
+"""
+
+from collections import namedtuple
+
+from typing import Any, List, Sequence, Union
+
+from games.game_overview import GameOverview
+
+# Inning states the displays show, by code. Any other state is encoded as None's.
+INNING_STATES = (None, 'Top', 'Bottom')
+
+
+class SegmentState(namedtuple('SegmentState', ['inning', 'inning_state', 'home_team_runs', 'away_team_runs'])):
+    """
+    Values shown on the 7-segment displays, applied together.
+
+    Attributes:
+        inning (int): Current inning
+        inning_state (str): Current inning state
+        home_team_runs (int): Home team runs
+        away_team_runs (int): Away team runs
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_overview(cls, game_overview):
+        # type: (GameOverview) -> SegmentState
+        """
+        Get the state to show for a game.
+
+        Args:
+            game_overview (GameOverview): Overview of game
+
+        Returns:
+            SegmentState: State to show
+
+        """
+        return cls(
+            game_overview.inning,
+            game_overview.inning_state,
+            game_overview.home_team_runs,
+            game_overview.away_team_runs
+        )
+
+    @staticmethod
+    def encode_field(field, value):
+        # type: (str, Union[int, str]) -> int
+        """
+        Encode a field value as a number, for sharing.
+
+        Args:
+            field (str): Field name
+            value (Union[int, str]): Field value
+
+        Returns:
+            int: Encoded value
+
+        """
+        if field == 'inning_state':
+            return INNING_STATES.index(value) if value in INNING_STATES else 0
+        return value
+
+    def encode(self):
+        # type: () -> List[int]
+        """
+        Encode the state as numbers, for sharing.
+
+        Returns:
+            List[int]: Encoded field values, in field order
+
+        """
+        return [SegmentState.encode_field(field, value) for field, value in zip(self._fields, self)]
+
+    @classmethod
+    def decode(cls, values):
+        # type: (Sequence[Any]) -> SegmentState
+        """
+        Decode a state encoded as numbers.
+
+        Args:
+            values (Sequence[Any]): Encoded field values, in field order
+
+        Returns:
+            SegmentState: The state
+
+        """
+        inning, inning_state, home_team_runs, away_team_runs = (int(value) for value in values)
+        return cls(inning, INNING_STATES[inning_state], home_team_runs, away_team_runs)
+
+
+# State which blanks every display.
+OFF_STATE = SegmentState(-1, None, -1, -1)
@@ -0,0 +1,332 @@
+"""
+For simulating the MCP23008 chips, their I2C bus and the digit-enable GPIOs, e.g. for benchmarks on a machine without
+the display hardware.
+
+"""
+
+import time
+from collections import namedtuple
+from timeit import default_timer
+
+from typing import Dict, List, Optional, Tuple
+
+# Register addresses.
+IODIR = 0x00
+IOCON = 0x05
+GPPU = 0x06
+INTF = 0x07
+INTCAP = 0x08
+GPIO = 0x09
+OLAT = 0x0A
+# Number of registers.
+REGISTER_COUNT = 0x0B
+# IOCON bit disabling the address pointer increment (byte mode).
+IOCON_SEQOP = 0x20
+# Bits on the wire per byte (8 data, 1 acknowledge), and per transaction for the start and stop conditions.
+BITS_PER_BYTE = 9
+BITS_PER_TRANSACTION = 2
+
+# Record of one transaction on a simulated bus.
+Transaction = namedtuple('Transaction', ['time', 'address', 'register', 'is_read', 'byte_count', 'duration'])
+# Record of one output change of a simulated GPIO, PWM outputs at their duty cycle (0 - 1) as level.
+GpioOutput = namedtuple('GpioOutput', ['time', 'pin', 'level'])
+
+
+class MCP23008(object):
+    """
+    Register model of an MCP23008 I/O expander.
+
+    Notes:
+        Registers start at their power-on values. Writes to the read-only interrupt flag and capture registers are
+        ignored, and writes to GPIO go to the output latch. Multi-byte transfers increment the register address
+        unless IOCON's SEQOP bit selects byte mode.
+
+    Attributes:
+        registers (List[int]): Value of each register
+        writes (List[Tuple[int, int]]): (register, value) of every register write
+
+    """
+
+    def __init__(self):
+        # type: () -> None
+        """
+        Power on the chip.
+
+        """
+        self.registers = [0x00] * REGISTER_COUNT  # type: List[int]
+        # All pins start as inputs.
+        self.registers[IODIR] = 0xFF
+        self.writes = []  # type: List[Tuple[int, int]]
+
+    @property
+    def outputs(self):
+        # type: () -> int
+        """
+        Get the pins driven high.
+
+        Returns:
+            int: Bitmask of pins driven high
+
+        """
+        return self.registers[OLAT] & ~self.registers[IODIR] & 0xFF
+
+    def _next_register(self, register):
+        # type: (int) -> int
+        """
+        Get the register a multi-byte transfer continues with.
+
+        Args:
+            register (int): Current register
+
+        Returns:
+            int: Next register
+
+        """
+        if self.registers[IOCON] & IOCON_SEQOP:
+            return register
+        return (register + 1) % REGISTER_COUNT
+
+    def write(self, register, values):
+        # type: (int, List[int]) -> None
+        """
+        Write bytes starting at a register.
+
+        Args:
+            register (int): First register
+            values (List[int]): Bytes to write
+
+        """
+        for value in values:
+            self.writes.append((register, value))
+            if register == GPIO:
+                self.registers[OLAT] = value
+            elif register not in (INTF, INTCAP):
+                self.registers[register] = value
+            register = self._next_register(register)
+
+    def read(self, register, length):
+        # type: (int, int) -> List[int]
+        """
+        Read bytes starting at a register.
+
+        Args:
+            register (int): First register
+            length (int): Number of bytes
+
+        Returns:
+            List[int]: Bytes read
+
+        """
+        values = []
+        for _ in range(length):
+            if register == GPIO:
+                # Output pins read back the latch, unconnected inputs their pull-ups.
+                iodir = self.registers[IODIR]
+                values.append((self.registers[OLAT] & ~iodir | self.registers[GPPU] & iodir) & 0xFF)
+            else:
+                values.append(self.registers[register])
+            register = self._next_register(register)
+        return values
+
+
+class SimBus(object):
+    """
+    Simulated I2C bus of MCP23008 chips, with the same interface as smbus.SMBus.
+
+    Notes:
+        With a bus speed, each transaction blocks for as long as it would take on the wire, as smbus does.
+
+    Attributes:
+        chips (Dict[int, MCP23008]): Address -> chip on the bus
+        speed (Optional[int]): Bus clock (Hz), or None for transactions to take no time
+        transactions (int): Number of transactions made
+        bytes_transferred (int): Bytes sent and received, including addresses
+        log (List[Transaction]): Every transaction made
+
+    """
+
+    def __init__(self, addresses, speed=None):
+        # type: (List[int], Optional[int]) -> None
+        """
+        Setup the bus.
+
+        Args:
+            addresses (List[int]): Addresses of the chips on the bus
+            speed (Optional[int]): Bus clock (Hz), or None for transactions to take no time
+
+        """
+        self.chips = {address: MCP23008() for address in addresses}  # type: Dict[int, MCP23008]
+        self.speed = speed  # type: Optional[int]
+        self.transactions = 0  # type: int
+        self.bytes_transferred = 0  # type: int
+        self.log = []  # type: List[Transaction]
+
+    def _transact(self, address, register, is_read, byte_count):
+        # type: (int, int, bool, int) -> MCP23008
+        """
+        Make a transaction with a chip, taking as long as it would on the wire.
+
+        Args:
+            address (int): Chip address
+            register (int): First register accessed
+            is_read (bool): Whether registers are read, else written
+            byte_count (int): Bytes in the transaction, including addresses
+
+        Returns:
+            MCP23008: The chip
+
+        Raises:
+            IOError: If no chip answers at the address
+
+        """
+        duration = 0.0
+        if self.speed is not None:
+            duration = float(byte_count * BITS_PER_BYTE + BITS_PER_TRANSACTION) / self.speed
+        self.log.append(Transaction(default_timer(), address, register, is_read, byte_count, duration))
+        self.transactions += 1
+        self.bytes_transferred += byte_count
+        if duration:
+            time.sleep(duration)
+        if address not in self.chips:
+            raise IOError(121, 'Remote I/O error')
+        return self.chips[address]
+
+    def get_busy_time(self, start=0.0, end=float('inf')):
+        # type: (float, float) -> float
+        """
+        Get how long the bus was busy with transactions started in a period.
+
+        Args:
+            start (float): Start of the period
+            end (float): End of the period
+
+        Returns:
+            float: Time on the wire (seconds)
+
+        """
+        return sum(transaction.duration for transaction in self.log if start <= transaction.time < end)
+
+    def write_byte_data(self, address, register, value):
+        # type: (int, int, int) -> None
+        # Address, register, data.
+        self._transact(address, register, False, 3).write(register, [value])
+
+    def write_i2c_block_data(self, address, register, values):
+        # type: (int, int, List[int]) -> None
+        # Address, register, data.
+        self._transact(address, register, False, 2 + len(values)).write(register, values)
+
+    def read_byte_data(self, address, register):
+        # type: (int, int) -> int
+        # Address, register, repeated start address, data.
+        return self._transact(address, register, True, 4).read(register, 1)[0]
+
+    def read_i2c_block_data(self, address, register, length):
+        # type: (int, int, int) -> List[int]
+        # Address, register, repeated start address, data.
+        return self._transact(address, register, True, 3 + length).read(register, length)
+
+
+class SimGpio(object):
+    """
+    Stand-in for the RPi.GPIO module which records output changes, and for pigpio.pi's PWM.
+
+    Attributes:
+        outputs (List[GpioOutput]): Every output change
+        _pwm_ranges (Dict[int, int]): Pin -> PWM duty cycle range
+
+    """
+
+    BCM = 11
+    OUT = 0
+    LOW = 0
+    HIGH = 1
+
+    def __init__(self):
+        # type: () -> None
+        self.outputs = []  # type: List[GpioOutput]
+        self._pwm_ranges = {}  # type: Dict[int, int]
+
+    def setmode(self, mode):
+        # type: (int) -> None
+        pass
+
+    def setup(self, pin, mode):
+        # type: (int, int) -> None
+        pass
+
+    def output(self, pin, level):
+        # type: (int, int) -> None
+        """
+        Record an output change.
+
+        Args:
+            pin (int): Output pin
+            level (int): New level
+
+        """
+        self.outputs.append(GpioOutput(default_timer(), pin, level))
+
+    def set_PWM_frequency(self, pin, frequency):
+        # type: (int, int) -> int
+        return frequency
+
+    def set_PWM_range(self, pin, duty_cycle_range):
+        # type: (int, int) -> int
+        self._pwm_ranges[pin] = duty_cycle_range
+        return duty_cycle_range
+
+    def set_PWM_dutycycle(self, pin, duty_cycle):
+        # type: (int, int) -> None
+        """
+        Record a PWM duty cycle change as an output change, at its duty cycle (0 - 1).
+
+        Args:
+            pin (int): Output pin
+            duty_cycle (int): Duty cycle, out of the pin's range (255 by default)
+
+        """
+        self.output(pin, float(duty_cycle) / self._pwm_ranges.get(pin, 255))
+
+    def get_edges(self, pin):
+        # type: (int) -> List[Tuple[float, float]]
+        """
+        Get the output changes of a pin.
+
+        Args:
+            pin (int): Output pin
+
+        Returns:
+            List[Tuple[float, float]]: (time, level) of each change
+
+        """
+        return [(output.time, output.level) for output in self.outputs if output.pin == pin]
+
+    def get_on_fraction(self, pin, start, end):
+        # type: (int, float, float) -> float
+        """
+        Get the fraction of a period a pin was driven high, PWM outputs counting at their duty cycle.
+
+        Args:
+            pin (int): Output pin
+            start (float): Start of the period
+            end (float): End of the period
+
+        Returns:
+            float: Fraction of the period driven high (0 - 1)
+
+        """
+        on_time = 0.0
+        level = 0.0
+        cursor = start
+        for output_time, output_level in self.get_edges(pin):
+            if output_time > start:
+                on_time += level * (min(output_time, end) - cursor)
+                cursor = min(output_time, end)
+            level = output_level
+        on_time += level * (end - cursor)
+        return on_time / (end - start)
+
+    def cleanup(self):
+        # type: () -> None
+        pass
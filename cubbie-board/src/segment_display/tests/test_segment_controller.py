@@ -0,0 +1,222 @@
+import os
+from unittest import TestCase
+
+import pigpio
+
+from segment_display import sim_bus
+from segment_display.pigpio_multiplexer import PigpioMultiplexer
+from segment_display.segment_controller import SegmentController
+from segment_display.segment_display import SegmentDisplay
+from segment_display.segment_state import SegmentState
+
+# Config for running the controller on the simulated bus.
+SIM_CONFIG = {
+    'I2C_BACKEND': 'sim',
+    'I2C_SPEED': '400000',
+    'HOME_MCP23008_ADDRESS': '0x20',
+    'AWAY_MCP23008_ADDRESS': '0x21',
+    'INNING_MCP23008_ADDRESS': '0x22',
+    'LEFT_DIGIT_PIN': '5',
+    'RIGHT_DIGIT_PIN': '6'
+}
+
+
+class SimPigpio(object):
+    """
+    Stand-in for pigpio.pi whose scripts write the output latches straight to a simulated bus, stopping on the
+    leftmost scanned digit.
+
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def i2c_open(self, i2c_bus, address):
+        return address
+
+    def i2c_close(self, handle):
+        pass
+
+    def store_script(self, script):
+        return 0
+
+    def script_status(self, script_id):
+        return pigpio.PI_SCRIPT_RUNNING, []
+
+    def run_script(self, script_id, params):
+        self.update_script(script_id, params)
+
+    def update_script(self, script_id, params):
+        for address, code in zip((0x20, 0x21, 0x22), params):
+            self.bus.write_byte_data(address, SegmentDisplay.OLAT, code)
+
+    def stop_script(self, script_id):
+        pass
+
+    def delete_script(self, script_id):
+        pass
+
+
+class TestSegmentController(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a controller on the simulated bus.
+
+        """
+        self.environ = dict(os.environ)
+        os.environ.update(SIM_CONFIG)
+        self.controller = SegmentController()
+        self.bus = self.controller.i2c_bus._bus
+        self.gpio = self.controller._gpio
+
+    def tearDown(self):
+        # type: () -> None
+        """
+        Restore the config.
+
+        """
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def get_outputs(self):
+        """
+        Get the segments each chip is driving, home to inning.
+
+        """
+        return [self.bus.chips[address].outputs for address in (0x20, 0x21, 0x22)]
+
+    def test_single_digits(self):
+        """
+        Test single digit values are written straight to the chips, with only the right digit lit.
+
+        """
+        self.controller.apply_state(SegmentState(7, 'Bottom', 3, 5))
+        self.controller.process_updates()
+        codes = SegmentDisplay.DIGIT_CODES
+        self.assertListEqual(
+            [codes[3], codes[5] + SegmentDisplay.EXTRA_PIN_CODE, codes[7]], self.get_outputs()
+        )
+        # Driven by PWM for as long as each of the two digits is lit when scanning.
+        self.assertEqual(0.5, self.gpio.get_edges(6)[-1][1])
+        # Every transaction took its time on the wire.
+        self.assertTrue(all(transaction.duration > 0 for transaction in self.bus.log))
+
+    def test_turn_off(self):
+        """
+        Test turning off blanks the displays, and the state shown before is shown again when reapplied.
+
+        """
+        state = SegmentState(7, 'Bottom', 3, 5)
+        self.controller.apply_state(state)
+        self.controller.process_updates()
+        shown = self.get_outputs()
+        self.controller.turn_off_displays()
+        self.controller.process_updates()
+        self.assertListEqual([0, 0, 0], self.get_outputs())
+        self.controller.apply_state(state)
+        self.controller.process_updates()
+        self.assertListEqual(shown, self.get_outputs())
+
+    def test_pigpio_multiplexer(self):
+        """
+        Test the rightmost digit is rewritten once the pigpio daemon stops multiplexing, whatever it wrote last.
+
+        """
+        self.controller._multiplexer = PigpioMultiplexer(
+            SimPigpio(self.bus), self.controller._displays, 1, [5, 6], SegmentController.REFRESH_RATE
+        )
+        codes = SegmentDisplay.DIGIT_CODES
+        for inning in (2, 12, 2):
+            self.controller.apply_state(SegmentState(inning, None, 3, 4))
+            self.controller.process_updates()
+            if inning == 12:
+                # Stopped on the left digit.
+                self.assertListEqual([codes[-1], codes[-1], codes[1]], self.get_outputs())
+        self.assertListEqual([codes[3], codes[4], codes[2]], self.get_outputs())
+
+    def test_blink_digits(self):
+        """
+        Test multiplexing writes each digit while neither digit is lit.
+
+        """
+        self.controller.apply_state(SegmentState(12, 'Top', 10, 3))
+        self.controller.process_updates()
+        del self.gpio.outputs[:]
+        del self.bus.log[:]
+        self.controller._blink_digits()
+        self.assertListEqual([(6, 0), (5, 1), (5, 0), (6, 1)], [output[1:] for output in self.gpio.outputs])
+        # Away's blank left digit is already latched from setup, so is skipped.
+        self.assertEqual(5, len(self.bus.log))
+        lit_left = self.gpio.outputs[1].time
+        lit_right = self.gpio.outputs[3].time
+        self.assertTrue(all(
+            transaction.time < lit_left or self.gpio.outputs[2].time < transaction.time < lit_right
+            for transaction in self.bus.log
+        ))
+
+    def test_three_digits(self):
+        """
+        Test three digit pins scan only as many digits as the widest number needs, each for an equal time.
+
+        """
+        os.environ['DIGIT_PINS'] = '4,5,6'
+        try:
+            controller = SegmentController()
+        finally:
+            del os.environ['DIGIT_PINS']
+        gpio = controller._gpio
+        controller.apply_state(SegmentState(11, 'Top', 102, 3))
+        controller.process_updates()
+        self.assertEqual(3, controller._phase_count)
+        del gpio.outputs[:]
+        controller._blink_digits()
+        self.assertListEqual(
+            [(6, 0), (4, 1), (4, 0), (5, 1), (5, 0), (6, 1)], [output[1:] for output in gpio.outputs]
+        )
+        # Hundreds digit of the home score on the left.
+        self.assertEqual(
+            SegmentDisplay.DIGIT_CODES[1] + SegmentDisplay.EXTRA_PIN_CODE, controller.home_display.codes[0]
+        )
+        # Back to two digits, the left digit is no longer scanned, and each is switched off early for the same
+        # on-time as when three are scanned.
+        controller.apply_state(SegmentState(11, 'Top', 10, 3))
+        controller.process_updates()
+        self.assertEqual(2, controller._phase_count)
+        del gpio.outputs[:]
+        controller._blink_digits()
+        self.assertListEqual(
+            [(6, 0), (5, 1), (5, 0), (5, 0), (6, 1), (6, 0)], [output[1:] for output in gpio.outputs]
+        )
+        # Back to one digit, lit by PWM for a third of the time, to the PWM range.
+        controller.apply_state(SegmentState(1, 'Top', 0, 3))
+        controller.process_updates()
+        self.assertListEqual([(4, 0), (5, 0)], [output[1:] for output in gpio.outputs[-3:-1]])
+        self.assertEqual(6, gpio.outputs[-1].pin)
+        self.assertAlmostEqual(1 / 3.0, gpio.outputs[-1].level, places=3)
+
+    def test_brightness(self):
+        """
+        Test dimming shortens each digit's on-time, in both modes.
+
+        """
+        os.environ['SEGMENT_BRIGHTNESS'] = '0.5'
+        try:
+            controller = SegmentController()
+        finally:
+            del os.environ['SEGMENT_BRIGHTNESS']
+        gpio = controller._gpio
+        controller.apply_state(SegmentState(1, 'Top', 3, 5))
+        controller.process_updates()
+        self.assertEqual((6, 0.25), gpio.outputs[-1][1:])
+        controller.apply_state(SegmentState(1, 'Top', 13, 5))
+        controller.process_updates()
+        del gpio.outputs[:]
+        controller._blink_digits()
+        self.assertListEqual(
+            [(6, 0), (5, 1), (5, 0), (5, 0), (6, 1), (6, 0)], [output[1:] for output in gpio.outputs]
+        )
+        # Each digit is lit for about half its phase.
+        phase_time = 1.0 / (SegmentController.REFRESH_RATE * 2)
+        lit_time = gpio.outputs[2].time - gpio.outputs[1].time
+        self.assertTrue(phase_time * 0.4 < lit_time < phase_time * 0.8)
@@ -0,0 +1,93 @@
+from unittest import TestCase
+
+from segment_display import sim_bus
+from segment_display.i2c_bus import I2CBus
+from segment_display.segment_display import SegmentDisplay
+from segment_display.sim_bus import SimBus
+
+
+class TestSegmentDisplay(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a display on a simulated chip.
+
+        """
+        self.sim_bus = SimBus([0x20])
+        self.chip = self.sim_bus.chips[0x20]
+        self.bus = I2CBus(self.sim_bus)
+        self.display = SegmentDisplay(self.bus, 0x20)
+
+    def test_setup(self):
+        """
+        Test setup makes all pins blank outputs in two transactions.
+
+        """
+        self.assertEqual(2, self.sim_bus.transactions)
+        self.assertEqual(0x00, self.chip.registers[sim_bus.IODIR])
+        self.assertEqual(0x00, self.chip.registers[sim_bus.GPPU])
+        self.assertEqual(0x00, self.chip.registers[sim_bus.IOCON])
+        self.assertEqual(0x00, self.chip.registers[sim_bus.OLAT])
+        # Latch blanked before any pin became an output.
+        self.assertEqual((sim_bus.OLAT, 0x00), self.chip.writes[0])
+        self.assertEqual(0, self.chip.outputs)
+
+    def test_display_digit(self):
+        """
+        Test digits are written to the output latch, skipping repeats.
+
+        """
+        self.display.is_extra_pin_on = True
+        self.display.number = 17
+        self.display.display_position(0)
+        self.assertEqual(SegmentDisplay.DIGIT_CODES[1] + SegmentDisplay.EXTRA_PIN_CODE, self.chip.outputs)
+        self.display.display_position(1)
+        self.assertEqual(SegmentDisplay.DIGIT_CODES[7] + SegmentDisplay.EXTRA_PIN_CODE, self.chip.outputs)
+        transactions = self.sim_bus.transactions
+        self.display.display_position(1)
+        self.assertEqual(transactions, self.sim_bus.transactions)
+        self.assertEqual(1, self.bus.skipped_writes)
+
+    def test_number(self):
+        """
+        Test numbers are split into digits, blanking leading zeros, and saturated if too wide.
+
+        """
+        display = SegmentDisplay(self.bus, 0x20, 3)
+        for number, digits, lit_digit_count in (
+                (105, (1, 0, 5), 3), (20, (-1, 2, 0), 2), (0, (-1, -1, 0), 1), (-1, (-1, -1, -1), 0),
+                (1000, (9, 9, 9), 3)
+        ):
+            display.number = number
+            self.assertEqual(digits, display.digits)
+            self.assertEqual(lit_digit_count, display.lit_digit_count)
+        self.assertEqual(999, display.number)
+
+    def test_off(self):
+        """
+        Test turning off blanks the display.
+
+        """
+        self.display.number = 5
+        self.display.display_position(1)
+        self.display.off()
+        self.assertEqual(0, self.chip.outputs)
+
+
+class TestSimBus(TestCase):
+    def test_sequential_and_byte_mode(self):
+        """
+        Test block writes increment the register address, except in byte mode.
+
+        """
+        bus = SimBus([0x20])
+        chip = bus.chips[0x20]
+        bus.write_i2c_block_data(0x20, sim_bus.INTF, [0x01, 0x02, 0x03, 0x04])
+        # Read-only registers ignored, GPIO written through to the latch.
+        self.assertListEqual([0x00, 0x00, 0x00, 0x04], chip.registers[sim_bus.INTF:])
+        bus.write_byte_data(0x20, sim_bus.IOCON, sim_bus.IOCON_SEQOP)
+        bus.write_i2c_block_data(0x20, sim_bus.OLAT, [0x05, 0x06])
+        self.assertEqual(0x06, chip.registers[sim_bus.OLAT])
+        # Address pointer did not wrap around to IODIR.
+        self.assertEqual(0xFF, chip.registers[sim_bus.IODIR])
+        self.assertRaises(IOError, bus.read_byte_data, 0x21, sim_bus.GPIO)
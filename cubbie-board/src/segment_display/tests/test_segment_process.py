@@ -0,0 +1,58 @@
+import os
+import signal
+import time
+from unittest import TestCase
+
+from segment_display.segment_process import SegmentProcess
+from segment_display.segment_state import OFF_STATE, SegmentState
+from segment_display.tests.test_segment_controller import SIM_CONFIG
+
+
+class TestSegmentProcess(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Configure the simulated bus.
+
+        """
+        self.environ = dict(os.environ)
+        os.environ.update(SIM_CONFIG)
+
+    def tearDown(self):
+        # type: () -> None
+        """
+        Restore the config.
+
+        """
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+    def test_apply_state(self):
+        """
+        Test states are shared with the child process, which runs until stopped.
+
+        """
+        process = SegmentProcess()
+        self.assertEqual(OFF_STATE, SegmentState.decode(process._shared_state.read()[1]))
+        process.start()
+        process.apply_state(SegmentState(7, 'Bottom', 10, 3))
+        self.assertEqual(SegmentState(7, 'Bottom', 10, 3), SegmentState.decode(process._shared_state.read()[1]))
+        time.sleep(0.1)
+        self.assertTrue(process.is_alive())
+        process.exit()
+        self.assertEqual(0, process.exitcode)
+
+    def test_ignores_profiler_signal(self):
+        """
+        Test the child survives SIGUSR1, which toggles the main process' profiler.
+
+        """
+        process = SegmentProcess()
+        process.start()
+        # Let the child set up its signal handling.
+        time.sleep(0.2)
+        os.kill(process.pid, signal.SIGUSR1)
+        time.sleep(0.1)
+        self.assertTrue(process.is_alive())
+        process.exit()
+        self.assertEqual(0, process.exitcode)
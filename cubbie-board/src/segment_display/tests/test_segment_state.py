@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from games.game_overview import GameOverview
+from segment_display.segment_state import SegmentState
+
+
+class TestSegmentState(TestCase):
+    def test_from_overview(self):
+        """
+        Test getting the state to show for a game.
+
+        """
+        overview = GameOverview('g1', GameOverview.IN_PROGRESS_STATUS, 7, 'Bottom', 10, 3, 'Cubs', 'Cardinals',
+                                '2019/05/25 1:20', 'PM')
+        state = SegmentState.from_overview(overview)
+        self.assertEqual(SegmentState(7, 'Bottom', 10, 3), state)
+        self.assertEqual(4, state._replace(away_team_runs=4).away_team_runs)
+
+    def test_encode(self):
+        """
+        Test states are encoded as numbers and decoded back.
+
+        """
+        state = SegmentState(12, 'Top', 10, 3)
+        self.assertListEqual([12, 1, 10, 3], state.encode())
+        self.assertEqual(state, SegmentState.decode([12.0, 1.0, 10.0, 3.0]))
+        # Inning states the displays do not show are decoded as None.
+        self.assertEqual(SegmentState(9, None, 1, 2), SegmentState.decode(SegmentState(9, 'Middle', 1, 2).encode()))
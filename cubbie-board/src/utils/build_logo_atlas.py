@@ -0,0 +1,34 @@
+"""
+Build the packed logo atlas loaded by the LCD controller.
+
+Notes:
+    Run from the src directory: ``python -m utils.build_logo_atlas``. Uses the preprocessed logos (see
+    utils.preprocess_logos) if they exist, else the source jpg logos.
+
+"""
+
+import os.path
+
+from decouple import config
+
+from lcd_display.logo_atlas import build_atlas_from_dir
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    logo_path = os.path.join(ROOT_PATH, config('PROCESSED_LOGO_DIR', default='../img/logos/processed'))
+    if not os.path.isdir(logo_path):
+        logo_path = os.path.join(ROOT_PATH, config('LOGO_DIR'))
+    atlas_path = os.path.join(ROOT_PATH, config('LOGO_ATLAS', default='../img/logos.atlas'))
+    names = build_atlas_from_dir(
+        logo_path,
+        atlas_path,
+        config('LCD_WIDTH', cast=int),
+        config('LCD_HEIGHT', cast=int)
+    )
+    print('Wrote {} logos to {}'.format(len(names), atlas_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,498 @@
+"""
+For timing and counting the hot paths on deployed boards, dumping rolling percentiles to a file or UNIX socket.
+
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+from timeit import default_timer
+
+from decouple import config
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Where to dump: a file path to append JSON lines to, or 'unix:<path>' for a UNIX datagram socket. Off if empty.
+TARGET = config('INSTRUMENTATION_TARGET', default='')  # type: str
+# Time between dumps (seconds).
+DUMP_INTERVAL = config('INSTRUMENTATION_INTERVAL', default=60.0, cast=float)  # type: float
+# Latest durations kept for each span's percentiles.
+WINDOW = config('INSTRUMENTATION_WINDOW', default=1024, cast=int)  # type: int
+# Percentiles dumped for each span.
+PERCENTILES = (50, 95, 99)
+# Target prefix of a UNIX socket path.
+UNIX_PREFIX = 'unix:'
+# clock_gettime clock ID of the monotonic clock on Linux.
+CLOCK_MONOTONIC = 1
+
+logger = logging.getLogger(__name__)
+
+# A span's total number recorded, total duration (seconds) and latest durations, sorted.
+SpanReading = namedtuple('SpanReading', ['count', 'total', 'durations'])
+# Everything recorded: span name -> SpanReading, counter name -> total, mark name -> seconds since marked.
+Reading = namedtuple('Reading', ['spans', 'counters', 'ages'])
+
+
+def _get_monotonic_clock():
+    # type: () -> Callable[[], float]
+    """
+    Get a monotonic clock, so spans are not thrown off by wall clock changes (e.g. NTP syncing after boot).
+
+    Notes:
+        Python 2 has no time.monotonic, so calls clock_gettime through ctypes, else falls back to the wall clock.
+
+    Returns:
+        Callable[[], float]: Clock (seconds)
+
+    """
+    if hasattr(time, 'monotonic'):
+        return time.monotonic
+    try:
+        import ctypes
+        import ctypes.util
+
+        class Timespec(ctypes.Structure):
+            _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+        clock_gettime = ctypes.CDLL(ctypes.util.find_library('rt') or 'libc.so.6', use_errno=True).clock_gettime
+        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(Timespec)]
+    except (ImportError, OSError, AttributeError):
+        logger.warning('No monotonic clock, timing spans with the wall clock')
+        return default_timer
+
+    def monotonic():
+        # type: () -> float
+        timespec = Timespec()
+        if clock_gettime(CLOCK_MONOTONIC, ctypes.byref(timespec)):
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return timespec.tv_sec + timespec.tv_nsec * 1e-9
+
+    return monotonic
+
+
+clock = _get_monotonic_clock()  # type: Callable[[], float]
+
+
+def percentile(values, pct):
+    # type: (List[float], float) -> float
+    """
+    Get a percentile of some values (nearest rank).
+
+    Args:
+        values (List[float]): Sorted values
+        pct (float): Percentile, 0 - 100
+
+    Returns:
+        float: The percentile value
+
+    """
+    return values[int(round(pct / 100.0 * (len(values) - 1)))]
+
+
+class Recorder(object):
+    """
+    Keeps the latest durations of each span, the total of each counter and the time of each mark.
+
+    Notes:
+        Thread-safe.
+
+    Attributes:
+        _window (int): Latest durations kept for each span
+        _durations (Dict[str, Deque[float]]): Span name -> latest durations (seconds)
+        _span_counts (Dict[str, int]): Span name -> total number recorded
+        _span_totals (Dict[str, float]): Span name -> total duration (seconds)
+        _counters (Dict[str, int]): Counter name -> total
+        _collectors (Dict[str, Callable[[], int]]): Counter name -> function getting its total, for counters kept
+            elsewhere (e.g. in shared memory)
+        _marks (Dict[str, float]): Mark name -> time last marked, from the monotonic clock
+        _last_counters (Dict[str, int]): Counter name -> total at the last snapshot
+        _last_snapshot_time (float): Time of the last snapshot, from the monotonic clock
+        _lock (threading.Lock): Guards the durations and counters
+
+    """
+
+    def __init__(self, window=WINDOW):
+        # type: (int) -> None
+        """
+        Setup the recorder, with nothing recorded.
+
+        Args:
+            window (int): Latest durations kept for each span
+
+        """
+        self._window = window  # type: int
+        self._durations = {}  # type: Dict[str, Deque[float]]
+        self._span_counts = {}  # type: Dict[str, int]
+        self._span_totals = {}  # type: Dict[str, float]
+        self._counters = {}  # type: Dict[str, int]
+        self._collectors = {}  # type: Dict[str, Callable[[], int]]
+        self._marks = {}  # type: Dict[str, float]
+        self._last_counters = {}  # type: Dict[str, int]
+        self._last_snapshot_time = clock()  # type: float
+        self._lock = threading.Lock()  # type: threading.Lock
+
+    def record(self, name, duration):
+        # type: (str, float) -> None
+        """
+        Record a span's duration.
+
+        Args:
+            name (str): Span name
+            duration (float): Duration (seconds)
+
+        """
+        with self._lock:
+            if name not in self._durations:
+                self._durations[name] = deque(maxlen=self._window)
+                self._span_counts[name] = 0
+                self._span_totals[name] = 0.0
+            self._durations[name].append(duration)
+            self._span_counts[name] += 1
+            self._span_totals[name] += duration
+
+    def count(self, name, amount=1):
+        # type: (str, int) -> None
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name
+            amount (int): Amount to add
+
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def add_collector(self, name, collector):
+        # type: (str, Callable[[], int]) -> None
+        """
+        Add a counter kept elsewhere.
+
+        Args:
+            name (str): Counter name
+            collector (Callable[[], int]): Function getting the counter's total
+
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def mark(self, name):
+        # type: (str) -> None
+        """
+        Mark that something happened now, e.g. data being refreshed, to report the time since.
+
+        Args:
+            name (str): Mark name
+
+        """
+        now = clock()
+        with self._lock:
+            self._marks[name] = now
+
+    def read(self):
+        # type: () -> Reading
+        """
+        Get everything recorded so far, without affecting the next snapshot.
+
+        Returns:
+            Reading: Everything recorded
+
+        """
+        now = clock()
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            span_counts = dict(self._span_counts)
+            span_totals = dict(self._span_totals)
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+            marks = dict(self._marks)
+        # Sorted and collected outside the lock, so recording is not held up.
+        counters.update((name, collector()) for name, collector in collectors.items())
+        return Reading(
+            {
+                name: SpanReading(span_counts[name], span_totals[name], sorted(values))
+                for name, values in durations.items()
+            },
+            counters,
+            {name: now - marked for name, marked in marks.items()}
+        )
+
+    def snapshot(self):
+        # type: () -> Dict[str, Any]
+        """
+        Get the percentiles of each span's latest durations, each counter's total and rate since the last snapshot,
+        and the time since each mark.
+
+        Returns:
+            Dict[str, Any]: Snapshot, as dumped
+
+        """
+        now = clock()
+        reading = self.read()
+        interval = now - self._last_snapshot_time
+        last_counters = self._last_counters
+        self._last_snapshot_time = now
+        self._last_counters = reading.counters
+        spans = {}
+        for name, span_reading in reading.spans.items():
+            values = span_reading.durations
+            spans[name] = {'count': span_reading.count, 'max_ms': values[-1] * 1e3}
+            spans[name].update(
+                ('p{}_ms'.format(pct), percentile(values, pct) * 1e3) for pct in PERCENTILES
+            )
+        return {
+            'interval': interval,
+            'spans': spans,
+            'counters': {
+                name: {'total': total, 'per_s': (total - last_counters.get(name, 0)) / interval if interval else 0.0}
+                for name, total in reading.counters.items()
+            },
+            'ages': reading.ages
+        }
+
+
+class Span(object):
+    """
+    Times a block on the monotonic clock, recording its duration on exit.
+
+    Attributes:
+        _recorder (Recorder): Recorder of the duration
+        _name (str): Span name
+        _start (float): Time the block was entered
+
+    """
+
+    __slots__ = ('_recorder', '_name', '_start')
+
+    def __init__(self, recorder, name):
+        # type: (Recorder, str) -> None
+        self._recorder = recorder  # type: Recorder
+        self._name = name  # type: str
+        self._start = 0.0  # type: float
+
+    def __enter__(self):
+        # type: () -> Span
+        self._start = clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> bool
+        self._recorder.record(self._name, clock() - self._start)
+        return False
+
+
+class NullSpan(object):
+    """
+    Span doing nothing, returned while instrumentation is off.
+
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        # type: () -> NullSpan
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # type: (Any, Any, Any) -> bool
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Dumper(threading.Thread):
+    """
+    Periodically dumps a recorder's snapshot as a JSON line to a file or UNIX datagram socket.
+
+    Notes:
+        Dumps to a socket nobody is listening on are dropped, so a board never blocks on a missing reader.
+
+    Attributes:
+        _recorder (Recorder): Recorder to dump
+        _target (str): File path, or 'unix:<path>' for a UNIX socket
+        _interval (float): Time between dumps (seconds)
+        _process_name (str): Name of the process, included in each dump
+        _stop_handle (threading.Event): Handle to stop the thread
+
+    """
+
+    def __init__(self, recorder, target, interval, process_name):
+        # type: (Recorder, str, float, str) -> None
+        """
+        Setup the dumper.
+
+        Args:
+            recorder (Recorder): Recorder to dump
+            target (str): File path, or 'unix:<path>' for a UNIX socket
+            interval (float): Time between dumps (seconds)
+            process_name (str): Name of the process, included in each dump
+
+        """
+        threading.Thread.__init__(self, name='InstrumentationDumper')
+        self.daemon = True
+        self._recorder = recorder  # type: Recorder
+        self._target = target  # type: str
+        self._interval = interval  # type: float
+        self._process_name = process_name  # type: str
+        self._stop_handle = threading.Event()  # type: threading.Event
+
+    def dump(self):
+        # type: () -> None
+        """
+        Dump a snapshot now.
+
+        """
+        snapshot = self._recorder.snapshot()
+        snapshot.update(time=time.time(), process=self._process_name, pid=os.getpid())
+        line = json.dumps(snapshot, sort_keys=True, separators=(',', ':'))
+        try:
+            if self._target.startswith(UNIX_PREFIX):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                try:
+                    sock.sendto(line.encode('utf-8'), self._target[len(UNIX_PREFIX):])
+                finally:
+                    sock.close()
+            else:
+                with open(self._target, 'a') as dump_file:
+                    dump_file.write(line + '\n')
+        except (IOError, OSError, socket.error) as e:
+            logger.debug('Could not dump instrumentation to %s: %s', self._target, e)
+
+    def stop(self):
+        # type: () -> None
+        """
+        Stop the thread, dumping once more.
+
+        """
+        self._stop_handle.set()
+        self.join()
+
+    def run(self):
+        # type: () -> None
+        """
+        Main thread execution function.
+
+        """
+        while not self._stop_handle.wait(self._interval):
+            self.dump()
+        self.dump()
+
+
+_recorder = None  # type: Optional[Recorder]
+_dumper = None  # type: Optional[Dumper]
+
+
+def get_recorder():
+    # type: () -> Recorder
+    """
+    Get the recorder, starting recording if off.
+
+    Returns:
+        Recorder: The recorder
+
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    return _recorder
+
+
+def start(process_name, target=TARGET, interval=DUMP_INTERVAL):
+    # type: (str, str, float) -> bool
+    """
+    Start recording and dumping, if a target is configured.
+
+    Notes:
+        Call in a forked child process too, which then records and dumps on its own.
+
+    Args:
+        process_name (str): Name of the process, included in each dump
+        target (str): File path, or 'unix:<path>' for a UNIX socket, off if empty
+        interval (float): Time between dumps (seconds)
+
+    Returns:
+        bool: Whether instrumentation is on
+
+    """
+    global _dumper
+    if not target:
+        return False
+    _dumper = Dumper(get_recorder(), target, interval, process_name)
+    _dumper.start()
+    return True
+
+
+def stop():
+    # type: () -> None
+    """
+    Stop recording, dumping once more if dumping.
+
+    """
+    global _recorder, _dumper
+    _recorder = None
+    if _dumper is not None:
+        _dumper.stop()
+        _dumper = None
+
+
+def span(name):
+    # type: (str) -> Any
+    """
+    Time a block, as a context manager.
+
+    Args:
+        name (str): Span name
+
+    Returns:
+        Any: A Span, or the shared NULL_SPAN while off
+
+    """
+    if _recorder is None:
+        return NULL_SPAN
+    return Span(_recorder, name)
+
+
+def count(name, amount=1):
+    # type: (str, int) -> None
+    """
+    Add to a counter, if on.
+
+    Args:
+        name (str): Counter name
+        amount (int): Amount to add
+
+    """
+    if _recorder is not None:
+        _recorder.count(name, amount)
+
+
+def collect(name, collector):
+    # type: (str, Callable[[], int]) -> None
+    """
+    Add a counter kept elsewhere, if on.
+
+    Args:
+        name (str): Counter name
+        collector (Callable[[], int]): Function getting the counter's total
+
+    """
+    if _recorder is not None:
+        _recorder.add_collector(name, collector)
+
+
+def mark(name):
+    # type: (str) -> None
+    """
+    Mark that something happened now, if on.
+
+    Args:
+        name (str): Mark name
+
+    """
+    if _recorder is not None:
+        _recorder.mark(name)
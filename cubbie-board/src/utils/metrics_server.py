@@ -0,0 +1,182 @@
+"""
+For serving the instrumentation's spans, counters and marks to a local scraper, in Prometheus text format.
+
+"""
+
+import logging
+import re
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from decouple import config
+from typing import List, Optional
+
+from . import instrumentation
+from .instrumentation import PERCENTILES, Reading, Recorder
+
+# Port to serve metrics on, off if 0. Only local scrapers can connect.
+PORT = config('METRICS_PORT', default=0, cast=int)  # type: int
+HOST = '127.0.0.1'
+# Path metrics are served on.
+METRICS_PATH = '/metrics'
+# Prefix of every metric name.
+PREFIX = 'cubbieboard_'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+logger = logging.getLogger(__name__)
+
+
+def metric_name(name, suffix):
+    # type: (str, str) -> str
+    """
+    Get the Prometheus name of a span, counter or mark.
+
+    Args:
+        name (str): Instrumentation name, e.g. 'lcd.spi_push'
+        suffix (str): Unit or type suffix, e.g. '_seconds'
+
+    Returns:
+        str: Metric name, e.g. 'cubbieboard_lcd_spi_push_seconds'
+
+    """
+    return PREFIX + re.sub(r'[^a-zA-Z0-9_]', '_', name) + suffix
+
+
+def render(reading):
+    # type: (Reading) -> str
+    """
+    Render everything recorded in Prometheus text format.
+
+    Notes:
+        Spans are summaries of their latest durations, counters are counters (e.g. rate() of
+        segment_multiplex_cycles_total is the multiplex frequency) and marks are gauges of the time since.
+
+    Args:
+        reading (Reading): Everything recorded
+
+    Returns:
+        str: Metrics text
+
+    """
+    lines = []  # type: List[str]
+    for name, span in sorted(reading.spans.items()):
+        metric = metric_name(name, '_seconds')
+        lines.append('# TYPE {} summary'.format(metric))
+        lines.extend(
+            '{}{{quantile="{}"}} {!r}'.format(metric, pct / 100.0, instrumentation.percentile(span.durations, pct))
+            for pct in PERCENTILES
+        )
+        lines.append('{}_sum {!r}'.format(metric, span.total))
+        lines.append('{}_count {}'.format(metric, span.count))
+    for name, total in sorted(reading.counters.items()):
+        metric = metric_name(name, '_total')
+        lines.append('# TYPE {} counter'.format(metric))
+        lines.append('{} {}'.format(metric, total))
+    for name, age in sorted(reading.ages.items()):
+        metric = metric_name(name, '_age_seconds')
+        lines.append('# TYPE {} gauge'.format(metric))
+        lines.append('{} {!r}'.format(metric, age))
+    return ''.join(line + '\n' for line in lines)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """
+    Serves the metrics of the server's recorder.
+
+    """
+
+    def do_GET(self):
+        # type: () -> None
+        if self.path != METRICS_PATH:
+            self.send_error(404)
+            return
+        body = render(self.server.recorder.read()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scraped every few seconds, so not worth more than debug logging.
+        logger.debug('%s %s', self.address_string(), format % args)
+
+
+class MetricsServer(threading.Thread):
+    """
+    Serves metrics over HTTP from a background thread.
+
+    Notes:
+        Only works when scraped: reading the recorder holds its lock just long enough to copy it, and percentiles are
+        rendered outside the lock, so recording is never held up. Bound to localhost only.
+
+    Attributes:
+        _server (HTTPServer): The HTTP server, with the recorder to serve as its recorder attribute
+
+    """
+
+    def __init__(self, recorder, port, host=HOST):
+        # type: (Recorder, int, str) -> None
+        """
+        Bind the server.
+
+        Args:
+            recorder (Recorder): Recorder to serve
+            port (int): Port to serve on, 0 for any free port
+            host (str): Address to serve on
+
+        """
+        threading.Thread.__init__(self, name='MetricsServer')
+        self.daemon = True
+        self._server = HTTPServer((host, port), MetricsHandler)  # type: HTTPServer
+        self._server.recorder = recorder
+
+    @property
+    def port(self):
+        # type: () -> int
+        """
+        Get the port served on.
+
+        Returns:
+            int: The port
+
+        """
+        return self._server.server_address[1]
+
+    def stop(self):
+        # type: () -> None
+        """
+        Stop serving and close the socket.
+
+        """
+        self._server.shutdown()
+        self.join()
+        self._server.server_close()
+
+    def run(self):
+        # type: () -> None
+        """
+        Main thread execution function.
+
+        """
+        self._server.serve_forever()
+
+
+def start(port=PORT):
+    # type: (int) -> Optional[MetricsServer]
+    """
+    Start serving metrics, recording them, if a port is configured.
+
+    Args:
+        port (int): Port to serve on, off if 0
+
+    Returns:
+        Optional[MetricsServer]: The running server, None if off
+
+    """
+    if not port:
+        return None
+    server = MetricsServer(instrumentation.get_recorder(), port)
+    server.start()
+    logger.info('Serving metrics on http://%s:%d%s', HOST, server.port, METRICS_PATH)
+    return server
@@ -0,0 +1,183 @@
+"""
+Preprocess the team logos for the LCD displays.
+
+Notes:
+    Pads each logo to the panel's aspect ratio, scales it to the panel size and saves it as a lossless PNG,
+    optionally along with a copy per status header. Only logos whose source content (or the pipeline settings)
+    changed since the last run are rebuilt.
+
+    Run from the src directory: ``python -m utils.preprocess_logos [--variants] [--jobs N] [--force]``.
+
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import os.path
+from multiprocessing import Pool
+
+from PIL import Image
+from decouple import config
+from typing import Dict, List, Tuple
+
+from lcd_display.logo_atlas import fit_logo, variant_name
+from lcd_display.text_renderer import TextRenderer
+
+# Bump when the output of process_logo changes, to force a full rebuild.
+PIPELINE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def hash_file(file_path):
+    # type: (str) -> str
+    """
+    Get the content hash of a file.
+
+    Args:
+        file_path (str): File to hash
+
+    Returns:
+        str: Hex SHA-1 digest of the file
+
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as source:
+        for block in iter(lambda: source.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def process_logo(task):
+    # type: (Tuple[str, str, int, int, bool]) -> List[str]
+    """
+    Normalize one logo.
+
+    Notes:
+        Runs in a worker process.
+
+    Args:
+        task (Tuple[str, str, int, int, bool]): (source path, output dir, width, height, whether to render variants)
+
+    Returns:
+        List[str]: Names of the files written
+
+    """
+    source_path, output_dir, width, height, variants = task
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    logo = fit_logo(Image.open(source_path), width, height)
+    written = [name + '.png']
+    logo.save(os.path.join(output_dir, written[0]))
+    if variants:
+        renderer = TextRenderer(TextRenderer.get_font('arial.ttf', 15), width, height)
+        for status in sorted(TextRenderer.STATUS_HEADERS):
+            variant_file = variant_name(name, status) + '.png'
+            renderer.add_status_header(status, logo.copy()).save(os.path.join(output_dir, variant_file))
+            written.append(variant_file)
+    return written
+
+
+def _load_manifest(output_dir):
+    # type: (str) -> Dict
+    """
+    Load the manifest of the last run.
+
+    Args:
+        output_dir (str): Output directory
+
+    Returns:
+        Dict: The manifest, empty if there was no usable one
+
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as manifest_file:
+            return json.load(manifest_file)
+    except (IOError, ValueError):
+        return {}
+
+
+def preprocess_logos(source_dir, output_dir, width, height, variants=False, jobs=None, force=False):
+    # type: (str, str, int, int, bool, int, bool) -> List[str]
+    """
+    Normalize every jpg logo in a directory whose content changed since the last run.
+
+    Args:
+        source_dir (str): Directory of source logos
+        output_dir (str): Directory to write processed logos and the manifest to
+        width (int): Panel width (pixels)
+        height (int): Panel height (pixels)
+        variants (bool): Whether to also render each status header variant
+        jobs (int): Number of worker processes, defaults to the CPU count
+        force (bool): Whether to rebuild every logo
+
+    Returns:
+        List[str]: Names of the logos rebuilt
+
+    """
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    settings = {'version': PIPELINE_VERSION, 'width': width, 'height': height, 'variants': variants}
+    manifest = _load_manifest(output_dir)
+    # Any settings change invalidates every logo.
+    previous = manifest.get('logos', {}) if manifest.get('settings') == settings and not force else {}
+    sources = sorted(item for item in os.listdir(source_dir) if item.endswith('.jpg'))
+    hashes = {item: hash_file(os.path.join(source_dir, item)) for item in sources}
+    stale = [
+        item for item in sources
+        if item not in previous or previous[item]['hash'] != hashes[item]
+        or not all(os.path.exists(os.path.join(output_dir, output)) for output in previous[item]['outputs'])
+    ]
+    outputs = {item: previous[item]['outputs'] for item in sources if item not in stale}
+    if stale:
+        pool = Pool(jobs)
+        try:
+            results = pool.map(
+                process_logo,
+                [(os.path.join(source_dir, item), output_dir, width, height, variants) for item in stale]
+            )
+        finally:
+            pool.close()
+            pool.join()
+        outputs.update(zip(stale, results))
+    # Remove outputs no longer produced, e.g. from deleted logos.
+    kept = set(output for written in outputs.values() for output in written)
+    for old_item in manifest.get('logos', {}).values():
+        for output in old_item['outputs']:
+            if output not in kept and os.path.exists(os.path.join(output_dir, output)):
+                os.remove(os.path.join(output_dir, output))
+    # Write the manifest last, so an interrupted run is redone.
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as manifest_file:
+        json.dump(
+            {
+                'settings': settings,
+                'logos': {item: {'hash': hashes[item], 'outputs': outputs[item]} for item in sources}
+            },
+            manifest_file,
+            indent=2,
+            sort_keys=True
+        )
+    return [os.path.splitext(item)[0] for item in stale]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Preprocess the team logos for the LCD displays.')
+    parser.add_argument('--variants', action='store_true', help='Also render each status header variant')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild every logo')
+    args = parser.parse_args()
+    output_dir = os.path.join(ROOT_PATH, config('PROCESSED_LOGO_DIR', default='../img/logos/processed'))
+    rebuilt = preprocess_logos(
+        os.path.join(ROOT_PATH, config('LOGO_DIR')),
+        output_dir,
+        config('LCD_WIDTH', cast=int),
+        config('LCD_HEIGHT', cast=int),
+        variants=args.variants,
+        jobs=args.jobs,
+        force=args.force
+    )
+    print('Rebuilt {} logos in {}'.format(len(rebuilt), output_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+For sampling every thread's stack over a window, and writing the samples as collapsed stacks for flamegraphs.
+
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from decouple import config
+from typing import Any, Dict, List, Optional
+
+from .instrumentation import clock
+
+# Length of a profile (seconds).
+DURATION = config('PROFILER_DURATION', default=30.0, cast=float)  # type: float
+# Time between samples (seconds).
+INTERVAL = config('PROFILER_INTERVAL', default=0.005, cast=float)  # type: float
+# Directory profiles are written to.
+OUTPUT_DIR = config('PROFILER_DIR', default='/tmp')  # type: str
+
+logger = logging.getLogger(__name__)
+
+
+def get_frame_label(frame):
+    # type: (Any) -> str
+    """
+    Get the label of a stack frame, as shown in a flamegraph.
+
+    Args:
+        frame (Any): Stack frame
+
+    Returns:
+        str: Function, module and line the function starts on, e.g. '_blink_digits (segment_controller:412)'
+
+    """
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?').rsplit('.', 1)[-1]
+    # Semicolons separate frames in the collapsed format.
+    return '{} ({}:{})'.format(code.co_name, module, code.co_firstlineno).replace(';', ':')
+
+
+class SamplingProfiler(threading.Thread):
+    """
+    Samples the stacks of every other thread at an interval for a fixed window, then writes them as collapsed stacks.
+
+    Notes:
+        Each line of the output is a thread's name and its frames, root first, separated by semicolons, then the
+        number of samples of that stack, as read by flamegraph.pl or speedscope. Only threads in this process are
+        sampled.
+
+    Attributes:
+        path (str): Path the profile is written to
+        _duration (float): Length of the profile (seconds)
+        _interval (float): Time between samples (seconds)
+        _stacks (Dict[str, int]): Collapsed stack -> number of samples
+        samples (int): Number of samples taken
+        _stop_handle (threading.Event): Handle to end the profile early
+
+    """
+
+    def __init__(self, path, duration=DURATION, interval=INTERVAL):
+        # type: (str, float, float) -> None
+        """
+        Setup the profiler.
+
+        Args:
+            path (str): Path to write the profile to
+            duration (float): Length of the profile (seconds)
+            interval (float): Time between samples (seconds)
+
+        """
+        threading.Thread.__init__(self, name='SamplingProfiler')
+        self.daemon = True
+        self.path = path  # type: str
+        self._duration = duration  # type: float
+        self._interval = interval  # type: float
+        self._stacks = defaultdict(int)  # type: Dict[str, int]
+        self.samples = 0  # type: int
+        self._stop_handle = threading.Event()  # type: threading.Event
+
+    def sample(self):
+        # type: () -> None
+        """
+        Sample the stack of every thread but the profiler's.
+
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            labels = []  # type: List[str]
+            while frame is not None:
+                labels.append(get_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, 'Thread-{}'.format(ident)).replace(';', ':'))
+            self._stacks[';'.join(reversed(labels))] += 1
+        self.samples += 1
+
+    def write(self):
+        # type: () -> None
+        """
+        Write the collapsed stacks, replacing the file at once.
+
+        """
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as profile_file:
+            for stack, count in sorted(self._stacks.items()):
+                profile_file.write('{} {}\n'.format(stack, count))
+        os.rename(temp_path, self.path)
+
+    def stop(self):
+        # type: () -> None
+        """
+        End the profile early, waiting for it to be written.
+
+        """
+        self._stop_handle.set()
+        self.join()
+
+    def run(self):
+        # type: () -> None
+        """
+        Main thread execution function.
+
+        """
+        start = clock()
+        end = start + self._duration
+        next_sample = start
+        while next_sample < end:
+            self.sample()
+            next_sample += self._interval
+            # Sample on a schedule, so slow samples do not stretch the interval.
+            if self._stop_handle.wait(max(next_sample - clock(), 0)):
+                break
+        try:
+            self.write()
+        except (IOError, OSError) as e:
+            logger.error('Could not write profile to %s: %s', self.path, e)
+            return
+        logger.warning('Wrote %d samples over %.1f s to %s', self.samples, clock() - start, self.path)
+
+
+def toggle(profiler, output_dir=OUTPUT_DIR):
+    # type: (Optional[SamplingProfiler], str) -> Optional[SamplingProfiler]
+    """
+    Start a profile, or end the running one early.
+
+    Args:
+        profiler (Optional[SamplingProfiler]): Last profiler started, if any
+        output_dir (str): Directory to write a new profile to
+
+    Returns:
+        Optional[SamplingProfiler]: The running profiler, None if it was ended
+
+    """
+    if profiler is not None and profiler.is_alive():
+        profiler.stop()
+        return None
+    profiler = SamplingProfiler(
+        os.path.join(output_dir, 'cubbieboard-{}-{}.collapsed'.format(os.getpid(), time.strftime('%Y%m%d-%H%M%S')))
+    )
+    profiler.start()
+    # Logged as warnings, to show at the default log level.
+    logger.warning('Profiling for %.1f s to %s', DURATION, profiler.path)
+    return profiler
@@ -0,0 +1,116 @@
+"""
+For handing state to render loops through a fixed-layout block, without the reader taking locks.
+
+"""
+
+import multiprocessing
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SharedState(object):
+    """
+    Versioned, fixed-layout array of numbers, written by producers and read by a render loop by sequence number.
+
+    Notes:
+        Guarded by a sequence lock: a write makes the sequence number odd while it runs, and even again once done. A
+        reader retries until it reads the same even sequence number before and after the values, so it never sees
+        part of a write, and never blocks a writer. Writers (which must be in one process) are serialized by a lock
+        among themselves only.
+
+        The block is in shared memory, so a child process forked after it is created reads the same state. Pass a
+        multiprocessing.Event for the child to be woken by writes.
+
+    Attributes:
+        _block (multiprocessing.RawArray): Sequence number, then the values
+        _write_lock (threading.Lock): Serializes writers
+        changed (Any): Event set after each write, to wake the reader
+
+    """
+
+    # Slot of the sequence number.
+    SEQUENCE = 0
+
+    def __init__(self, size, typecode='l', event=None):
+        # type: (int, str, Optional[Any]) -> None
+        """
+        Allocate the block, with all values 0 and sequence number 0.
+
+        Args:
+            size (int): Number of values
+            typecode (str): ctypes type code of the values, e.g. 'l' for ints or 'd' for floats
+            event (Optional[Any]): Event to set after each write, a threading.Event if None
+
+        """
+        self._block = multiprocessing.RawArray(typecode, size + 1)  # type: multiprocessing.RawArray
+        self._write_lock = threading.Lock()  # type: threading.Lock
+        self.changed = threading.Event() if event is None else event  # type: Any
+
+    @property
+    def sequence(self):
+        # type: () -> int
+        """
+        Get the sequence number, which increases by 2 with each write.
+
+        Returns:
+            int: Sequence number (odd while a write is in progress)
+
+        """
+        return int(self._block[SharedState.SEQUENCE])
+
+    def write(self, values):
+        # type: (Dict[int, Any]) -> None
+        """
+        Write values, all at once as far as readers can tell.
+
+        Notes:
+            Thread-safe.
+
+        Args:
+            values (Dict[int, Any]): Index -> new value
+
+        """
+        with self._write_lock:
+            self._block[SharedState.SEQUENCE] += 1
+            for index, value in values.items():
+                self._block[index + 1] = value
+            self._block[SharedState.SEQUENCE] += 1
+        self.changed.set()
+
+    def read(self):
+        # type: () -> Tuple[int, List[Any]]
+        """
+        Read every value, without locking.
+
+        Returns:
+            Tuple[int, List[Any]]: (sequence number, values)
+
+        """
+        while True:
+            sequence = self._block[SharedState.SEQUENCE]
+            # Wait out a write in progress.
+            if sequence % 2:
+                continue
+            values = self._block[1:]
+            if self._block[SharedState.SEQUENCE] == sequence:
+                return int(sequence), values
+
+    def wait(self, timeout=None):
+        # type: (Optional[float]) -> bool
+        """
+        Wait for a write, then reset the event.
+
+        Notes:
+            Writes after the reset wake the next wait, so none are missed if read after this returns.
+
+        Args:
+            timeout (Optional[float]): Max time to wait (seconds), None to wait indefinitely
+
+        Returns:
+            bool: Whether woken by a write (or the event set otherwise), else timed out
+
+        """
+        is_set = self.changed.wait(timeout)
+        self.changed.clear()
+        return bool(is_set)
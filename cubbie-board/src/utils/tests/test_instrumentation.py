@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+from unittest import TestCase
+
+from utils import instrumentation
+from utils.instrumentation import Dumper, NULL_SPAN, Recorder
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a directory to dump to.
+
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        # type: () -> None
+        """
+        Stop instrumentation and remove the dumps.
+
+        """
+        instrumentation.stop()
+        shutil.rmtree(self.directory)
+
+    def test_off(self):
+        """
+        Test nothing is recorded without a target.
+
+        """
+        self.assertFalse(instrumentation.start('test', ''))
+        self.assertIs(NULL_SPAN, instrumentation.span('lcd.spi_push'))
+        with instrumentation.span('lcd.spi_push'):
+            instrumentation.count('i2c.writes')
+
+    def test_snapshot(self):
+        """
+        Test spans are summarized by percentile and counters by total and rate.
+
+        """
+        recorder = Recorder(window=4)
+        for duration in (0.001, 0.002, 0.003, 0.004, 0.005):
+            recorder.record('i2c.write', duration)
+        recorder.count('segment.multiplex_cycles', 3)
+        snapshot = recorder.snapshot()
+        span = snapshot['spans']['i2c.write']
+        # All recorded, only the latest 4 kept.
+        self.assertEqual(5, span['count'])
+        self.assertAlmostEqual(4.0, span['p50_ms'])
+        self.assertAlmostEqual(5.0, span['p99_ms'])
+        self.assertAlmostEqual(5.0, span['max_ms'])
+        self.assertEqual(3, snapshot['counters']['segment.multiplex_cycles']['total'])
+        self.assertGreater(snapshot['counters']['segment.multiplex_cycles']['per_s'], 0)
+        # Rates are since the last snapshot.
+        self.assertEqual(0, recorder.snapshot()['counters']['segment.multiplex_cycles']['per_s'])
+
+    def test_read(self):
+        """
+        Test reading includes collected counters and the time since marks, without affecting snapshots.
+
+        """
+        recorder = Recorder()
+        recorder.count('lcd.frames_pushed')
+        recorder.add_collector('segment.multiplex_cycles', lambda: 50)
+        recorder.mark('games.overviews_fetched')
+        reading = recorder.read()
+        self.assertEqual({'lcd.frames_pushed': 1, 'segment.multiplex_cycles': 50}, reading.counters)
+        self.assertGreaterEqual(reading.ages['games.overviews_fetched'], 0)
+        self.assertEqual(1, recorder.snapshot()['counters']['lcd.frames_pushed']['total'])
+
+    def test_dump_file(self):
+        """
+        Test spans and counters are dumped to a file as JSON lines, once more when stopped.
+
+        """
+        path = os.path.join(self.directory, 'dump.jsonl')
+        self.assertTrue(instrumentation.start('test', path, 3600))
+        with instrumentation.span('api.round_trip'):
+            pass
+        instrumentation.count('api.retries')
+        instrumentation.stop()
+        with open(path) as dump_file:
+            dumps = [json.loads(line) for line in dump_file]
+        self.assertEqual(1, len(dumps))
+        self.assertEqual('test', dumps[0]['process'])
+        self.assertEqual(1, dumps[0]['spans']['api.round_trip']['count'])
+        self.assertEqual(1, dumps[0]['counters']['api.retries']['total'])
+        # Off again once stopped.
+        self.assertIs(NULL_SPAN, instrumentation.span('api.round_trip'))
+
+    def test_dump_socket(self):
+        """
+        Test dumps are sent to a UNIX socket, and dropped without a listener.
+
+        """
+        path = os.path.join(self.directory, 'dump.sock')
+        recorder = Recorder()
+        recorder.count('i2c.writes')
+        dumper = Dumper(recorder, instrumentation.UNIX_PREFIX + path, 3600, 'test')
+        dumper.dump()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        listener.bind(path)
+        try:
+            dumper.dump()
+            self.assertEqual(1, json.loads(listener.recv(65536))['counters']['i2c.writes']['total'])
+        finally:
+            listener.close()
@@ -0,0 +1,59 @@
+import urllib2
+from unittest import TestCase
+
+from utils import metrics_server
+from utils.instrumentation import Recorder
+from utils.metrics_server import MetricsServer, render
+
+
+class TestMetricsServer(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a recorder with a span, counters and a mark.
+
+        """
+        self.recorder = Recorder()
+        self.recorder.record('games.refresh', 0.5)
+        self.recorder.record('games.refresh', 1.5)
+        self.recorder.count('lcd.frames_pushed', 3)
+        self.recorder.add_collector('segment.multiplex_cycles', lambda: 150)
+        self.recorder.mark('games.overviews_fetched')
+
+    def test_render(self):
+        """
+        Test spans render as summaries, counters as counters and marks as ages.
+
+        """
+        lines = render(self.recorder.read()).splitlines()
+        self.assertIn('# TYPE cubbieboard_games_refresh_seconds summary', lines)
+        self.assertIn('cubbieboard_games_refresh_seconds{quantile="0.5"} 1.5', lines)
+        self.assertIn('cubbieboard_games_refresh_seconds_sum 2.0', lines)
+        self.assertIn('cubbieboard_games_refresh_seconds_count 2', lines)
+        self.assertIn('cubbieboard_lcd_frames_pushed_total 3', lines)
+        self.assertIn('cubbieboard_segment_multiplex_cycles_total 150', lines)
+        self.assertIn('# TYPE cubbieboard_games_overviews_fetched_age_seconds gauge', lines)
+
+    def test_serve(self):
+        """
+        Test metrics are served on localhost, and nothing else is.
+
+        """
+        server = MetricsServer(self.recorder, 0)
+        server.start()
+        try:
+            url = 'http://127.0.0.1:{}'.format(server.port)
+            response = urllib2.urlopen(url + '/metrics')
+            self.assertTrue(response.info()['Content-Type'].startswith('text/plain; version=0.0.4'))
+            self.assertIn('cubbieboard_lcd_frames_pushed_total 3\n', response.read())
+            with self.assertRaises(urllib2.HTTPError):
+                urllib2.urlopen(url + '/')
+        finally:
+            server.stop()
+
+    def test_off(self):
+        """
+        Test no server is started without a port.
+
+        """
+        self.assertIsNone(metrics_server.start(0))
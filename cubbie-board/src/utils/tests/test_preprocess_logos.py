@@ -0,0 +1,65 @@
+import os
+import os.path
+import shutil
+import tempfile
+from unittest import TestCase
+
+from PIL import Image
+
+from utils.preprocess_logos import preprocess_logos
+
+
+class TestPreprocessLogos(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Create source logos in a temporary directory.
+
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, 'logos')
+        self.output_dir = os.path.join(self.temp_dir, 'processed')
+        os.makedirs(self.source_dir)
+        Image.new('RGB', (20, 10), (0, 0, 255)).save(os.path.join(self.source_dir, 'Cubs.jpg'))
+        Image.new('RGB', (10, 10), (255, 0, 0)).save(os.path.join(self.source_dir, 'Cardinals.jpg'))
+
+    def tearDown(self):
+        # type: () -> None
+        shutil.rmtree(self.temp_dir)
+
+    def _preprocess(self, **kwargs):
+        return sorted(preprocess_logos(self.source_dir, self.output_dir, 8, 8, jobs=1, **kwargs))
+
+    def test_preprocess(self):
+        """
+        Test logos are normalized to the panel size.
+
+        """
+        self.assertListEqual(['Cardinals', 'Cubs'], self._preprocess())
+        logo = Image.open(os.path.join(self.output_dir, 'Cubs.png'))
+        self.assertEqual((8, 8), logo.size)
+
+    def test_incremental(self):
+        """
+        Test only changed logos are rebuilt.
+
+        """
+        self._preprocess()
+        # Nothing changed.
+        self.assertListEqual([], self._preprocess())
+        # Change one logo's content.
+        Image.new('RGB', (10, 10), (0, 255, 0)).save(os.path.join(self.source_dir, 'Cardinals.jpg'))
+        self.assertListEqual(['Cardinals'], self._preprocess())
+        # Force rebuilds everything.
+        self.assertListEqual(['Cardinals', 'Cubs'], self._preprocess(force=True))
+
+    def test_removed_logo(self):
+        """
+        Test outputs of removed logos are deleted.
+
+        """
+        self._preprocess()
+        os.remove(os.path.join(self.source_dir, 'Cubs.jpg'))
+        self.assertListEqual([], self._preprocess())
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'Cubs.png')))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'Cardinals.png')))
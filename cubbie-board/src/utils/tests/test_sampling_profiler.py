@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from utils import sampling_profiler
+from utils.sampling_profiler import SamplingProfiler
+
+
+def wait_for_stop(stop):
+    stop.wait()
+
+
+class TestSamplingProfiler(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a named thread to sample, and a directory to write profiles to.
+
+        """
+        self.directory = tempfile.mkdtemp()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=wait_for_stop, args=(self.stop, ), name='Waiter')
+        self.thread.start()
+
+    def tearDown(self):
+        # type: () -> None
+        """
+        Stop the sampled thread and remove the profiles.
+
+        """
+        self.stop.set()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def test_profile(self):
+        """
+        Test every other thread's stack is written as collapsed stacks, root first, after the window.
+
+        """
+        path = os.path.join(self.directory, 'profile.collapsed')
+        profiler = SamplingProfiler(path, 0.05, 0.005)
+        profiler.start()
+        profiler.join()
+        with open(path) as profile_file:
+            lines = profile_file.read().splitlines()
+        stacks = dict(line.rsplit(' ', 1) for line in lines)
+        waiter = [stack for stack in stacks if stack.startswith('Waiter;')]
+        self.assertEqual(1, len(waiter))
+        self.assertIn(';wait_for_stop (test_sampling_profiler:', waiter[0])
+        self.assertEqual(profiler.samples, int(stacks[waiter[0]]))
+        self.assertTrue(any(stack.startswith('MainThread;') for stack in stacks))
+        self.assertFalse(any(stack.startswith('SamplingProfiler;') for stack in stacks))
+
+    def test_toggle(self):
+        """
+        Test toggling starts a profile, and toggling again ends it early.
+
+        """
+        profiler = sampling_profiler.toggle(None, self.directory)
+        self.assertTrue(profiler.is_alive())
+        self.assertIsNone(sampling_profiler.toggle(profiler, self.directory))
+        self.assertTrue(os.path.exists(profiler.path))
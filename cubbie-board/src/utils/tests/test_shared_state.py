@@ -0,0 +1,51 @@
+import threading
+from unittest import TestCase
+
+from utils.shared_state import SharedState
+
+
+class TestSharedState(TestCase):
+    def setUp(self):
+        # type: () -> None
+        """
+        Set up a block of 3 floats.
+
+        """
+        self.shared_state = SharedState(3, 'd')
+
+    def test_write(self):
+        """
+        Test writes are read back whole, each with a new even sequence number.
+
+        """
+        self.assertEqual((0, [0.0, 0.0, 0.0]), self.shared_state.read())
+        self.shared_state.write({0: 1.5, 2: 3})
+        self.assertEqual((2, [1.5, 0.0, 3.0]), self.shared_state.read())
+        self.assertEqual(2, self.shared_state.sequence)
+        self.assertTrue(self.shared_state.wait(0))
+        # Reset by the wait.
+        self.assertFalse(self.shared_state.wait(0))
+
+    def test_concurrent_reads(self):
+        """
+        Test a reader never sees part of a write.
+
+        """
+        stop = threading.Event()
+
+        def write():
+            value = 0
+            while not stop.is_set():
+                value += 1
+                self.shared_state.write({0: value, 1: value, 2: value})
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(10000):
+                sequence, values = self.shared_state.read()
+                self.assertEqual(0, sequence % 2)
+                self.assertEqual(1, len(set(values)))
+        finally:
+            stop.set()
+            writer.join()